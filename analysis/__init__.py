@@ -0,0 +1,100 @@
+"""Analysis toolkit for the Solana trading stack.
+
+Public functions are exposed lazily: ``analysis.rpc_call`` or
+``from analysis import backtest`` imports only the submodule that defines the
+name, so short-lived scripts that need one helper do not pay for the rest of
+the package (or for optional dependencies such as scikit-learn).
+"""
+
+# Annotations stay unevaluated so this module never imports ``typing``, which
+# alone costs more than the whole lazy namespace on a cold start.
+from __future__ import annotations
+
+import importlib
+
+_EXPORTS: dict[str, list[str]] = {
+    "advanced_metrics": [
+        "market_cap",
+        "fee_summary",
+        "fibonacci_retracements",
+        "cumulative_volume_delta",
+        "holder_distribution",
+        "zscore_anomalies",
+    ],
+    "alternative_data": [
+        "fetch_github_activity",
+        "fetch_github_activity_batch",
+        "analyze_github_trend",
+        "GitHubActivityFetcher",
+    ],
+    "backtesting": [
+        "simple_moving_average_strategy",
+        "regime_adaptive_strategy",
+        "backtest",
+        "sharpe_ratio",
+        "performance_stats",
+        "optimize_regime_windows",
+        "walk_forward_optimize",
+    ],
+    "copy_trade": ["CopyTradeEngine"],
+    "data_cache": ["load_cache", "save_cache"],
+    "data_ingestion": ["fetch_ohlcv", "fetch_trades", "fetch_token_supply", "fetch_social_posts"],
+    "feature_engineering": ["add_technical_indicators", "add_bollinger_bands", "add_macd"],
+    "feature_store": ["FeatureStore"],
+    "github_mock": ["MockGitHubServer"],
+    "innovative_analysis": ["cross_correlation_lag", "hurst_exponent"],
+    "mint_screening": ["MintScreener", "checks_from_env", "decode_metadata", "decode_mint", "metadata_address"],
+    "nlp_analysis": [
+        "simple_sentiment_score",
+        "iter_sentiment_scores",
+        "batch_sentiment_scores",
+        "benchmark_sentiment_throughput",
+        "extract_topics",
+        "IncrementalTopicModel",
+    ],
+    "pipeline": ["Pipeline", "Stage"],
+    "portfolio_backtest": ["align_series", "backtest_portfolio"],
+    "records": ["SymbolTable", "TradeRecords", "WalletTxRecords"],
+    "regime_detection": ["add_volatility_regime"],
+    "rpc_harness": ["Cassette", "EndpointProfile", "MockRpcServer", "load_test", "record", "replay"],
+    "sniping_simulator": [
+        "LatencyModel",
+        "SnipeSimulator",
+        "generate_events",
+        "read_event_chunks",
+        "write_events",
+    ],
+    "solana_rpc": ["rpc_batch", "rpc_call", "set_transport"],
+    "top_trader_scanner": ["analyze_top_traders", "mimic_strategy", "scan_market_with_kols"],
+    "trend_detection": ["extract_trending_tokens", "TrendTracker"],
+    "wallet_tracker": ["TokenBucket", "WalletTracker"],
+    "wallet_analysis": [
+        "fetch_wallet_history",
+        "aggregate_wallet_stats",
+        "detect_repeating_patterns",
+        "scan_addresses_for_patterns",
+        "wallet_performance",
+        "rank_wallets",
+    ],
+}
+
+_SUBMODULES = set(_EXPORTS) | {"benchmark", "example_pipeline", "instrumentation"}
+_ATTR_TO_MODULE = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = sorted(_ATTR_TO_MODULE)
+
+
+def __getattr__(name: str) -> object:
+    module = _ATTR_TO_MODULE.get(name)
+    if module is not None:
+        value = getattr(importlib.import_module(f".{module}", __name__), name)
+    elif name in _SUBMODULES:
+        value = importlib.import_module(f".{name}", __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__) | _SUBMODULES)
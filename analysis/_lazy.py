@@ -0,0 +1,35 @@
+"""Helpers for deferring heavy optional dependencies until first use."""
+
+import importlib
+from types import ModuleType
+from typing import Dict, Optional
+
+_MISSING: Dict[str, bool] = {}
+
+
+def optional_import(name: str) -> Optional[ModuleType]:
+    """Import ``name`` on demand, returning None if it is not installed.
+
+    Successful imports are cached by ``sys.modules``; failures are remembered
+    here so a missing package is only probed once per process.
+    """
+    if name in _MISSING:
+        return None
+    try:
+        return importlib.import_module(name)
+    except Exception:
+        _MISSING[name] = True
+        return None
+
+
+def require(name: str, feature: str, package: Optional[str] = None) -> ModuleType:
+    """Import ``name`` for ``feature``, raising a helpful ImportError if absent.
+
+    ``package`` is the distribution to install when it differs from the top
+    level module name (e.g. ``scikit-learn`` for ``sklearn``).
+    """
+    module = optional_import(name)
+    if module is None:
+        package = package or name.split(".")[0]
+        raise ImportError(f"{feature} requires {package} (pip install {package})")
+    return module
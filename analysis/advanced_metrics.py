@@ -1,6 +1,9 @@
 """Advanced metrics for on-chain and market analysis."""
 
-from typing import List, Dict, Any
+from itertools import accumulate
+from typing import List, Dict, Any, Union
+
+from .records import TradeRecords, WalletTxRecords
 
 
 def market_cap(price: float, supply: float) -> float:
@@ -8,8 +11,10 @@ def market_cap(price: float, supply: float) -> float:
     return price * supply
 
 
-def fee_summary(transactions: List[Dict[str, Any]]) -> float:
-    """Aggregate fees from a list of transactions."""
+def fee_summary(transactions: Union[List[Dict[str, Any]], TradeRecords, WalletTxRecords]) -> float:
+    """Aggregate fees from a list of transactions or a record container."""
+    if isinstance(transactions, (TradeRecords, WalletTxRecords)):
+        return sum(transactions.columns["fee"])
     return sum(tx.get("fee", 0.0) for tx in transactions)
 
 
@@ -27,8 +32,11 @@ def fibonacci_retracements(prices: List[float]) -> Dict[str, float]:
     }
 
 
-def cumulative_volume_delta(trades: List[Dict[str, Any]]) -> List[float]:
-    """Compute the CVD series from trade data."""
+def cumulative_volume_delta(trades: Union[List[Dict[str, Any]], TradeRecords]) -> List[float]:
+    """Compute the CVD series from trade dicts or ``TradeRecords``."""
+    if isinstance(trades, TradeRecords):
+        cols = trades.columns
+        return list(accumulate(v * s for v, s in zip(cols["volume"], cols["side"])))
     cvd = 0.0
     series = []
     for t in trades:
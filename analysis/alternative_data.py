@@ -1,16 +1,35 @@
 from urllib.request import urlopen
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
+import http.client
 import json
-from typing import Dict
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
 
 from .data_cache import load_cache, save_cache
 
+GITHUB_API_URL = "https://api.github.com"
+# Snapshots kept per repo for growth queries (hourly polling covers ~2 weeks).
+MAX_SNAPSHOTS = 336
+
+
+def _activity_from_payload(data: Dict[str, Any]) -> Dict[str, int]:
+    return {
+        "stars": int(data.get("stargazers_count", 0)),
+        "forks": int(data.get("forks_count", 0)),
+        "watchers": int(data.get("subscribers_count", 0)),
+    }
+
 
 def fetch_github_activity(repo: str = "bitcoin/bitcoin", use_cache: bool = True) -> Dict[str, int]:
     """Fetch basic GitHub repository statistics.
 
     Returns a dictionary with star, fork and watcher counts. Falls back to
     zero-valued metrics if the request fails. When ``use_cache`` is True, the
-    results are stored in the JSON cache for reuse across runs.
+    results are stored in the JSON cache for reuse across runs. Failed
+    requests are never cached so they cannot mask later successful fetches.
     """
 
     cache_key = f"github_activity_{repo.replace('/', '_')}"
@@ -19,23 +38,183 @@ def fetch_github_activity(repo: str = "bitcoin/bitcoin", use_cache: bool = True)
         if cached is not None:
             return cached
 
-    url = f"https://api.github.com/repos/{repo}"
+    url = f"{GITHUB_API_URL}/repos/{repo}"
     try:
         with urlopen(url, timeout=10) as resp:
             data = json.load(resp)
-        activity = {
-            "stars": int(data.get("stargazers_count", 0)),
-            "forks": int(data.get("forks_count", 0)),
-            "watchers": int(data.get("subscribers_count", 0)),
-        }
+        activity = _activity_from_payload(data)
         if use_cache:
             save_cache(cache_key, activity)
         return activity
     except Exception:
-        activity = {"stars": 0, "forks": 0, "watchers": 0}
-        if use_cache:
-            save_cache(cache_key, activity)
-        return activity
+        return {"stars": 0, "forks": 0, "watchers": 0}
+
+
+class GitHubActivityFetcher:
+    """Concurrent, conditional-request fetcher for many GitHub repositories.
+
+    Each worker thread keeps its own keep-alive connection, so hundreds of
+    repos are fetched without a TCP/TLS handshake per request. Responses are
+    cached under ``github_etag_<repo>`` together with their ``ETag``; once the
+    entry is older than ``ttl`` seconds it is revalidated with
+    ``If-None-Match``, and a ``304 Not Modified`` (which GitHub does not count
+    against the rate limit) simply refreshes the entry. Failures are never
+    written to the cache: the last good value is served if there is one.
+
+    Every successful fetch appends a snapshot to ``github_history_<repo>``
+    (capped at ``max_snapshots``), which ``growth`` uses for trend queries.
+
+    ``base_url`` can point at a local mock API for offline runs.
+    """
+
+    def __init__(
+        self,
+        base_url: str = GITHUB_API_URL,
+        token: Optional[str] = None,
+        ttl: float = 3600.0,
+        max_workers: int = 16,
+        timeout: float = 10.0,
+        max_snapshots: int = MAX_SNAPSHOTS,
+    ) -> None:
+        parts = urlsplit(base_url)
+        self._scheme = parts.scheme
+        self._netloc = parts.netloc
+        self._prefix = parts.path.rstrip("/")
+        self.token = token if token is not None else os.getenv("GITHUB_TOKEN")
+        self.ttl = ttl
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.max_snapshots = max_snapshots
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.stats = {"fetched": 0, "not_modified": 0, "cached": 0, "failed": 0}
+
+    @staticmethod
+    def _key(prefix: str, repo: str) -> str:
+        return f"{prefix}_{repo.replace('/', '_')}"
+
+    def _connection(self) -> http.client.HTTPConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            cls = http.client.HTTPSConnection if self._scheme == "https" else http.client.HTTPConnection
+            conn = cls(self._netloc, timeout=self.timeout)
+            self._local.conn = conn
+        return conn
+
+    def _drop_connection(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _request(self, repo: str, etag: Optional[str]):
+        headers = {"Accept": "application/vnd.github+json", "User-Agent": "analysis-pipeline"}
+        if etag:
+            headers["If-None-Match"] = etag
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        path = f"{self._prefix}/repos/{repo}"
+        # Retry once on a fresh connection if the server closed the idle one.
+        for attempt in range(2):
+            conn = self._connection()
+            try:
+                conn.request("GET", path, headers=headers)
+                resp = conn.getresponse()
+                body = resp.read()
+                return resp.status, resp.getheader("ETag"), body
+            except (http.client.HTTPException, OSError):
+                self._drop_connection()
+                if attempt:
+                    raise
+
+    def _count(self, field: str) -> None:
+        with self._lock:
+            self.stats[field] += 1
+
+    def _record_snapshot(self, repo: str, activity: Dict[str, int], now: float) -> None:
+        key = self._key("github_history", repo)
+        history = load_cache(key) or []
+        history.append({"timestamp": now, **activity})
+        save_cache(key, history[-self.max_snapshots :])
+
+    def fetch(self, repo: str, force: bool = False) -> Dict[str, int]:
+        """Return activity for a single repo, revalidating stale entries."""
+        key = self._key("github_etag", repo)
+        entry = load_cache(key)
+        now = time.time()
+        if entry is not None and not force and now - entry.get("fetched_at", 0) < self.ttl:
+            self._count("cached")
+            return entry["activity"]
+        try:
+            status, etag, body = self._request(repo, entry.get("etag") if entry else None)
+        except Exception:
+            status, etag, body = None, None, b""
+        if status == 304 and entry is not None:
+            entry["fetched_at"] = now
+            save_cache(key, entry)
+            self._count("not_modified")
+            return entry["activity"]
+        if status == 200:
+            try:
+                activity = _activity_from_payload(json.loads(body))
+            except ValueError:
+                activity = None
+            if activity is not None:
+                save_cache(key, {"etag": etag, "fetched_at": now, "activity": activity})
+                self._record_snapshot(repo, activity, now)
+                self._count("fetched")
+                return activity
+        self._count("failed")
+        if entry is not None:
+            return entry["activity"]
+        return {"stars": 0, "forks": 0, "watchers": 0}
+
+    def fetch_many(self, repos: List[str], force: bool = False) -> Dict[str, Dict[str, int]]:
+        """Fetch activity for many repos concurrently."""
+        if not repos:
+            return {}
+        workers = min(self.max_workers, len(repos))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(lambda r: self.fetch(r, force=force), repos))
+        return dict(zip(repos, results))
+
+    def history(self, repo: str) -> List[Dict[str, Any]]:
+        """Return the stored snapshot series for ``repo`` (oldest first)."""
+        return load_cache(self._key("github_history", repo)) or []
+
+    def growth(
+        self, repo: str, window: Optional[float] = None, now: Optional[float] = None
+    ) -> Dict[str, int]:
+        """Star/fork/watcher growth over the last ``window`` seconds.
+
+        Compares the latest snapshot with the last one taken at or before
+        ``now - window`` (the oldest stored snapshot when none is that old,
+        or when ``window`` is None). Snapshots are only recorded on a 200, so
+        the series is sparse and the baseline may predate the window start.
+        """
+        series = self.history(repo)
+        if not series:
+            return {"star_growth": 0, "fork_growth": 0, "watcher_growth": 0}
+        latest = series[-1]
+        base = series[0]
+        if window is not None:
+            cutoff = (time.time() if now is None else now) - window
+            for snapshot in series:
+                if snapshot["timestamp"] > cutoff:
+                    break
+                base = snapshot
+        return {
+            "star_growth": latest["stars"] - base["stars"],
+            "fork_growth": latest["forks"] - base["forks"],
+            "watcher_growth": latest["watchers"] - base["watchers"],
+        }
+
+
+def fetch_github_activity_batch(
+    repos: List[str], max_workers: int = 16, ttl: float = 3600.0, force: bool = False
+) -> Dict[str, Dict[str, int]]:
+    """Fetch activity for many repos concurrently; see ``GitHubActivityFetcher``."""
+    return GitHubActivityFetcher(ttl=ttl, max_workers=max_workers).fetch_many(repos, force=force)
 
 
 def analyze_github_trend(repo: str = "bitcoin/bitcoin") -> Dict[str, int]:
@@ -43,12 +222,17 @@ def analyze_github_trend(repo: str = "bitcoin/bitcoin") -> Dict[str, int]:
 
     The function compares the current activity with the last cached snapshot to
     estimate growth in stars and forks. The latest snapshot is stored for
-    future comparisons.
+    future comparisons. Current activity goes through the conditional-request
+    cache, so unchanged repos cost no rate limit and failed fetches do not
+    overwrite the previous snapshot.
     """
 
     prev_key = f"github_prev_{repo.replace('/', '_')}"
     prev = load_cache(prev_key) or {"stars": 0, "forks": 0}
-    current = fetch_github_activity(repo, use_cache=False)
+    fetcher = GitHubActivityFetcher(ttl=0)
+    current = fetcher.fetch(repo)
+    if fetcher.stats["failed"]:
+        return {"star_growth": 0, "fork_growth": 0}
     trend = {
         "star_growth": current["stars"] - prev.get("stars", 0),
         "fork_growth": current["forks"] - prev.get("forks", 0),
@@ -1,8 +1,9 @@
-from typing import List, Dict, Tuple, Optional
+from typing import Any, List, Dict, Tuple, Optional
 import math
 from itertools import product
 
 from .feature_engineering import add_technical_indicators
+from .instrumentation import timed
 from .regime_detection import add_volatility_regime
 
 def simple_moving_average_strategy(candles: List[Dict], window: int = 14) -> List[Dict]:
@@ -24,6 +25,7 @@ def regime_adaptive_strategy(candles: List[Dict], regimes_windows: Dict[int, int
         candle["position"] = 1 if (sma is not None and candle["close"] > sma) else 0
     return candles
 
+@timed("backtest_seconds")
 def backtest(candles: List[Dict], start_equity: float = 1.0) -> List[Dict]:
     """Vectorized-like backtest using a simple loop.
 
@@ -63,6 +65,7 @@ def sharpe_ratio(candles: List[Dict], freq: int = 365) -> float:
     return (mean / std) * math.sqrt(freq)
 
 
+@timed("performance_stats_seconds")
 def performance_stats(candles: List[Dict]) -> Dict[str, float]:
     """Return basic performance metrics for a backtested series."""
     equities = [c.get("equity", 1.0) for c in candles]
@@ -88,19 +91,24 @@ def performance_stats(candles: List[Dict]) -> Dict[str, float]:
     }
 
 
+@timed("optimize_regime_windows_seconds")
 def optimize_regime_windows(
-    candles: List[Dict], low_windows: List[int], high_windows: List[int]
+    candles: List[Dict], low_windows: List[int], high_windows: List[int], store: Any = None
 ) -> Tuple[Dict[int, int], List[Dict], float]:
-    """Brute-force search of SMA windows for each volatility regime."""
+    """Brute-force search of SMA windows for each volatility regime.
+
+    Passing a ``feature_store.FeatureStore`` as ``store`` computes each
+    window's indicators and the regime labels once for the whole sweep.
+    """
     best_sr = -float("inf")
     best_params: Dict[int, int] = {0: low_windows[0], 1: high_windows[0]}
     best_data: List[Dict] = []
     for lw, hw in product(low_windows, high_windows):
         local = [c.copy() for c in candles]
-        local = add_technical_indicators(local, window=lw)
+        local = add_technical_indicators(local, window=lw, store=store)
         if hw != lw:
-            local = add_technical_indicators(local, window=hw)
-        local = add_volatility_regime(local)
+            local = add_technical_indicators(local, window=hw, store=store)
+        local = add_volatility_regime(local, store=store)
         local = regime_adaptive_strategy(local, {0: lw, 1: hw})
         local = backtest(local)
         sr = sharpe_ratio(local)
@@ -111,11 +119,13 @@ def optimize_regime_windows(
     return best_params, best_data, best_sr
 
 
+@timed("walk_forward_optimize_seconds")
 def walk_forward_optimize(
     candles: List[Dict],
     train_size: int = 200,
     test_size: int = 50,
     windows: Optional[List[int]] = None,
+    store: Any = None,
 ) -> Tuple[List[int], List[Dict], Dict[str, float]]:
     """Run a walk-forward backtest optimizing SMA windows on each segment.
 
@@ -134,6 +144,8 @@ def walk_forward_optimize(
         Number of candles evaluated out-of-sample after optimization.
     windows : List[int]
         SMA windows to sweep during optimization.
+    store : feature_store.FeatureStore, optional
+        Cache for the indicator columns, shared across folds and runs.
 
     Returns
     -------
@@ -153,7 +165,7 @@ def walk_forward_optimize(
         best_sr = -float("inf")
         for w in windows:
             tr = [c.copy() for c in train]
-            tr = add_technical_indicators(tr, window=w)
+            tr = add_technical_indicators(tr, window=w, store=store)
             tr = simple_moving_average_strategy(tr, window=w)
             tr = backtest(tr)
             sr = sharpe_ratio(tr)
@@ -162,7 +174,7 @@ def walk_forward_optimize(
                 best_w = w
         chosen.append(best_w)
         te = [c.copy() for c in test]
-        te = add_technical_indicators(te, window=best_w)
+        te = add_technical_indicators(te, window=best_w, store=store)
         te = simple_moving_average_strategy(te, window=best_w)
         te = backtest(te, start_equity=equity)
         equity = te[-1]["equity"] if te else equity
@@ -0,0 +1,405 @@
+"""Benchmark harness for the analysis hot paths.
+
+Generates deterministic synthetic candles, trades, wallet histories and social
+posts at several scales, times every public hot-path function and records its
+peak traced memory. Results are stored as JSON and can be compared against a
+saved baseline::
+
+    python -m analysis.benchmark --scales 1k,100k --save baseline.json
+    python -m analysis.benchmark --scales 1k,100k --compare baseline.json
+
+``--compare`` exits with status 1 when any benchmark is slower than the
+baseline by more than ``--threshold`` (default 20%).
+
+``--import-budget`` instead measures cold import time of the entry-point
+modules with ``python -X importtime`` and fails when one exceeds its budget
+in ``IMPORT_BUDGETS_MS``.
+"""
+
+import argparse
+import gc
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from . import (
+    advanced_metrics,
+    backtesting,
+    feature_engineering,
+    innovative_analysis,
+    nlp_analysis,
+    regime_detection,
+    trend_detection,
+    wallet_analysis,
+)
+
+SCALES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+
+# Cold-start budgets (cumulative import time) for modules used by short-lived
+# CLI and cron jobs. None of these may pull in scikit-learn or NumPy.
+IMPORT_BUDGETS_MS = {
+    "analysis": 20.0,
+    "analysis.solana_rpc": 150.0,
+    "analysis.data_ingestion": 150.0,
+    "analysis.nlp_analysis": 150.0,
+    "analysis.example_pipeline": 200.0,
+}
+
+_TOKENS = ["SOL", "BONK", "WIF", "JUP", "PYTH", "RAY", "ORCA", "MEW", "POPCAT", "OG", "KOL"]
+
+
+# -- deterministic data generators -------------------------------------------
+def synthetic_candles(n: int, seed: int = 0, start_price: float = 100.0) -> List[Dict[str, Any]]:
+    """Geometric random-walk candles shaped like ``fetch_ohlcv`` output."""
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    price = start_price
+    candles = []
+    for i in range(n):
+        # Alternate calm and volatile stretches so regime detection has work.
+        vol = 0.004 if (i // 500) % 2 == 0 else 0.02
+        open_ = price
+        price = max(price * (1 + rng.gauss(0.0002, vol)), 1e-9)
+        candles.append(
+            {
+                "timestamp": start + timedelta(minutes=i),
+                "open": open_,
+                "high": max(open_, price) * (1 + abs(rng.gauss(0, vol / 2))),
+                "low": min(open_, price) * (1 - abs(rng.gauss(0, vol / 2))),
+                "close": price,
+                "volume": rng.uniform(1, 1000),
+            }
+        )
+    return candles
+
+
+def synthetic_trades(n: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Trades shaped like ``fetch_trades`` output."""
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    price = 100.0
+    trades = []
+    for i in range(n):
+        price *= 1 + rng.uniform(-0.001, 0.001)
+        trades.append(
+            {
+                "price": price,
+                "volume": rng.uniform(0.1, 1.0),
+                "side": "buy" if rng.random() < 0.5 else "sell",
+                "timestamp": start + timedelta(milliseconds=50 * i),
+                "fee": 0.000005,
+            }
+        )
+    return trades
+
+
+def synthetic_wallet_histories(
+    n: int, seed: int = 0, n_wallets: Optional[int] = None
+) -> Dict[str, List[Dict[str, Any]]]:
+    """``n`` transactions spread over wallets, shaped like ``fetch_wallet_history``."""
+    rng = random.Random(seed)
+    n_wallets = n_wallets or max(1, min(1000, n // 100))
+    wallets = [f"Wallet{w:06d}" for w in range(n_wallets)]
+    histories: Dict[str, List[Dict[str, Any]]] = {w: [] for w in wallets}
+    for i in range(n):
+        wallet = wallets[rng.randrange(n_wallets)]
+        histories[wallet].append(
+            {
+                "signature": f"sig_{i}",
+                "slot": i,
+                "token": rng.choice(_TOKENS),
+                "amount": rng.uniform(-5, 5),
+                "fee": 0.000005,
+            }
+        )
+    return histories
+
+
+def synthetic_posts(n: int, seed: int = 0) -> List[Dict[str, str]]:
+    """Social posts shaped like ``fetch_social_posts`` output."""
+    rng = random.Random(seed)
+    words = sorted(nlp_analysis.DEFAULT_LEXICON) + [
+        "not", "the", "new", "pool", "launch", "just", "aped", "into", "wen", "moon", "chart",
+    ]
+    sources = ["twitter", "telegram", "github", "news"]
+    posts = []
+    for _ in range(n):
+        text = [rng.choice(words) for _ in range(rng.randint(5, 20))]
+        for _ in range(rng.randint(0, 2)):
+            text.insert(rng.randrange(len(text) + 1), rng.choice(_TOKENS))
+        posts.append({"source": rng.choice(sources), "text": " ".join(text)})
+    return posts
+
+
+# -- benchmark registry ------------------------------------------------------
+class Benchmark(NamedTuple):
+    name: str
+    dataset: str
+    prepare: Callable[[Any], Tuple[Any, ...]]
+    func: Callable[..., Any]
+    max_scale: int = SCALES["1m"]
+
+
+def _copy_rows(rows: List[Dict[str, Any]]) -> Tuple[Any, ...]:
+    return ([r.copy() for r in rows],)
+
+
+def _closes(rows: List[Dict[str, Any]]) -> Tuple[Any, ...]:
+    return ([r["close"] for r in rows],)
+
+
+def _with_positions(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    local = feature_engineering.add_technical_indicators([r.copy() for r in rows], window=14)
+    return backtesting.simple_moving_average_strategy(local, window=14)
+
+
+def _backtested(rows: List[Dict[str, Any]]) -> Tuple[Any, ...]:
+    return (backtesting.backtest(_with_positions(rows)),)
+
+
+def _all_transactions(histories: Dict[str, List[Dict[str, Any]]]) -> Tuple[Any, ...]:
+    return ([tx for h in histories.values() for tx in h],)
+
+
+BENCHMARKS: List[Benchmark] = [
+    Benchmark("feature_engineering.add_technical_indicators", "candles", _copy_rows,
+              feature_engineering.add_technical_indicators),
+    Benchmark("feature_engineering.add_bollinger_bands", "candles", _copy_rows,
+              feature_engineering.add_bollinger_bands),
+    Benchmark("feature_engineering.add_macd", "candles", _copy_rows, feature_engineering.add_macd),
+    Benchmark("regime_detection.add_volatility_regime", "candles", _copy_rows,
+              regime_detection.add_volatility_regime, SCALES["100k"]),
+    Benchmark("backtesting.simple_moving_average_strategy", "candles",
+              lambda rows: (feature_engineering.add_technical_indicators([r.copy() for r in rows]),),
+              backtesting.simple_moving_average_strategy),
+    Benchmark("backtesting.backtest", "candles", lambda rows: (_with_positions(rows),),
+              backtesting.backtest),
+    Benchmark("backtesting.sharpe_ratio", "candles", _backtested, backtesting.sharpe_ratio),
+    Benchmark("backtesting.performance_stats", "candles", _backtested, backtesting.performance_stats),
+    Benchmark("backtesting.optimize_regime_windows", "candles",
+              lambda rows: (rows, [20, 30, 40], [5, 10, 15]),
+              backtesting.optimize_regime_windows, SCALES["1k"]),
+    Benchmark("backtesting.walk_forward_optimize", "candles", lambda rows: (rows, 200, 50),
+              backtesting.walk_forward_optimize, SCALES["100k"]),
+    Benchmark("advanced_metrics.fee_summary", "trades", lambda rows: (rows,),
+              advanced_metrics.fee_summary),
+    Benchmark("advanced_metrics.fibonacci_retracements", "candles", _closes,
+              advanced_metrics.fibonacci_retracements),
+    Benchmark("advanced_metrics.cumulative_volume_delta", "trades", lambda rows: (rows,),
+              advanced_metrics.cumulative_volume_delta),
+    Benchmark("advanced_metrics.holder_distribution", "candles",
+              lambda rows: ({f"holder{i}": r["volume"] for i, r in enumerate(rows)},),
+              advanced_metrics.holder_distribution),
+    Benchmark("advanced_metrics.zscore_anomalies", "candles", _closes,
+              advanced_metrics.zscore_anomalies),
+    Benchmark("innovative_analysis.cross_correlation_lag", "candles",
+              lambda rows: ([r["close"] for r in rows], [r["volume"] for r in rows]),
+              innovative_analysis.cross_correlation_lag),
+    Benchmark("innovative_analysis.hurst_exponent", "candles", _closes,
+              innovative_analysis.hurst_exponent, SCALES["100k"]),
+    Benchmark("wallet_analysis.aggregate_wallet_stats", "wallets", _all_transactions,
+              wallet_analysis.aggregate_wallet_stats),
+    Benchmark("wallet_analysis.detect_repeating_patterns", "wallets", _all_transactions,
+              wallet_analysis.detect_repeating_patterns),
+    Benchmark("wallet_analysis.wallet_performance", "wallets", _all_transactions,
+              wallet_analysis.wallet_performance),
+    Benchmark("wallet_analysis.rank_wallets", "wallets", lambda h: (h,),
+              wallet_analysis.rank_wallets),
+    Benchmark("nlp_analysis.batch_sentiment_scores", "posts", lambda posts: (posts,),
+              nlp_analysis.batch_sentiment_scores),
+    Benchmark("trend_detection.extract_trending_tokens", "posts", lambda posts: (posts,),
+              trend_detection.extract_trending_tokens),
+]
+
+_GENERATORS: Dict[str, Callable[[int], Any]] = {
+    "candles": synthetic_candles,
+    "trades": synthetic_trades,
+    "wallets": synthetic_wallet_histories,
+    "posts": synthetic_posts,
+}
+
+
+# -- measurement -------------------------------------------------------------
+def _time_batch(bench: Benchmark, data: Any, min_time: float) -> float:
+    # Fast functions are called repeatedly until ``min_time`` of measured
+    # time accumulates, so sub-millisecond results are not pure timer noise.
+    # Functions that annotate rows only overwrite their own keys on repeat
+    # calls, so the prepared arguments are reused within a batch.
+    args = bench.prepare(data)
+    gc.collect()
+    total = 0.0
+    calls = 0
+    while calls == 0 or total < min_time:
+        start = time.perf_counter()
+        bench.func(*args)
+        total += time.perf_counter() - start
+        calls += 1
+    return total / calls
+
+
+def _peak_memory(bench: Benchmark, data: Any) -> int:
+    args = bench.prepare(data)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        bench.func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def run_benchmarks(
+    scales: Optional[List[str]] = None,
+    pattern: Optional[str] = None,
+    repeat: int = 3,
+    memory: bool = True,
+    seed: int = 0,
+    min_time: float = 0.05,
+    log: Callable[[str], None] = print,
+) -> Dict[str, Any]:
+    """Run the registered benchmarks and return a JSON-serialisable report.
+
+    Each entry records the best mean per-call wall time over ``repeat``
+    batches of at least ``min_time`` seconds each and, when
+    ``memory`` is True, the peak memory allocated during one extra traced
+    run. Benchmarks whose ``max_scale`` is below a scale are skipped there.
+    """
+    scales = scales or ["1k"]
+    results: Dict[str, Dict[str, Any]] = {}
+    for label in scales:
+        n = SCALES[label]
+        datasets: Dict[str, Any] = {}
+        for bench in BENCHMARKS:
+            if pattern and pattern not in bench.name:
+                continue
+            if n > bench.max_scale:
+                continue
+            if bench.dataset not in datasets:
+                datasets[bench.dataset] = _GENERATORS[bench.dataset](n, seed=seed)
+            data = datasets[bench.dataset]
+            best = min(_time_batch(bench, data, min_time) for _ in range(max(1, repeat)))
+            entry: Dict[str, Any] = {"seconds": best}
+            if memory:
+                entry["peak_bytes"] = _peak_memory(bench, data)
+            key = f"{bench.name}@{label}"
+            results[key] = entry
+            log(f"{key:<60} {best * 1000:12.3f} ms" + (
+                f" {entry['peak_bytes'] / 1e6:10.2f} MB" if memory else ""
+            ))
+    return {
+        "meta": {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "created": datetime.utcnow().isoformat(timespec="seconds"),
+            "repeat": repeat,
+            "seed": seed,
+            "min_time": min_time,
+        },
+        "results": results,
+    }
+
+
+def compare_results(
+    current: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 0.2
+) -> List[Dict[str, Any]]:
+    """Compare two reports and return one row per benchmark present in both.
+
+    A row is flagged ``regression`` when its time exceeds the baseline by more
+    than ``threshold`` (0.2 = 20% slower).
+    """
+    rows = []
+    base = baseline.get("results", {})
+    for key, entry in current.get("results", {}).items():
+        if key not in base or not base[key].get("seconds"):
+            continue
+        ratio = entry["seconds"] / base[key]["seconds"]
+        row = {"benchmark": key, "ratio": ratio, "regression": ratio > 1 + threshold}
+        if "peak_bytes" in entry and base[key].get("peak_bytes"):
+            row["memory_ratio"] = entry["peak_bytes"] / base[key]["peak_bytes"]
+        rows.append(row)
+    return rows
+
+
+def measure_import_time(module: str, runs: int = 3) -> float:
+    """Best-of-``runs`` cumulative import time of ``module`` in milliseconds.
+
+    Each run is a fresh interpreter with ``-X importtime``, so nothing is
+    already cached in ``sys.modules``.
+    """
+    best = float("inf")
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        for line in proc.stderr.splitlines():
+            parts = line.split("|")
+            if len(parts) == 3 and parts[2].strip() == module:
+                best = min(best, int(parts[1]) / 1000.0)
+    return best
+
+
+def check_import_budgets(
+    budgets: Optional[Dict[str, float]] = None, runs: int = 3
+) -> List[Dict[str, Any]]:
+    """Measure each module against its budget; rows flag ``over_budget``."""
+    budgets = budgets or IMPORT_BUDGETS_MS
+    rows = []
+    for module, budget in budgets.items():
+        ms = measure_import_time(module, runs)
+        rows.append({"module": module, "ms": ms, "budget_ms": budget, "over_budget": ms > budget})
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", default="1k", help="comma separated subset of 1k,100k,1m")
+    parser.add_argument("--filter", default=None, help="only run benchmarks containing this text")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc runs")
+    parser.add_argument("--save", default=None, help="write results JSON to this path")
+    parser.add_argument("--compare", default=None, help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument("--import-budget", action="store_true",
+                        help="check cold import times against IMPORT_BUDGETS_MS and exit")
+    args = parser.parse_args(argv)
+
+    if args.import_budget:
+        rows = check_import_budgets()
+        for row in rows:
+            flag = "OVER BUDGET" if row["over_budget"] else "ok"
+            print(f"{row['module']:<40} {row['ms']:8.1f} ms / {row['budget_ms']:6.1f} ms {flag}")
+        return 1 if any(row["over_budget"] for row in rows) else 0
+
+    report = run_benchmarks(
+        scales=[s.strip() for s in args.scales.split(",") if s.strip()],
+        pattern=args.filter,
+        repeat=args.repeat,
+        memory=not args.no_memory,
+    )
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        rows = compare_results(report, baseline, args.threshold)
+        for row in rows:
+            flag = "REGRESSION" if row["regression"] else "ok"
+            print(f"{row['benchmark']:<60} x{row['ratio']:6.2f} {flag}")
+        if any(row["regression"] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
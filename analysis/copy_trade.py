@@ -0,0 +1,186 @@
+"""Streaming copy-trade signals from KOL wallet transactions.
+
+``top_trader_scanner.mimic_strategy`` re-sums a whole history per call. The
+``CopyTradeEngine`` here consumes transactions one at a time as they arrive
+(e.g. from a log subscription) and keeps per-wallet, per-token net flow, so
+each update is O(1) and signals fire on the transaction that crosses a
+threshold:
+
+* wallet signals: a tracked wallet's net flow in a token rises to
+  ``buy_threshold`` (``"buy"``) or falls back to ``sell_threshold``
+  (``"sell"``);
+* consensus signals: at least ``consensus`` distinct tracked wallets produced
+  the same wallet signal for a token within ``window_slots`` slots
+  ("3 of the tracked wallets bought within 10 slots").
+
+Transactions are dicts (or ``WalletTxRecords`` rows) with ``wallet``,
+``token``, signed ``amount`` (positive = bought) and ``slot``; an optional
+``signature`` is used to drop duplicates, and ``received_at`` (epoch seconds
+when our listener saw the transaction, else ``blockTime``) is used to measure
+end-to-end signal latency. Consensus windows assume slots arrive roughly in
+order per token, as they do from a live subscription.
+"""
+
+import time
+from collections import Counter, deque
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from .instrumentation import incr, observe, percentile
+
+Signal = Dict[str, Any]
+
+
+class _Window:
+    """Wallet signals for one token and side inside the slot window."""
+
+    __slots__ = ("events", "wallets", "fired_slot")
+
+    def __init__(self) -> None:
+        self.events: Deque[Tuple[int, str]] = deque()
+        self.wallets: Counter = Counter()
+        self.fired_slot: Optional[int] = None
+
+
+class CopyTradeEngine:
+    """Incremental net-flow tracker emitting wallet and consensus signals.
+
+    Parameters
+    ----------
+    wallets : Iterable[str], optional
+        Tracked wallets; transactions from other wallets are ignored. When
+        omitted every wallet is tracked.
+    buy_threshold : float
+        Net amount at which a wallet counts as holding the token.
+    sell_threshold : float
+        Net amount at or below which a holding wallet counts as exited.
+    consensus : int
+        Distinct wallets needed for a consensus signal (0 disables them).
+    window_slots : int
+        Slot window for consensus.
+    on_signal : Callable[[Signal], None], optional
+        Called for every signal as soon as it is produced.
+    """
+
+    def __init__(
+        self,
+        wallets: Optional[Iterable[str]] = None,
+        buy_threshold: float = 1.0,
+        sell_threshold: float = 0.0,
+        consensus: int = 3,
+        window_slots: int = 10,
+        on_signal: Optional[Callable[[Signal], None]] = None,
+        dedupe: int = 100_000,
+        latency_samples: int = 10_000,
+    ) -> None:
+        if sell_threshold >= buy_threshold:
+            raise ValueError("sell_threshold must be below buy_threshold")
+        self.wallets: Optional[Set[str]] = set(wallets) if wallets is not None else None
+        self.buy_threshold = buy_threshold
+        self.sell_threshold = sell_threshold
+        self.consensus = consensus
+        self.window_slots = window_slots
+        self.on_signal = on_signal
+        self.net: Dict[Tuple[str, str], float] = {}
+        self.holding: Set[Tuple[str, str]] = set()
+        self._windows: Dict[Tuple[str, str], _Window] = {}
+        self._seen: Set[str] = set()
+        self._seen_order: Deque[str] = deque()
+        self._dedupe = dedupe
+        self.latencies: Deque[float] = deque(maxlen=latency_samples)
+        self.stats = {"transactions": 0, "ignored": 0, "duplicates": 0, "signals": 0}
+
+    def process(self, tx: Any, wallet: Optional[str] = None) -> List[Signal]:
+        """Apply one transaction and return the signals it triggered.
+
+        ``wallet`` overrides ``tx["wallet"]``, which lets a per-wallet history
+        (e.g. from ``fetch_wallet_history``) be streamed directly.
+        """
+        wallet = wallet or tx.get("wallet")
+        token = tx.get("token")
+        if not token or (self.wallets is not None and wallet not in self.wallets):
+            self.stats["ignored"] += 1
+            return []
+        signature = tx.get("signature")
+        if signature and self._dedupe:
+            if signature in self._seen:
+                self.stats["duplicates"] += 1
+                return []
+            self._seen.add(signature)
+            self._seen_order.append(signature)
+            if len(self._seen_order) > self._dedupe:
+                self._seen.discard(self._seen_order.popleft())
+        self.stats["transactions"] += 1
+
+        key = (wallet, token)
+        net = self.net.get(key, 0.0) + (tx.get("amount") or 0)
+        self.net[key] = net
+        slot = tx.get("slot") or 0
+
+        if key not in self.holding and net >= self.buy_threshold:
+            self.holding.add(key)
+            action = "buy"
+        elif key in self.holding and net <= self.sell_threshold:
+            self.holding.discard(key)
+            action = "sell"
+        else:
+            return []
+
+        signals = [{"type": "wallet", "action": action, "token": token, "wallets": [wallet],
+                    "slot": slot, "net": net}]
+        if self.consensus:
+            agreed = self._consensus(token, action, wallet, slot)
+            if agreed is not None:
+                signals.append({"type": "consensus", "action": action, "token": token,
+                                "wallets": agreed, "slot": slot})
+        received = tx.get("received_at")
+        if received is None and tx.get("blockTime"):
+            received = tx["blockTime"]
+        for signal in signals:
+            self._emit(signal, received)
+        return signals
+
+    def _consensus(self, token: str, action: str, wallet: str, slot: int) -> Optional[List[str]]:
+        window = self._windows.get((token, action))
+        if window is None:
+            window = self._windows[(token, action)] = _Window()
+        window.events.append((slot, wallet))
+        window.wallets[wallet] += 1
+        oldest = slot - self.window_slots
+        while window.events and window.events[0][0] < oldest:
+            _, old = window.events.popleft()
+            window.wallets[old] -= 1
+            if not window.wallets[old]:
+                del window.wallets[old]
+        if len(window.wallets) < self.consensus:
+            return None
+        # Fire once per window: a new consensus needs the old one to expire.
+        if window.fired_slot is not None and window.fired_slot >= oldest:
+            return None
+        window.fired_slot = slot
+        return list(window.wallets)
+
+    def _emit(self, signal: Signal, received: Optional[float]) -> None:
+        if received is not None:
+            latency = time.time() - received
+            signal["latency_ms"] = latency * 1000
+            self.latencies.append(latency)
+            observe("copy_signal_latency_seconds", latency, type=signal["type"])
+        self.stats["signals"] += 1
+        incr("copy_signals", type=signal["type"], action=signal["action"])
+        if self.on_signal is not None:
+            self.on_signal(signal)
+
+    def process_many(self, transactions: Iterable[Any], wallet: Optional[str] = None) -> List[Signal]:
+        signals: List[Signal] = []
+        for tx in transactions:
+            signals.extend(self.process(tx, wallet))
+        return signals
+
+    def positions(self, wallet: str) -> Dict[str, float]:
+        """Current net flow per token for ``wallet``."""
+        return {token: net for (w, token), net in self.net.items() if w == wallet}
+
+    def latency_percentiles(self, quantiles: Tuple[float, ...] = (0.5, 0.9, 0.99)) -> Dict[str, float]:
+        """End-to-end signal latency percentiles in milliseconds."""
+        samples = sorted(self.latencies)
+        return {f"p{int(q * 100)}": percentile(samples, q) * 1000 for q in quantiles}
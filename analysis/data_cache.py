@@ -2,22 +2,29 @@ import json
 from pathlib import Path
 from typing import Any, Optional
 
+from .instrumentation import incr, timed
+
 CACHE_DIR = Path('.cache')
 
 
+@timed("cache_load_seconds")
 def load_cache(name: str) -> Optional[Any]:
     path = CACHE_DIR / f"{name}.json"
     if path.exists():
         with path.open('r') as f:
             data = json.load(f)
         print(f"loaded {name} from cache")
+        incr("cache_hits")
         return data
+    incr("cache_misses")
     return None
 
 
+@timed("cache_save_seconds")
 def save_cache(name: str, data: Any) -> None:
     CACHE_DIR.mkdir(exist_ok=True)
     path = CACHE_DIR / f"{name}.json"
     with path.open('w') as f:
         json.dump(data, f, default=str)
     print(f"saved {name} to cache")
+    incr("cache_writes")
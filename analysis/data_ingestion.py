@@ -2,12 +2,15 @@ from urllib.request import urlopen
 import json
 import random
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Union
 
 from .data_cache import load_cache, save_cache
+from .instrumentation import incr, timed
+from .records import TradeRecords
 
 BINANCE_KLINES_URL = "https://api.binance.com/api/v3/klines"
 
+@timed("fetch_ohlcv_seconds")
 def fetch_ohlcv(
     symbol: str = "BTCUSDT", interval: str = "1h", limit: int = 100, use_cache: bool = True
 ) -> List[Dict]:
@@ -32,7 +35,7 @@ def fetch_ohlcv(
         for item in data:
             candles.append(
                 {
-                    "timestamp": datetime.fromtimestamp(item[0] / 1000),
+                    "timestamp": datetime.utcfromtimestamp(item[0] / 1000),
                     "open": float(item[1]),
                     "high": float(item[2]),
                     "low": float(item[3]),
@@ -44,6 +47,7 @@ def fetch_ohlcv(
             save_cache(cache_key, candles)
         return candles
     except Exception:
+        incr("synthetic_fallbacks", source="ohlcv")
         now = datetime.utcnow()
         candles = []
         price = 30000.0
@@ -63,14 +67,22 @@ def fetch_ohlcv(
         return candles
 
 
+@timed("fetch_trades_seconds")
 def fetch_trades(
-    symbol: str = "BTCUSDT", limit: int = 100, use_cache: bool = True
-) -> List[Dict[str, Any]]:
+    symbol: str = "BTCUSDT", limit: int = 100, use_cache: bool = True, compact: bool = False
+) -> Union[List[Dict[str, Any]], TradeRecords]:
     """Fetch recent trades for a symbol with a deterministic offline sample.
 
-    Utilizes the JSON cache when ``use_cache`` is True.
+    Utilizes the JSON cache when ``use_cache`` is True. With ``compact`` the
+    trades are returned as ``TradeRecords`` columns instead of dicts.
     """
 
+    trades = _fetch_trade_rows(symbol, limit, use_cache)
+    return TradeRecords.from_dicts(trades) if compact else trades
+
+
+def _fetch_trade_rows(symbol: str, limit: int, use_cache: bool) -> List[Dict[str, Any]]:
+
     cache_key = f"trades_{symbol}_{limit}"
     if use_cache:
         cached = load_cache(cache_key)
@@ -88,13 +100,14 @@ def fetch_trades(
                     "price": float(t["price"]),
                     "volume": float(t["qty"]),
                     "side": "buy" if t.get("isBuyerMaker") else "sell",
-                    "timestamp": datetime.fromtimestamp(t["time"] / 1000),
+                    "timestamp": datetime.utcfromtimestamp(t["time"] / 1000),
                 }
             )
         if use_cache:
             save_cache(cache_key, trades)
         return trades
     except Exception:
+        incr("synthetic_fallbacks", source="trades")
         trades = []
         price = 30000.0
         for _ in range(limit):
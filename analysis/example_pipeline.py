@@ -1,116 +1,229 @@
-"""Example pipeline demonstrating various data and analytics capabilities."""
-
-from .data_ingestion import (
-    fetch_ohlcv,
-    fetch_trades,
-    fetch_token_supply,
-    fetch_social_posts,
-)
-from .feature_engineering import (
-    add_bollinger_bands,
-    add_macd,
-)
-from .nlp_analysis import simple_sentiment_score, extract_topics
-from .backtesting import (
-    optimize_regime_windows,
-    performance_stats,
-    walk_forward_optimize,
-)
-from .solana_rpc import rpc_call
-from .wallet_analysis import (
-    fetch_wallet_history,
-    aggregate_wallet_stats,
-    detect_repeating_patterns,
-    wallet_performance,
-    rank_wallets,
-)
-from .advanced_metrics import (
-    market_cap,
-    fee_summary,
-    fibonacci_retracements,
-    cumulative_volume_delta,
-    holder_distribution,
-    zscore_anomalies,
-)
-from .trend_detection import extract_trending_tokens
-from .top_trader_scanner import mimic_strategy, scan_market_with_kols
-from .innovative_analysis import cross_correlation_lag, hurst_exponent
+"""Example pipeline demonstrating various data and analytics capabilities.
 
-if __name__ == "__main__":
-    raw = fetch_ohlcv(limit=300)
+Each block of the original walkthrough is a stage of a ``Pipeline`` DAG, so
+the market-data backtests, wallet/KOL scans, social NLP and RPC calls run
+concurrently and unchanged stages are served from the memo cache on reruns.
+"""
+
+from typing import Any, Dict, List, Tuple
+
+from .instrumentation import REGISTRY, is_enabled
+from .pipeline import Pipeline, Stage
+
+# Analysis modules are imported inside the stage functions so that a stage
+# (or a worker process running it) only loads what it uses.
+
+KOL_WALLETS = [
+    "CupseyWallet1111111111111111111111111111111",
+    "OrangieWallet11111111111111111111111111111",
+    "KingWallet11111111111111111111111111111111",
+    "CentedWallet11111111111111111111111111111",
+]
+
+
+def load_candles(limit: int) -> List[Dict]:
+    from .data_ingestion import fetch_ohlcv
+
+    raw = fetch_ohlcv(limit=limit)
     # second call demonstrates cache retrieval
-    _ = fetch_ohlcv(limit=300)
-    params, data, sr = optimize_regime_windows(
+    _ = fetch_ohlcv(limit=limit)
+    return raw
+
+
+def regime_backtest(raw: List[Dict]) -> Tuple[Dict[int, int], List[Dict], Dict[str, float]]:
+    from .backtesting import optimize_regime_windows, performance_stats
+    from .feature_engineering import add_bollinger_bands, add_macd
+
+    params, data, _ = optimize_regime_windows(
         raw, low_windows=[20, 30, 40], high_windows=[5, 10, 15]
     )
     data = add_bollinger_bands(data)
     data = add_macd(data)
-    stats = performance_stats(data)
-    print("Optimized regime windows:", params)
-    print("Performance stats:", stats)
-    print("Last candles:")
-    for row in data[-5:]:
-        print(row)
+    return params, data, performance_stats(data)
+
 
-    # Walk-forward optimization using simple SMA strategy
-    wf_windows, wf_data, wf_stats = walk_forward_optimize(
+def walk_forward(raw: List[Dict]) -> Tuple[List[int], Dict[str, float]]:
+    from .backtesting import walk_forward_optimize
+
+    wf_windows, _, wf_stats = walk_forward_optimize(
         raw, train_size=100, test_size=50, windows=[5, 10, 20, 30]
     )
-    print("Walk-forward windows per fold:", wf_windows)
-    print("Walk-forward performance:", wf_stats)
+    return wf_windows, wf_stats
+
+
+def load_trades(limit: int) -> List[Dict[str, Any]]:
+    from .data_ingestion import fetch_trades
+
+    trades = fetch_trades(limit=limit)
+    _ = fetch_trades(limit=limit)
+    return trades
+
+
+def market_metrics(data: List[Dict], trades: List[Dict[str, Any]]) -> Dict[str, Any]:
+    from .advanced_metrics import (
+        market_cap,
+        fibonacci_retracements,
+        cumulative_volume_delta,
+        holder_distribution,
+        zscore_anomalies,
+    )
+    from .data_ingestion import fetch_token_supply
 
-    # Advanced metrics
-    trades = fetch_trades(limit=50)
-    _ = fetch_trades(limit=50)
     cvd_series = cumulative_volume_delta(trades)
-    fibs = fibonacci_retracements([d["close"] for d in data])
-    supply = fetch_token_supply("BTC")
-    mc = market_cap(data[-1]["close"], supply)
-    holder_stats = holder_distribution({"W1": 100, "W2": 50, "W3": 10})
-    anomalies = zscore_anomalies([d["close"] for d in data])
-    print("Fibonacci levels:", fibs)
-    print("CVD last value:", cvd_series[-1] if cvd_series else 0)
-    print("Market Cap estimate:", mc)
-    print("Holder stats:", holder_stats)
-    print("Price anomalies at indices:", anomalies)
+    closes = [d["close"] for d in data]
+    return {
+        "fibs": fibonacci_retracements(closes),
+        "cvd": cvd_series[-1] if cvd_series else 0,
+        "market_cap": market_cap(data[-1]["close"], fetch_token_supply("BTC")),
+        "holders": holder_distribution({"W1": 100, "W2": 50, "W3": 10}),
+        "anomalies": zscore_anomalies(closes),
+    }
+
+
+def latest_slot() -> Any:
+    from .solana_rpc import rpc_call
+
+    return rpc_call("getSlot")
+
+
+def wallet_report(address: str) -> Dict[str, Any]:
+    from .wallet_analysis import (
+        fetch_wallet_history,
+        aggregate_wallet_stats,
+        detect_repeating_patterns,
+        wallet_performance,
+        rank_wallets,
+    )
+
+    history = fetch_wallet_history(address)
+    return {
+        "stats": aggregate_wallet_stats(history),
+        "patterns": detect_repeating_patterns(history),
+        "performance": wallet_performance(history),
+        "rankings": rank_wallets({"demo": history, "other": fetch_wallet_history("OtherWallet")}),
+    }
+
+
+def load_posts() -> List[Dict[str, str]]:
+    from .data_ingestion import fetch_social_posts
+
+    return fetch_social_posts()
+
+
+def social_analysis(posts: List[Dict[str, str]]) -> Tuple[Dict[str, Any], List[float]]:
+    from .nlp_analysis import batch_sentiment_scores, extract_topics, IncrementalTopicModel
+    from .trend_detection import extract_trending_tokens, TrendTracker
+
+    tracker = TrendTracker()
+    tracker.update_posts(posts)
+    topic_model = IncrementalTopicModel()
+    topic_model.update(p["text"] for p in posts)
+    summary = {
+        "trending": extract_trending_tokens(posts),
+        "topics": extract_topics([p["text"] for p in posts]),
+        "decayed": tracker.top(3),
+        "streaming_topics": topic_model.topics(),
+    }
+    return summary, batch_sentiment_scores(posts)
+
+
+def price_sentiment(data: List[Dict], sent_series: List[float]) -> Dict[str, Any]:
+    from .innovative_analysis import cross_correlation_lag, hurst_exponent
 
-    text = "Bitcoin sees bullish increase despite earlier loss"
-    print("Sentiment score:", simple_sentiment_score(text))
-    slot = rpc_call("getSlot")
-    print("Latest Solana slot:", slot)
-
-    history = fetch_wallet_history("DemoWallet1111111111111111111111111111111")
-    stats = aggregate_wallet_stats(history)
-    patterns = detect_repeating_patterns(history)
-    perf = wallet_performance(history)
-    rankings = rank_wallets({"demo": history, "other": fetch_wallet_history("OtherWallet" )})
-    print("Wallet stats:", stats)
-    print("Detected wallet patterns:", patterns)
-    print("Wallet performance:", perf)
-    print("Wallet rankings:", rankings)
-
-    posts = fetch_social_posts()
-    trending = extract_trending_tokens(posts)
-    topics = extract_topics([p["text"] for p in posts])
-    print("Trending tokens from social posts:", trending)
-    print("Extracted social topics:", topics)
-
-    sent_series = [simple_sentiment_score(p["text"]) for p in posts]
     returns = [data[i]["close"] - data[i - 1]["close"] for i in range(1, len(data))]
     lag, corr = cross_correlation_lag(returns[: len(sent_series)], sent_series)
-    print("Return/sentiment best lag:", lag, "corr:", corr)
-    hurst = hurst_exponent([d["close"] for d in data])
-    print("Hurst exponent:", hurst)
-
-    # KOL wallet analysis combined with social trends
-    kol_wallets = [
-        "CupseyWallet1111111111111111111111111111111",
-        "OrangieWallet11111111111111111111111111111",
-        "KingWallet11111111111111111111111111111111",
-        "CentedWallet11111111111111111111111111111",
-    ]
-    market_view = scan_market_with_kols(kol_wallets, posts)
-    print("KOL performance:", market_view["trader_info"]["performance"])
-    print("KOL signals:", market_view["signals"])
-    sample_history = market_view["trader_info"]["histories"][kol_wallets[0]]
-    print("Mimic strategy:", mimic_strategy(sample_history))
+    return {"lag": lag, "corr": corr, "hurst": hurst_exponent([d["close"] for d in data])}
+
+
+def kol_scan(posts: List[Dict[str, str]]) -> Dict[str, Any]:
+    from .top_trader_scanner import mimic_strategy, scan_market_with_kols
+
+    market_view = scan_market_with_kols(KOL_WALLETS, posts)
+    sample_history = market_view["trader_info"]["histories"][KOL_WALLETS[0]]
+    return {
+        "performance": market_view["trader_info"]["performance"],
+        "signals": market_view["signals"],
+        "mimic": mimic_strategy(sample_history),
+    }
+
+
+def build_pipeline(**kwargs: Any) -> Pipeline:
+    """Return the example DAG; ``kwargs`` are passed to ``Pipeline``."""
+    return Pipeline(
+        [
+            Stage("candles", load_candles, kind="io", params={"limit": 300}, cache=False),
+            Stage("regime", regime_backtest, ["candles"], ["regime_params", "data", "stats"]),
+            Stage("walk_forward", walk_forward, ["candles"], ["wf_windows", "wf_stats"]),
+            Stage("trades", load_trades, kind="io", params={"limit": 50}, cache=False),
+            Stage("metrics", market_metrics, ["data", "trades"]),
+            Stage("slot", latest_slot, kind="io", cache=False),
+            Stage(
+                "wallet",
+                wallet_report,
+                kind="io",
+                params={"address": "DemoWallet1111111111111111111111111111111"},
+            ),
+            Stage("posts", load_posts, kind="io", cache=False),
+            Stage("social", social_analysis, ["posts"], ["social", "sentiment"]),
+            Stage("price_sentiment", price_sentiment, ["data", "sentiment"]),
+            Stage("kol", kol_scan, ["posts"], kind="io"),
+        ],
+        **kwargs,
+    )
+
+
+def main() -> Dict[str, Any]:
+    pipeline = build_pipeline(profile=is_enabled())
+    r = pipeline.run()
+
+    print("Optimized regime windows:", r["regime_params"])
+    print("Performance stats:", r["stats"])
+    print("Last candles:")
+    for row in r["data"][-5:]:
+        print(row)
+    print("Walk-forward windows per fold:", r["wf_windows"])
+    print("Walk-forward performance:", r["wf_stats"])
+
+    m = r["metrics"]
+    print("Fibonacci levels:", m["fibs"])
+    print("CVD last value:", m["cvd"])
+    print("Market Cap estimate:", m["market_cap"])
+    print("Holder stats:", m["holders"])
+    print("Price anomalies at indices:", m["anomalies"])
+
+    from .nlp_analysis import simple_sentiment_score
+
+    text = "Bitcoin sees bullish increase despite earlier loss"
+    print("Sentiment score:", simple_sentiment_score(text))
+    print("Latest Solana slot:", r["slot"])
+
+    w = r["wallet"]
+    print("Wallet stats:", w["stats"])
+    print("Detected wallet patterns:", w["patterns"])
+    print("Wallet performance:", w["performance"])
+    print("Wallet rankings:", w["rankings"])
+
+    s = r["social"]
+    print("Trending tokens from social posts:", s["trending"])
+    print("Decayed trending tokens:", s["decayed"])
+    print("Extracted social topics:", s["topics"])
+    print("Streaming topics:", s["streaming_topics"])
+
+    ps = r["price_sentiment"]
+    print("Return/sentiment best lag:", ps["lag"], "corr:", ps["corr"])
+    print("Hurst exponent:", ps["hurst"])
+
+    k = r["kol"]
+    print("KOL performance:", k["performance"])
+    print("KOL signals:", k["signals"])
+    print("Mimic strategy:", k["mimic"])
+
+    print("Stage timings:")
+    print(pipeline.format_report())
+    if is_enabled():
+        print(REGISTRY.to_prometheus())
+    return r
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,6 @@
-from typing import List, Dict
+from typing import Any, Dict, List, Optional, Tuple
+
+Columns = Dict[str, List[Optional[float]]]
 
 def _moving_average(values: List[float], window: int) -> List[float]:
     avg = []
@@ -9,9 +11,7 @@ def _moving_average(values: List[float], window: int) -> List[float]:
             avg.append(sum(values[i - window + 1 : i + 1]) / window)
     return avg
 
-def add_technical_indicators(candles: List[Dict], window: int = 14) -> List[Dict]:
-    """Add SMA and RSI indicators to candle list."""
-    closes = [c["close"] for c in candles]
+def _sma_rsi_columns(closes: List[float], window: int) -> Tuple[Columns, None]:
     sma = _moving_average(closes, window)
 
     gains = [0.0]
@@ -31,15 +31,31 @@ def add_technical_indicators(candles: List[Dict], window: int = 14) -> List[Dict
         else:
             rs = g / l
             rsi.append(100 - (100 / (1 + rs)))
+    return {f"sma_{window}": sma, f"rsi_{window}": rsi}, None
 
-    for candle, s, r in zip(candles, sma, rsi):
-        candle[f"sma_{window}"] = s
-        candle[f"rsi_{window}"] = r
+def _assign(candles: List[Dict], columns: Columns) -> List[Dict]:
+    for name, values in columns.items():
+        for candle, v in zip(candles, values):
+            candle[name] = v
     return candles
 
-def add_bollinger_bands(candles: List[Dict], window: int = 20, num_std: float = 2.0) -> List[Dict]:
-    """Add Bollinger Bands around an SMA."""
+def add_technical_indicators(candles: List[Dict], window: int = 14, store: Any = None) -> List[Dict]:
+    """Add SMA and RSI indicators to candle list.
+
+    With a ``feature_store.FeatureStore`` the columns are served from (and
+    saved to) the store instead of being recomputed.
+    """
     closes = [c["close"] for c in candles]
+    if store is None:
+        columns, _ = _sma_rsi_columns(closes, window)
+    else:
+        # RSI needs one extra close for the first price change.
+        columns = store.get(
+            "sma_rsi", closes, {"window": window}, lambda xs: _sma_rsi_columns(xs, window), overlap=window
+        )
+    return _assign(candles, columns)
+
+def _bollinger_columns(closes: List[float], window: int, num_std: float) -> Tuple[Columns, None]:
     sma = _moving_average(closes, window)
     stds = []
     for i in range(len(closes)):
@@ -50,35 +66,69 @@ def add_bollinger_bands(candles: List[Dict], window: int = 20, num_std: float =
             mean = sum(segment) / window
             var = sum((p - mean) ** 2 for p in segment) / window
             stds.append(var ** 0.5)
-    for candle, m, s in zip(candles, sma, stds):
+    upper: List[Optional[float]] = []
+    lower: List[Optional[float]] = []
+    for m, s in zip(sma, stds):
         if m is None or s is None:
-            candle[f"bb_upper_{window}"] = None
-            candle[f"bb_lower_{window}"] = None
+            upper.append(None)
+            lower.append(None)
         else:
-            candle[f"bb_upper_{window}"] = m + num_std * s
-            candle[f"bb_lower_{window}"] = m - num_std * s
-    return candles
+            upper.append(m + num_std * s)
+            lower.append(m - num_std * s)
+    return {f"bb_upper_{window}": upper, f"bb_lower_{window}": lower}, None
 
-def add_macd(candles: List[Dict], fast: int = 12, slow: int = 26, signal: int = 9) -> List[Dict]:
-    """Add MACD, signal line and histogram."""
+def add_bollinger_bands(
+    candles: List[Dict], window: int = 20, num_std: float = 2.0, store: Any = None
+) -> List[Dict]:
+    """Add Bollinger Bands around an SMA."""
     closes = [c["close"] for c in candles]
+    if store is None:
+        columns, _ = _bollinger_columns(closes, window, num_std)
+    else:
+        columns = store.get(
+            "bollinger",
+            closes,
+            {"window": window, "num_std": num_std},
+            lambda xs: _bollinger_columns(xs, window, num_std),
+            overlap=window - 1,
+        )
+    return _assign(candles, columns)
 
-    def _ema(values: List[float], span: int) -> List[float]:
-        ema = []
-        k = 2 / (span + 1)
-        prev = None
-        for v in values:
-            prev = v if prev is None else v * k + prev * (1 - k)
-            ema.append(prev)
-        return ema
+def _ema(values: List[float], span: int, prev: Optional[float] = None) -> List[float]:
+    ema = []
+    k = 2 / (span + 1)
+    for v in values:
+        prev = v if prev is None else v * k + prev * (1 - k)
+        ema.append(prev)
+    return ema
 
-    fast_ema = _ema(closes, fast)
-    slow_ema = _ema(closes, slow)
+def _macd_columns(
+    closes: List[float], fast: int, slow: int, signal: int, state: Optional[Dict[str, float]] = None
+) -> Tuple[Columns, Dict[str, float]]:
+    # ``state`` holds the last EMA values so a grown series resumes exactly.
+    state = state or {}
+    fast_ema = _ema(closes, fast, state.get("fast"))
+    slow_ema = _ema(closes, slow, state.get("slow"))
     macd_line = [f - s for f, s in zip(fast_ema, slow_ema)]
-    signal_line = _ema(macd_line, signal)
+    signal_line = _ema(macd_line, signal, state.get("signal"))
     hist = [m - s for m, s in zip(macd_line, signal_line)]
-    for candle, m, s, h in zip(candles, macd_line, signal_line, hist):
-        candle["macd"] = m
-        candle["macd_signal"] = s
-        candle["macd_hist"] = h
-    return candles
+    if closes:
+        state = {"fast": fast_ema[-1], "slow": slow_ema[-1], "signal": signal_line[-1]}
+    return {"macd": macd_line, "macd_signal": signal_line, "macd_hist": hist}, state
+
+def add_macd(
+    candles: List[Dict], fast: int = 12, slow: int = 26, signal: int = 9, store: Any = None
+) -> List[Dict]:
+    """Add MACD, signal line and histogram."""
+    closes = [c["close"] for c in candles]
+    if store is None:
+        columns, _ = _macd_columns(closes, fast, slow, signal)
+    else:
+        columns = store.get(
+            "macd",
+            closes,
+            {"fast": fast, "slow": slow, "signal": signal},
+            lambda xs: _macd_columns(xs, fast, slow, signal),
+            resume=lambda xs, st: _macd_columns(xs, fast, slow, signal, st),
+        )
+    return _assign(candles, columns)
@@ -0,0 +1,424 @@
+"""Content-addressed cache for indicator columns.
+
+The indicator functions (``add_technical_indicators``, ``add_bollinger_bands``,
+``add_macd``, ``add_volatility_regime``) accept ``store=FeatureStore(...)``.
+Their output columns are then looked up by a hash of the input closes, the
+indicator name and its parameters, so the same series and parameters are
+computed once across optimizer sweeps, backtests and processes.
+
+Two tiers are used:
+
+* an in-process LRU of decoded columns (bounded by ``max_memory_points``);
+* a directory of flat float64 files read through ``mmap``. Files are written
+  atomically (temp file + ``os.replace``), so concurrent processes can share
+  one directory safely. The directory is bounded by ``max_disk_bytes`` and
+  ``max_age``: least recently used files (by mtime, refreshed on every disk
+  hit) are pruned first.
+
+Entry names are ``<head>-<indicator>-<length>-<series>``, where ``head``
+fingerprints the first ``HEAD_POINTS`` closes. When a series has grown at the
+tail, the longest cached prefix with the same head is verified and extended:
+windowed indicators recompute only the new points plus a warm-up ``overlap``,
+stateful ones (MACD's EMAs) ``resume`` from the stored state, and the rest
+(global clustering) fall back to a full recompute. Either way the new entry
+replaces the prefix's file, so a live series growing bar by bar keeps one file.
+Prefix lookups use an index of the directory that is rebuilt only when the
+directory's mtime changes.
+"""
+
+import hashlib
+import json
+import math
+import mmap
+import os
+import struct
+import time
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
+
+from .instrumentation import incr
+
+CACHE_DIR = Path(".cache") / "features"
+HEAD_POINTS = 64
+FORMAT_VERSION = 1
+
+Columns = Dict[str, List[Any]]
+Computed = Tuple[Columns, Optional[Dict[str, Any]]]
+
+_HEADER = struct.Struct("<II")  # format version, header JSON length
+
+
+def fingerprint(values: List[float]) -> str:
+    """Stable digest of a float series."""
+    return hashlib.blake2b(array("d", values).tobytes(), digest_size=16).hexdigest()
+
+
+def _encode(values: List[Any]) -> array:
+    return array("d", (math.nan if v is None else v for v in values))
+
+
+def _decode(values: Any, integer: bool) -> List[Any]:
+    if integer:
+        return [None if v != v else int(v) for v in values]
+    return [None if v != v else v for v in values]
+
+
+class _Entry:
+    __slots__ = ("columns", "state", "length")
+
+    def __init__(self, columns: Columns, state: Optional[Dict[str, Any]], length: int) -> None:
+        self.columns = columns
+        self.state = state
+        self.length = length
+
+
+class FeatureStore:
+    """Two-tier (memory + mmap'd disk) store of indicator columns.
+
+    Parameters
+    ----------
+    path : str or Path, optional
+        Disk tier directory; ``None`` keeps the store in memory only.
+    max_memory_points : int
+        Total column values kept in the in-memory LRU.
+    max_disk_bytes : int
+        Size bound of the disk tier; exceeding it prunes the least recently
+        used files down to 80% of the bound.
+    max_age : float, optional
+        Files unused for longer than this many seconds are pruned.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path, None] = CACHE_DIR,
+        max_memory_points: int = 5_000_000,
+        max_disk_bytes: int = 1 << 30,
+        max_age: Optional[float] = 7 * 86400.0,
+    ) -> None:
+        self.path = Path(path) if path is not None else None
+        self.max_memory_points = max_memory_points
+        self.max_disk_bytes = max_disk_bytes
+        self.max_age = max_age
+        # Disk index: (head, ind) -> entry names, valid for ``_disk_mtime``.
+        self._disk: Dict[Tuple[str, str], Set[str]] = {}
+        self._disk_mtime: Optional[int] = None
+        self._disk_bytes = 0
+        self._pruned = False
+        self._memory: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._memory_points = 0
+        self._prefixes: Dict[Tuple[str, str], Set[str]] = {}
+        self.stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "extensions": 0,
+            "misses": 0,
+            "points_served": 0,
+            "points_computed": 0,
+            "files_pruned": 0,
+        }
+
+    # -- keys -----------------------------------------------------------------
+    @staticmethod
+    def _indicator_key(name: str, params: Dict[str, Any]) -> str:
+        blob = json.dumps([name, FORMAT_VERSION, params], sort_keys=True)
+        return f"{name}_{hashlib.sha256(blob.encode()).hexdigest()[:16]}"
+
+    @staticmethod
+    def _entry_name(head: str, ind: str, length: int, series: str) -> str:
+        return f"{head}-{ind}-{length}-{series}"
+
+    # -- tiers ----------------------------------------------------------------
+    def _remember(self, name: str, head: str, ind: str, entry: _Entry) -> None:
+        old = self._memory.pop(name, None)
+        if old is not None:
+            self._memory_points -= old.length * len(old.columns)
+        self._memory[name] = entry
+        self._memory_points += entry.length * len(entry.columns)
+        self._prefixes.setdefault((head, ind), set()).add(name)
+        while self._memory_points > self.max_memory_points and len(self._memory) > 1:
+            evicted_name, evicted = self._memory.popitem(last=False)
+            self._memory_points -= evicted.length * len(evicted.columns)
+            evicted_head, evicted_ind = evicted_name.split("-", 2)[:2]
+            self._prefixes.get((evicted_head, evicted_ind), set()).discard(evicted_name)
+
+    @staticmethod
+    def _data_offset(header_len: int) -> int:
+        # The float64 block starts 8-byte aligned after the JSON header.
+        offset = _HEADER.size + header_len
+        return offset + (-offset % 8)
+
+    def _read(self, name: str, integer: bool) -> Optional[_Entry]:
+        if self.path is None:
+            return None
+        file = self.path / f"{name}.bin"
+        try:
+            with file.open("rb") as f, mmap.mmap(
+                f.fileno(), 0, access=mmap.ACCESS_READ
+            ) as mm:
+                version, header_len = _HEADER.unpack_from(mm, 0)
+                if version != FORMAT_VERSION:
+                    return None
+                header = json.loads(mm[_HEADER.size : _HEADER.size + header_len])
+                n = header["length"]
+                start = self._data_offset(header_len)
+                end = start + 8 * n * len(header["columns"])
+                with memoryview(mm) as view, view[start:end].cast("d") as data:
+                    columns = {
+                        col: _decode(data[i * n : (i + 1) * n], integer)
+                        for i, col in enumerate(header["columns"])
+                    }
+            os.utime(file)  # mtime doubles as last use for pruning
+        except (OSError, ValueError, KeyError):
+            return None
+        return _Entry(columns, header.get("state"), n)
+
+    def _write(self, name: str, entry: _Entry) -> None:
+        if self.path is None:
+            return
+        self.path.mkdir(parents=True, exist_ok=True)
+        index = self._disk_index()
+        header = json.dumps(
+            {"columns": list(entry.columns), "length": entry.length, "state": entry.state}
+        ).encode()
+        tmp = self.path / f"{name}.{os.getpid()}.tmp"
+        with tmp.open("wb") as f:
+            f.write(_HEADER.pack(FORMAT_VERSION, len(header)))
+            f.write(header)
+            f.write(b"\0" * (self._data_offset(len(header)) - _HEADER.size - len(header)))
+            for values in entry.columns.values():
+                f.write(_encode(values).tobytes())
+            size = f.tell()
+        os.replace(tmp, self.path / f"{name}.bin")
+        head, ind = name.split("-", 2)[:2]
+        if name not in index.get((head, ind), ()):
+            self._disk_bytes += size
+        index.setdefault((head, ind), set()).add(name)
+        self._sync_mtime()
+        if self._disk_bytes > self.max_disk_bytes:
+            self.prune()
+
+    def _delete(self, name: str) -> None:
+        if self.path is None:
+            return
+        file = self.path / f"{name}.bin"
+        index = self._disk_index()
+        try:
+            size = file.stat().st_size
+            file.unlink()
+        except OSError:
+            return
+        self._disk_bytes -= size
+        head, ind = name.split("-", 2)[:2]
+        index.get((head, ind), set()).discard(name)
+        self._sync_mtime()
+
+    # -- disk index -------------------------------------------------------------
+    def _sync_mtime(self) -> None:
+        # Our own writes change the directory mtime; keep the index valid.
+        try:
+            self._disk_mtime = self.path.stat().st_mtime_ns
+        except OSError:
+            self._disk_mtime = None
+
+    def _scan(self) -> List[Tuple[str, int, float]]:
+        """``(name, size, mtime)`` of every entry file on disk."""
+        entries = []
+        try:
+            with os.scandir(self.path) as it:
+                for e in it:
+                    if e.name.endswith(".bin"):
+                        try:
+                            st = e.stat()
+                        except OSError:
+                            continue
+                        entries.append((e.name[:-4], st.st_size, st.st_mtime))
+        except OSError:
+            pass
+        return entries
+
+    def _disk_index(self) -> Dict[Tuple[str, str], Set[str]]:
+        """Entry names on disk by ``(head, ind)``, rescanned when the directory
+        changed (e.g. another process wrote to it)."""
+        if self.path is None:
+            return {}
+        try:
+            mtime = self.path.stat().st_mtime_ns
+        except OSError:
+            self._disk, self._disk_mtime, self._disk_bytes = {}, None, 0
+            return self._disk
+        if mtime != self._disk_mtime:
+            if not self._pruned:
+                self._pruned = True
+                self.prune()
+                return self._disk
+            index: Dict[Tuple[str, str], Set[str]] = {}
+            total = 0
+            for name, size, _ in self._scan():
+                head, ind = name.split("-", 2)[:2]
+                index.setdefault((head, ind), set()).add(name)
+                total += size
+            self._disk, self._disk_mtime, self._disk_bytes = index, mtime, total
+        return self._disk
+
+    def prune(self) -> int:
+        """Delete disk entries older than ``max_age`` and, while the directory
+        exceeds ``max_disk_bytes``, the least recently used ones down to 80%
+        of the bound. Returns the number of files removed."""
+        if self.path is None:
+            return 0
+        self._pruned = True
+        entries = sorted(self._scan(), key=lambda e: e[2])
+        total = sum(size for _, size, _ in entries)
+        cutoff = time.time() - self.max_age if self.max_age is not None else None
+        target = self.max_disk_bytes * 0.8 if total > self.max_disk_bytes else total
+        removed = 0
+        index: Dict[Tuple[str, str], Set[str]] = {}
+        for name, size, mtime in entries:
+            if (cutoff is not None and mtime < cutoff) or total > target:
+                try:
+                    (self.path / f"{name}.bin").unlink()
+                except OSError:
+                    pass
+                total -= size
+                removed += 1
+                continue
+            head, ind = name.split("-", 2)[:2]
+            index.setdefault((head, ind), set()).add(name)
+        self._disk, self._disk_bytes = index, total
+        self._sync_mtime()
+        self.stats["files_pruned"] += removed
+        if removed:
+            incr("feature_store_files_pruned", removed)
+        return removed
+
+    def _lookup(self, name: str, head: str, ind: str, integer: bool) -> Tuple[Optional[_Entry], str]:
+        entry = self._memory.get(name)
+        if entry is not None:
+            self._memory.move_to_end(name)
+            return entry, "memory"
+        entry = self._read(name, integer)
+        if entry is not None:
+            self._remember(name, head, ind, entry)
+            return entry, "disk"
+        return None, "miss"
+
+    def _prefix_candidates(self, head: str, ind: str, closes: List[float]) -> List[Tuple[int, str]]:
+        """Cached entries of the same indicator whose series is a strict
+        prefix of ``closes``, longest first."""
+        n = len(closes)
+        names = self._prefixes.get((head, ind), set()) | self._disk_index().get((head, ind), set())
+        found = []
+        for name in names:
+            length = name.rsplit("-", 2)[1]
+            if length.isdigit() and int(length) < n:
+                found.append((int(length), name))
+        found.sort(reverse=True)
+        return [(m, name) for m, name in found if name.rsplit("-", 1)[-1] == fingerprint(closes[:m])]
+
+    # -- public API -----------------------------------------------------------
+    def get(
+        self,
+        name: str,
+        closes: List[float],
+        params: Dict[str, Any],
+        compute: Callable[[List[float]], Computed],
+        overlap: Optional[int] = None,
+        resume: Optional[Callable[[List[float], Dict[str, Any]], Computed]] = None,
+        integer: bool = False,
+    ) -> Columns:
+        """Return the indicator columns for ``closes``, computing if needed.
+
+        ``compute(closes)`` returns ``(columns, state)``. A grown series is
+        extended with ``resume(new_closes, state)`` when given, else by
+        recomputing the last ``overlap`` + new points when ``overlap`` is
+        given, else recomputed in full. ``integer`` columns round-trip as
+        ints (e.g. regime labels).
+        """
+        n = len(closes)
+        head = fingerprint(closes[:HEAD_POINTS])
+        ind = self._indicator_key(name, params)
+        key = self._entry_name(head, ind, n, fingerprint(closes))
+        entry, tier = self._lookup(key, head, ind, integer)
+        if entry is not None:
+            self.stats[f"{tier}_hits"] += 1
+            self.stats["points_served"] += n
+            incr("feature_store_lookups", indicator=name, outcome=f"{tier}_hit")
+            return entry.columns
+
+        prefixes = self._prefix_candidates(head, ind, closes) if n > HEAD_POINTS else []
+        entry = None
+        if overlap is not None or resume is not None:
+            entry = self._extend(name, closes, head, ind, prefixes, compute, overlap, resume, integer)
+        if entry is None:
+            columns, state = compute(closes)
+            entry = _Entry(columns, state, n)
+            self.stats["misses"] += 1
+            self.stats["points_computed"] += n
+            incr("feature_store_lookups", indicator=name, outcome="miss")
+        self._remember(key, head, ind, entry)
+        self._write(key, entry)
+        if prefixes:
+            # The grown series supersedes its longest cached prefix on disk,
+            # whether it was extended or recomputed; memory keeps it.
+            self._delete(prefixes[0][1])
+        return entry.columns
+
+    def _extend(
+        self,
+        name: str,
+        closes: List[float],
+        head: str,
+        ind: str,
+        prefixes: List[Tuple[int, str]],
+        compute: Callable[[List[float]], Computed],
+        overlap: Optional[int],
+        resume: Optional[Callable[[List[float], Dict[str, Any]], Computed]],
+        integer: bool,
+    ) -> Optional[_Entry]:
+        n = len(closes)
+        for m, prefix_name in prefixes:
+            prefix, _ = self._lookup(prefix_name, head, ind, integer)
+            if prefix is None:
+                continue
+            if resume is not None and prefix.state is not None:
+                tail, state = resume(closes[m:], prefix.state)
+                new = tail
+            elif overlap is not None:
+                start = max(0, m - overlap)
+                tail, state = compute(closes[start:])
+                new = {col: values[m - start :] for col, values in tail.items()}
+            else:
+                continue
+            columns = {col: prefix.columns[col] + new[col] for col in prefix.columns}
+            self.stats["extensions"] += 1
+            self.stats["points_served"] += m
+            self.stats["points_computed"] += n - m
+            incr("feature_store_lookups", indicator=name, outcome="extended")
+            return _Entry(columns, state, n)
+        return None
+
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered without a full recompute."""
+        s = self.stats
+        hits = s["memory_hits"] + s["disk_hits"] + s["extensions"]
+        total = hits + s["misses"]
+        return hits / total if total else 0.0
+
+    def report(self) -> Dict[str, Any]:
+        """Hit counts, hit rate and the share of points not recomputed."""
+        s = dict(self.stats)
+        points = s["points_served"] + s["points_computed"]
+        s["hit_rate"] = self.hit_rate()
+        s["points_saved_ratio"] = s["points_served"] / points if points else 0.0
+        s["memory_entries"] = len(self._memory)
+        # Disk hits never touch the index, so refresh it before reporting.
+        self._disk_index()
+        s["disk_bytes"] = self._disk_bytes
+        return s
+
+    def clear_memory(self) -> None:
+        self._memory.clear()
+        self._prefixes.clear()
+        self._memory_points = 0
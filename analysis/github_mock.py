@@ -0,0 +1,142 @@
+"""Local mock of the GitHub repository API for ``GitHubActivityFetcher``.
+
+``MockGitHubServer`` serves ``GET /repos/<owner>/<name>`` over real sockets
+with the fields ``GitHubActivityFetcher`` reads, a content-derived ``ETag``
+and ``304 Not Modified`` for matching ``If-None-Match`` requests, so the
+conditional-request cache can be exercised offline. Failures are scripted
+per repo with ``fail``.
+
+Example::
+
+    with MockGitHubServer({"bitcoin/bitcoin": {"stars": 100}}) as gh:
+        fetcher = GitHubActivityFetcher(base_url=gh.url, ttl=0)
+        fetcher.fetch("bitcoin/bitcoin")    # 200
+        fetcher.fetch("bitcoin/bitcoin")    # 304
+        gh.set_repo("bitcoin/bitcoin", stars=120)
+        gh.fail("bitcoin/bitcoin", status=502)
+"""
+
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+_FIELDS = {"stars": "stargazers_count", "forks": "forks_count", "watchers": "subscribers_count"}
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+    mock: "MockGitHubServer"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: _Server
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        mock = self.server.mock
+        prefix = "/repos/"
+        repo = self.path[len(prefix) :] if self.path.startswith(prefix) else None
+        status, etag, body = mock._respond(repo, self.headers.get("If-None-Match"))
+        if status is None:
+            self.close_connection = True
+            self.connection.close()
+            return
+        self.send_response(status)
+        if etag is not None:
+            self.send_header("ETag", etag)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class MockGitHubServer:
+    """Threaded local server answering ``/repos/<repo>`` like the GitHub API.
+
+    Parameters
+    ----------
+    repos : Dict[str, Dict[str, int]], optional
+        Initial ``stars``/``forks``/``watchers`` per ``owner/name``.
+
+    Every request is appended to ``requests`` as ``(repo, status)``
+    (``status`` is None for dropped connections).
+    """
+
+    def __init__(
+        self, repos: Optional[Dict[str, Dict[str, int]]] = None, host: str = "127.0.0.1", port: int = 0
+    ) -> None:
+        self.repos: Dict[str, Dict[str, int]] = {}
+        self.requests: List[Any] = []
+        self._failures: Dict[str, List[Optional[int]]] = {}
+        self._lock = threading.Lock()
+        for repo, activity in (repos or {}).items():
+            self.set_repo(repo, **activity)
+        self._server = _Server((host, port), _Handler)
+        self._server.mock = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def set_repo(self, repo: str, stars: int = 0, forks: int = 0, watchers: int = 0) -> None:
+        with self._lock:
+            self.repos[repo] = {"stars": stars, "forks": forks, "watchers": watchers}
+
+    def fail(self, repo: str, status: Optional[int] = 500, times: int = 1) -> None:
+        """Answer the next ``times`` requests for ``repo`` with ``status``.
+
+        ``status=None`` drops the connection without a response.
+        """
+        with self._lock:
+            self._failures.setdefault(repo, []).extend([status] * times)
+
+    def count(self, status: Optional[int]) -> int:
+        with self._lock:
+            return sum(1 for _, s in self.requests if s == status)
+
+    def _respond(self, repo: Optional[str], if_none_match: Optional[str]):
+        with self._lock:
+            queued = self._failures.get(repo) if repo is not None else None
+            if queued:
+                status = queued.pop(0)
+                self.requests.append((repo, status))
+                body = b"" if status is None else json.dumps({"message": "error"}).encode()
+                return status, None, body
+            activity = self.repos.get(repo) if repo is not None else None
+            if activity is None:
+                self.requests.append((repo, 404))
+                return 404, None, json.dumps({"message": "Not Found"}).encode()
+            body = json.dumps(
+                {"full_name": repo, **{field: activity[k] for k, field in _FIELDS.items()}},
+                sort_keys=True,
+            ).encode()
+            etag = f'"{hashlib.sha1(body).hexdigest()}"'
+            status = 304 if if_none_match == etag else 200
+            self.requests.append((repo, status))
+            return status, etag, b"" if status == 304 else body
+
+    def start(self) -> "MockGitHubServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "MockGitHubServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
@@ -0,0 +1,285 @@
+"""Low-overhead metrics for the analysis hot paths.
+
+Counters and latency histograms live in a process-wide ``REGISTRY`` and are
+only updated while instrumentation is enabled, either with ``enable()`` or by
+setting ``ANALYSIS_METRICS=1``. When disabled, ``timed`` wrappers cost a single
+flag check per call and ``incr``/``observe`` return immediately.
+
+Metrics can be exported as JSON (``REGISTRY.to_json()``) or in the Prometheus
+text exposition format (``REGISTRY.to_prometheus()``). ``sample_profile`` is an
+optional sampling profiler that can wrap any pipeline stage.
+"""
+
+import functools
+import os
+import re
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+_enabled = os.getenv("ANALYSIS_METRICS", "") not in ("", "0", "false", "False")
+
+LabelKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def enable() -> None:
+    """Turn metric collection on for this process."""
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    """Turn metric collection off; recorded values are kept."""
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def endpoint_label(url: str) -> str:
+    """Reduce an RPC URL to scheme and host so API keys never reach metrics."""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.hostname}" if parts.hostname else url
+
+
+class Histogram:
+    """Cumulative-bucket histogram with sum and count."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Upper bucket bound containing the ``q`` quantile."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for bound, n in zip(self.buckets, self.counts):
+            seen += n
+            if seen >= target:
+                return bound
+        return float("inf")
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Nearest-rank ``q`` quantile of already sorted samples (0.0 if empty)."""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def _key(name: str, labels: Dict[str, Any]) -> LabelKey:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class MetricsRegistry:
+    """Thread-safe store of counters, histograms and profiler samples."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.counters: Dict[LabelKey, float] = {}
+        self.histograms: Dict[LabelKey, Histogram] = {}
+        self.profiles: Dict[str, Counter] = {}
+
+    def incr(self, name: str, value: float = 1.0, **labels: Any) -> None:
+        key = _key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        key = _key(name, labels)
+        with self._lock:
+            hist = self.histograms.get(key)
+            if hist is None:
+                hist = self.histograms[key] = Histogram()
+            hist.observe(value)
+
+    def add_samples(self, stage: str, samples: Counter) -> None:
+        with self._lock:
+            self.profiles.setdefault(stage, Counter()).update(samples)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+            self.profiles.clear()
+
+    def to_json(self) -> Dict[str, Any]:
+        """Return all metrics as a JSON-serialisable dictionary."""
+        with self._lock:
+            counters = [
+                {"name": n, "labels": dict(l), "value": v} for (n, l), v in self.counters.items()
+            ]
+            histograms = [
+                {
+                    "name": n,
+                    "labels": dict(l),
+                    "count": h.count,
+                    "sum": h.sum,
+                    "buckets": dict(zip([str(b) for b in h.buckets] + ["+Inf"], h.counts)),
+                    "p50": h.quantile(0.5),
+                    "p99": h.quantile(0.99),
+                }
+                for (n, l), h in self.histograms.items()
+            ]
+            profiles = {stage: dict(c.most_common(50)) for stage, c in self.profiles.items()}
+        return {"counters": counters, "histograms": histograms, "profiles": profiles}
+
+    def to_prometheus(self) -> str:
+        """Render metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            typed = set()
+            for (name, labels), value in sorted(self.counters.items()):
+                metric = _metric_name(name) + "_total"
+                if metric not in typed:
+                    lines.append(f"# TYPE {metric} counter")
+                    typed.add(metric)
+                lines.append(f"{metric}{_format_labels(labels)} {value:g}")
+            for (name, labels), hist in sorted(self.histograms.items(), key=lambda x: x[0]):
+                metric = _metric_name(name)
+                if metric not in typed:
+                    lines.append(f"# TYPE {metric} histogram")
+                    typed.add(metric)
+                cumulative = 0
+                for bound, n in zip(list(hist.buckets) + [float("inf")], hist.counts):
+                    cumulative += n
+                    le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                    lines.append(f"{metric}_bucket{_format_labels(labels + (('le', le),))} {cumulative}")
+                lines.append(f"{metric}_sum{_format_labels(labels)} {hist.sum:g}")
+                lines.append(f"{metric}_count{_format_labels(labels)} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _metric_name(name: str) -> str:
+    return re.sub(r"[^a-zA-Z0-9_]", "_", name)
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    body = ",".join(
+        '{}="{}"'.format(_metric_name(k), v.replace("\\", "\\\\").replace('"', '\\"'))
+        for k, v in labels
+    )
+    return "{" + body + "}"
+
+
+REGISTRY = MetricsRegistry()
+
+
+def incr(name: str, value: float = 1.0, **labels: Any) -> None:
+    """Increment a counter when instrumentation is enabled."""
+    if _enabled:
+        REGISTRY.incr(name, value, **labels)
+
+
+def observe(name: str, value: float, **labels: Any) -> None:
+    """Record a histogram observation when instrumentation is enabled."""
+    if _enabled:
+        REGISTRY.observe(name, value, **labels)
+
+
+class timed:
+    """Time a block or function into the ``name`` latency histogram.
+
+    Works as a context manager (``with timed("rpc_seconds", endpoint=url):``)
+    and as a decorator (``@timed("backtest_seconds")``). The decorator checks
+    the enabled flag on every call, so it can stay applied permanently.
+    """
+
+    __slots__ = ("name", "labels", "_start")
+
+    def __init__(self, name: str, **labels: Any) -> None:
+        self.name = name
+        self.labels = labels
+        self._start = 0.0
+
+    def __enter__(self) -> "timed":
+        if _enabled:
+            self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        if _enabled and self._start:
+            REGISTRY.observe(self.name, time.perf_counter() - self._start, **self.labels)
+
+    def __call__(self, func: Callable) -> Callable:
+        name, labels = self.name, self.labels
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                REGISTRY.observe(name, time.perf_counter() - start, **labels)
+
+        return wrapper
+
+
+class sample_profile:
+    """Sampling profiler for one pipeline stage.
+
+    While the block runs, a daemon thread samples the calling thread's stack
+    every ``interval`` seconds and counts collapsed stacks
+    (``module:function;module:function``), which are stored in
+    ``REGISTRY.profiles[stage]`` and can be fed to flamegraph tools. Sampling
+    only happens when instrumentation is enabled.
+    """
+
+    def __init__(self, stage: str, interval: float = 0.005, max_depth: int = 30) -> None:
+        self.stage = stage
+        self.interval = interval
+        self.max_depth = max_depth
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _run(self, target: int) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(target)
+            stack: List[str] = []
+            while frame is not None and len(stack) < self.max_depth:
+                code = frame.f_code
+                stack.append(f"{frame.f_globals.get('__name__', '?')}:{code.co_name}")
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def __enter__(self) -> "sample_profile":
+        if _enabled:
+            self._thread = threading.Thread(
+                target=self._run, args=(threading.get_ident(),), daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+            REGISTRY.add_samples(self.stage, self.samples)
@@ -0,0 +1,361 @@
+"""Batched mint safety screening for the ``CHECK_IF_MINT_IS_*`` filters.
+
+For every candidate token the screener needs three accounts: the SPL mint, its
+Metaplex metadata PDA and (optionally) the pool's LP mint. Instead of one
+``rpc_call`` per account, all accounts of all candidates are deduplicated and
+fetched with ``getMultipleAccounts`` in batches of up to 100 keys, several
+batches in parallel. Account data is decoded in place with
+``struct.unpack_from`` over a ``memoryview`` of the base64-decoded bytes.
+
+Checks (enabled individually, by default from the environment):
+
+* ``renounced`` (``CHECK_IF_MINT_IS_RENOUNCED``): mint authority is unset.
+* ``frozen`` (``CHECK_IF_MINT_IS_FROZEN``): passes when there is no freeze
+  authority, i.e. holders cannot be frozen.
+* ``mutable`` (``CHECK_IF_MINT_IS_MUTABLE``): passes when the metadata is
+  immutable.
+* ``burned`` (``CHECK_IF_MINT_IS_BURNED``): the LP mint's supply is zero, so
+  the liquidity cannot be pulled.
+
+The first three facts can never revert once they pass (an authority cannot be
+re-added and metadata cannot become mutable again), so passing results are
+cached per mint and the mint and metadata accounts are not read again for
+them. The LP mint is re-read on every screen, as its supply can grow.
+"""
+
+import binascii
+import hashlib
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from .instrumentation import incr, timed
+from .solana_rpc import rpc_call
+
+METADATA_PROGRAM_ID = "metaqbxxUerdq28cj1RbAWkYQm3ybzjb6a8bt518x1s"
+MINT_ACCOUNT_SIZE = 82
+MAX_ACCOUNTS_PER_CALL = 100
+
+CHECK_ENV = {
+    "mutable": "CHECK_IF_MINT_IS_MUTABLE",
+    "burned": "CHECK_IF_MINT_IS_BURNED",
+    "frozen": "CHECK_IF_MINT_IS_FROZEN",
+    "renounced": "CHECK_IF_MINT_IS_RENOUNCED",
+}
+# Facts that cannot revert once they pass, and so are safe to cache.
+PERMANENT_CHECKS = ("renounced", "frozen", "mutable")
+
+# -- base58 and program-derived addresses ------------------------------------
+
+_B58 = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+_B58_INDEX = {c: i for i, c in enumerate(_B58)}
+
+
+def b58encode(data: bytes) -> str:
+    n = int.from_bytes(data, "big")
+    out = []
+    while n:
+        n, r = divmod(n, 58)
+        out.append(_B58[r])
+    pad = len(data) - len(data.lstrip(b"\0"))
+    return "1" * pad + "".join(reversed(out))
+
+
+def b58decode(text: str) -> bytes:
+    n = 0
+    for c in text:
+        try:
+            n = n * 58 + _B58_INDEX[c]
+        except KeyError:
+            raise ValueError(f"invalid base58 character {c!r}") from None
+    pad = len(text) - len(text.lstrip("1"))
+    body = n.to_bytes((n.bit_length() + 7) // 8, "big") if n else b""
+    return b"\0" * pad + body
+
+
+_P = 2**255 - 19
+_D = -121665 * pow(121666, _P - 2, _P) % _P
+
+
+def _on_curve(key: bytes) -> bool:
+    # A compressed ed25519 point is valid when x^2 = (y^2 - 1) / (d y^2 + 1)
+    # has a square root mod p; PDAs must be off the curve.
+    y = int.from_bytes(key, "little") & ((1 << 255) - 1)
+    if y >= _P:
+        return False
+    y2 = y * y % _P
+    x2 = (y2 - 1) * pow(_D * y2 + 1, _P - 2, _P) % _P
+    return x2 == 0 or pow(x2, (_P - 1) // 2, _P) == 1
+
+
+def find_program_address(seeds: List[bytes], program_id: str) -> Tuple[str, int]:
+    """Return ``(address, bump)`` like ``PublicKey.findProgramAddressSync``."""
+    program = b58decode(program_id)
+    for bump in range(255, -1, -1):
+        h = hashlib.sha256()
+        for seed in seeds:
+            h.update(seed)
+        h.update(bytes([bump]))
+        h.update(program)
+        h.update(b"ProgramDerivedAddress")
+        key = h.digest()
+        if not _on_curve(key):
+            return b58encode(key), bump
+    raise ValueError("no viable bump seed")
+
+
+def metadata_address(mint: str) -> str:
+    """Metaplex metadata PDA of ``mint``."""
+    program = b58decode(METADATA_PROGRAM_ID)
+    return find_program_address([b"metadata", program, b58decode(mint)], METADATA_PROGRAM_ID)[0]
+
+
+# -- account decoding ---------------------------------------------------------
+
+_MINT = struct.Struct("<I32sQBBI32s")
+
+
+def decode_mint(data: Union[bytes, memoryview]) -> Dict[str, Any]:
+    """Decode an SPL Token mint account (82 bytes, also the prefix of
+    Token-2022 mints)."""
+    if len(data) < MINT_ACCOUNT_SIZE:
+        raise ValueError(f"mint account is {len(data)} bytes, expected {MINT_ACCOUNT_SIZE}")
+    auth_tag, auth, supply, decimals, initialized, freeze_tag, freeze = _MINT.unpack_from(data, 0)
+    return {
+        "mint_authority": b58encode(auth) if auth_tag else None,
+        "supply": supply,
+        "decimals": decimals,
+        "is_initialized": bool(initialized),
+        "freeze_authority": b58encode(freeze) if freeze_tag else None,
+    }
+
+
+def decode_metadata(data: Union[bytes, memoryview]) -> Dict[str, Any]:
+    """Decode the fields of a Metaplex metadata account needed for screening."""
+    view = memoryview(data)
+    update_authority = bytes(view[1:33])
+    offset = 65  # key (1) + update authority (32) + mint (32)
+    strings = []
+    for _ in range(3):  # name, symbol, uri: u32 length + bytes
+        (length,) = struct.unpack_from("<I", view, offset)
+        offset += 4
+        strings.append(bytes(view[offset : offset + length]).rstrip(b"\0").decode("utf-8", "replace"))
+        offset += length
+    offset += 2  # seller_fee_basis_points
+    if view[offset]:  # Option<Vec<Creator>>
+        (count,) = struct.unpack_from("<I", view, offset + 1)
+        offset += 5 + 34 * count
+    else:
+        offset += 1
+    primary_sale, is_mutable = struct.unpack_from("<BB", view, offset)
+    return {
+        "update_authority": b58encode(update_authority),
+        "name": strings[0],
+        "symbol": strings[1],
+        "uri": strings[2],
+        "primary_sale_happened": bool(primary_sale),
+        "is_mutable": bool(is_mutable),
+    }
+
+
+def _account_bytes(account: Optional[Dict[str, Any]]) -> Optional[bytes]:
+    if not account:
+        return None
+    data = account.get("data")
+    if isinstance(data, list):
+        data = data[0]
+    return binascii.a2b_base64(data) if data else None
+
+
+# -- screening -----------------------------------------------------------------
+
+
+def checks_from_env() -> Dict[str, bool]:
+    """Enabled checks according to the ``CHECK_IF_MINT_IS_*`` variables."""
+    return {name: os.getenv(var, "false").strip().lower() == "true" for name, var in CHECK_ENV.items()}
+
+
+Candidate = Union[str, Tuple[str, Optional[str]], Dict[str, Any]]
+
+
+def _parse_candidate(candidate: Candidate) -> Tuple[str, Optional[str]]:
+    if isinstance(candidate, str):
+        return candidate, None
+    if isinstance(candidate, dict):
+        return candidate["mint"], candidate.get("lp_mint")
+    return candidate[0], candidate[1]
+
+
+class MintScreener:
+    """Screen many candidate mints with batched account fetches.
+
+    Parameters
+    ----------
+    checks : Dict[str, bool], optional
+        Enabled checks (``renounced``, ``frozen``, ``mutable``, ``burned``);
+        defaults to ``checks_from_env()``.
+    endpoints : List[str], optional
+        RPC endpoints passed to ``rpc_call``.
+    batch_size : int
+        Accounts per ``getMultipleAccounts`` call (the RPC maximum is 100).
+    max_workers : int
+        Batches fetched concurrently.
+
+    ``stats`` counts screened ``candidates``, ``rpc_calls`` and fetched
+    ``accounts``; ``cached`` counts account reads skipped because the checks
+    they serve had already passed permanently for that mint.
+    """
+
+    def __init__(
+        self,
+        checks: Optional[Dict[str, bool]] = None,
+        endpoints: Optional[List[str]] = None,
+        batch_size: int = MAX_ACCOUNTS_PER_CALL,
+        max_workers: int = 4,
+        commitment: str = "confirmed",
+    ) -> None:
+        self.checks = checks if checks is not None else checks_from_env()
+        self.endpoints = endpoints
+        self.batch_size = min(batch_size, MAX_ACCOUNTS_PER_CALL)
+        self.max_workers = max_workers
+        self.commitment = commitment
+        self.facts: Dict[str, Dict[str, bool]] = {}  # mint -> permanent passing facts
+        self._metadata_pda: Dict[str, str] = {}
+        self.stats = {"candidates": 0, "cached": 0, "rpc_calls": 0, "accounts": 0}
+
+    def _metadata_for(self, mint: str) -> str:
+        pda = self._metadata_pda.get(mint)
+        if pda is None:
+            pda = self._metadata_pda[mint] = metadata_address(mint)
+        return pda
+
+    def _fetch_batch(self, keys: List[str]) -> List[Optional[Dict[str, Any]]]:
+        result = rpc_call(
+            "getMultipleAccounts",
+            [keys, {"encoding": "base64", "commitment": self.commitment}],
+            self.endpoints,
+        )
+        if not result:
+            return [None] * len(keys)
+        return result.get("value") or [None] * len(keys)
+
+    def fetch_accounts(self, keys: Iterable[str]) -> Dict[str, Optional[bytes]]:
+        """Fetch raw account data for ``keys`` (deduplicated, batched)."""
+        unique = list(dict.fromkeys(keys))
+        batches = [unique[i : i + self.batch_size] for i in range(0, len(unique), self.batch_size)]
+        if not batches:
+            return {}
+        self.stats["rpc_calls"] += len(batches)
+        self.stats["accounts"] += len(unique)
+        incr("mint_screen_rpc_calls", len(batches))
+        with ThreadPoolExecutor(min(self.max_workers, len(batches))) as pool:
+            results = list(pool.map(self._fetch_batch, batches))
+        out: Dict[str, Optional[bytes]] = {}
+        for batch, accounts in zip(batches, results):
+            for key, account in zip(batch, accounts):
+                out[key] = _account_bytes(account)
+        return out
+
+    def _needs(self, mint: str, lp_mint: Optional[str]) -> Tuple[List[str], int]:
+        """Accounts to fetch for ``mint``, and how many were skipped because
+        every enabled check they serve is already a known permanent fact."""
+        known = self.facts.get(mint, {})
+        keys = []
+        skipped = 0
+        mint_checks = [c for c in ("renounced", "frozen") if self.checks.get(c)]
+        if mint_checks:
+            if all(known.get(c) for c in mint_checks):
+                skipped += 1
+            else:
+                keys.append(mint)
+        if self.checks.get("mutable"):
+            if known.get("mutable"):
+                skipped += 1
+            else:
+                keys.append(self._metadata_for(mint))
+        if self.checks.get("burned") and lp_mint:
+            # LP supply can grow again, so the LP mint is always re-read.
+            keys.append(lp_mint)
+        return keys, skipped
+
+    @timed("mint_screen_seconds")
+    def screen(self, candidates: Iterable[Candidate]) -> Dict[str, Dict[str, Any]]:
+        """Return a verdict per mint.
+
+        Candidates are mint addresses, ``(mint, lp_mint)`` tuples or dicts
+        with ``mint``/``lp_mint``. Each verdict holds ``passed``, the
+        per-check results (``None`` when the account could not be read or
+        decoded, or ``burned`` has no LP mint) and human-readable ``reasons``
+        for failures. A malformed account never aborts the batch.
+        """
+        parsed = [_parse_candidate(c) for c in candidates]
+        self.stats["candidates"] += len(parsed)
+        needs = {mint: self._needs(mint, lp) for mint, lp in parsed}
+        skipped = sum(n for _, n in needs.values())
+        if skipped:
+            self.stats["cached"] += skipped
+            incr("mint_screen_cache_hits", skipped)
+        accounts = self.fetch_accounts(k for keys, _ in needs.values() for k in keys)
+        return {mint: self._verdict(mint, lp_mint, accounts) for mint, lp_mint in parsed}
+
+    def _verdict(
+        self, mint: str, lp_mint: Optional[str], accounts: Dict[str, Optional[bytes]]
+    ) -> Dict[str, Any]:
+        known = self.facts.setdefault(mint, {})
+        results: Dict[str, Optional[bool]] = {}
+        reasons: List[str] = []
+
+        mint_info = None
+        if mint in accounts and accounts[mint] is not None:
+            try:
+                mint_info = decode_mint(accounts[mint])
+            except ValueError:
+                mint_info = None
+        for check, field in (("renounced", "mint_authority"), ("frozen", "freeze_authority")):
+            if not self.checks.get(check):
+                continue
+            if known.get(check):
+                results[check] = True
+            elif mint_info is None:
+                results[check] = None
+            else:
+                results[check] = mint_info[field] is None
+                if not results[check]:
+                    reasons.append(f"{field.replace('_', ' ')} is {mint_info[field]}")
+
+        if self.checks.get("mutable"):
+            if known.get("mutable"):
+                results["mutable"] = True
+            else:
+                data = accounts.get(self._metadata_for(mint))
+                try:
+                    results["mutable"] = None if data is None else not decode_metadata(data)["is_mutable"]
+                except (struct.error, IndexError):
+                    results["mutable"] = None
+                if results["mutable"] is False:
+                    reasons.append("metadata is mutable")
+
+        if self.checks.get("burned"):
+            data = accounts.get(lp_mint) if lp_mint else None
+            results["burned"] = None
+            if not lp_mint:
+                reasons.append("burned: no LP mint given")
+            elif data is not None:
+                try:
+                    supply = decode_mint(data)["supply"]
+                except ValueError as exc:
+                    reasons.append(f"burned: LP {exc}")
+                else:
+                    results["burned"] = supply == 0
+                    if supply:
+                        reasons.append(f"LP supply is {supply}")
+
+        for check, ok in results.items():
+            if ok is None and not any(r.startswith(f"{check}: ") for r in reasons):
+                reasons.append(f"{check}: account not found")
+            elif ok and check in PERMANENT_CHECKS:
+                known[check] = True
+        passed = all(results.values())
+        incr("mint_screen_verdicts", passed=passed)
+        return {"mint": mint, "passed": passed, "checks": results, "reasons": reasons}
@@ -1,15 +1,51 @@
-from typing import List
+import re
+import time
 from collections import Counter
+from functools import partial
+from itertools import islice
+from types import SimpleNamespace
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from ._lazy import optional_import
+
+# scikit-learn takes around a second to import, so it is only loaded when a
+# topic model is actually used.
+_SKLEARN: Optional[SimpleNamespace] = None
+
+
+def _sklearn() -> SimpleNamespace:
+    """Return the scikit-learn pieces used here; attributes are None if missing."""
+    global _SKLEARN
+    if _SKLEARN is None:
+        text = optional_import("sklearn.feature_extraction.text")
+        decomposition = optional_import("sklearn.decomposition")
+        utils = optional_import("sklearn.utils")
+        sparse = optional_import("scipy.sparse")
+        _SKLEARN = SimpleNamespace(
+            CountVectorizer=getattr(text, "CountVectorizer", None),
+            NMF=getattr(decomposition, "NMF", None),
+            # Online NMF needs scikit-learn >= 1.1
+            MiniBatchNMF=getattr(decomposition, "MiniBatchNMF", None),
+            ENGLISH_STOP_WORDS=getattr(text, "ENGLISH_STOP_WORDS", frozenset()),
+            murmurhash3_32=getattr(utils, "murmurhash3_32", None),
+            csr_matrix=getattr(sparse, "csr_matrix", None),
+        )
+    return _SKLEARN
 
-try:  # Optional scikit-learn import
-    from sklearn.feature_extraction.text import CountVectorizer
-    from sklearn.decomposition import NMF
-except Exception:  # pragma: no cover - fallback when sklearn missing
-    CountVectorizer = None
-    NMF = None
 
 POSITIVE_WORDS = {"gain", "bullish", "up", "increase", "profit"}
 NEGATIVE_WORDS = {"loss", "bearish", "down", "decrease", "selloff"}
+NEGATION_WORDS = {"not", "no", "never", "none", "without", "dont", "don't", "isnt", "isn't", "aint", "ain't"}
+
+DEFAULT_LEXICON: Dict[str, float] = {
+    **{w: 1.0 for w in POSITIVE_WORDS},
+    **{w: -1.0 for w in NEGATIVE_WORDS},
+}
+
+# Tokenizer shared by all batch scoring calls; compiled once at import.
+_TOKEN_RE = re.compile(r"[a-z0-9']+")
+# Same token pattern as scikit-learn's CountVectorizer default.
+_TOPIC_TOKEN_RE = re.compile(r"(?u)\b\w\w+\b")
 
 def simple_sentiment_score(text: str) -> float:
     """Compute a very naive sentiment score based on word occurrences."""
@@ -30,10 +66,11 @@ def extract_topics(texts: List[str], n_topics: int = 2, n_words: int = 3) -> Lis
     """
     if not texts:
         return []
-    if CountVectorizer and NMF:
-        vec = CountVectorizer(stop_words="english")
+    sk = _sklearn()
+    if sk.CountVectorizer and sk.NMF:
+        vec = sk.CountVectorizer(stop_words="english")
         X = vec.fit_transform(texts)
-        model = NMF(n_components=n_topics, init="random", random_state=0, max_iter=200)
+        model = sk.NMF(n_components=n_topics, init="random", random_state=0, max_iter=200)
         W = model.fit_transform(X)
         H = model.components_
         vocab = vec.get_feature_names_out()
@@ -48,3 +85,233 @@ def extract_topics(texts: List[str], n_topics: int = 2, n_words: int = 3) -> Lis
         counter.update(word for word in text.lower().split() if word.isalpha())
     most_common = [word for word, _ in counter.most_common(n_words)]
     return [most_common]
+
+
+class IncrementalTopicModel:
+    """Online topic extraction over a growing stream of posts.
+
+    Unlike ``extract_topics`` this never refits on the full history. Posts are
+    hashed into a fixed ``n_features`` vocabulary and each ``update`` runs one
+    mini-batch NMF step, so cost per call depends only on the new posts and
+    memory stays bounded by ``n_topics * n_features``. Every hash bucket keeps
+    its dominant word (majority vote) so topics can be reported as words.
+
+    Without scikit-learn the model falls back to incremental word frequencies,
+    pruned to at most ``2 * max_vocab`` entries, and reports a single topic of
+    the most common words like ``extract_topics`` does.
+    """
+
+    def __init__(
+        self,
+        n_topics: int = 2,
+        n_features: int = 2 ** 16,
+        max_vocab: int = 50_000,
+        random_state: int = 0,
+    ) -> None:
+        self.n_topics = n_topics
+        self.n_features = n_features
+        self.max_vocab = max_vocab
+        self.n_seen = 0
+        self._sk = _sklearn()
+        self._use_nmf = (
+            self._sk.MiniBatchNMF is not None
+            and self._sk.csr_matrix is not None
+            and self._sk.murmurhash3_32 is not None
+        )
+        self._model = (
+            self._sk.MiniBatchNMF(n_components=n_topics, init="random", random_state=random_state)
+            if self._use_nmf
+            else None
+        )
+        self._stop_words = self._sk.ENGLISH_STOP_WORDS
+        self._fitted = False
+        # bucket index -> [word, vote count]; at most n_features entries
+        self._labels: Dict[int, List[Any]] = {}
+        self._counter: Counter = Counter()
+
+    def _tokens(self, text: str) -> List[str]:
+        return [t for t in _TOPIC_TOKEN_RE.findall(text.lower()) if t not in self._stop_words]
+
+    def _bucket(self, token: str) -> int:
+        index = abs(self._sk.murmurhash3_32(token, seed=0)) % self.n_features
+        label = self._labels.get(index)
+        if label is None:
+            self._labels[index] = [token, 1]
+        elif label[0] == token:
+            label[1] += 1
+        elif label[1] > 1:
+            label[1] -= 1
+        else:
+            self._labels[index] = [token, 1]
+        return index
+
+    def update(self, texts: Iterable[str]) -> None:
+        """Fold a batch of new posts into the current topics."""
+        texts = list(texts)
+        if not texts:
+            return
+        self.n_seen += len(texts)
+        if not self._use_nmf:
+            self._counter.update(
+                word for text in texts for word in text.lower().split() if word.isalpha()
+            )
+            if len(self._counter) > 2 * self.max_vocab:
+                self._counter = Counter(dict(self._counter.most_common(self.max_vocab)))
+            return
+        indptr = [0]
+        indices: List[int] = []
+        data: List[float] = []
+        for text in texts:
+            counts = Counter(self._bucket(t) for t in self._tokens(text))
+            indices.extend(counts.keys())
+            data.extend(counts.values())
+            indptr.append(len(indices))
+        if not indices:
+            return
+        X = self._sk.csr_matrix((data, indices, indptr), shape=(len(texts), self.n_features), dtype=float)
+        self._model.partial_fit(X)
+        self._fitted = True
+
+    def topics(self, n_words: int = 3) -> List[List[str]]:
+        """Return the top ``n_words`` keywords for each current topic."""
+        if not self._use_nmf:
+            if not self._counter:
+                return []
+            return [[word for word, _ in self._counter.most_common(n_words)]]
+        if not self._fitted:
+            return []
+        topics: List[List[str]] = []
+        for comp in self._model.components_:
+            words: List[str] = []
+            for i in comp.argsort()[::-1]:
+                if comp[i] <= 0 or len(words) >= n_words:
+                    break
+                label = self._labels.get(int(i))
+                if label is not None:
+                    words.append(label[0])
+            topics.append(words)
+        return topics
+
+
+def _score_tokens(
+    tokens: List[str], lexicon: Dict[str, float], negations: frozenset, negation_window: int
+) -> float:
+    pos = 0.0
+    neg = 0.0
+    negate_until = -1
+    for i, tok in enumerate(tokens):
+        if tok in negations:
+            negate_until = i + negation_window
+            continue
+        weight = lexicon.get(tok)
+        if weight is None:
+            continue
+        if i <= negate_until:
+            weight = -weight
+        if weight > 0:
+            pos += weight
+        else:
+            neg -= weight
+    total = pos + neg
+    if total == 0:
+        return 0.0
+    return (pos - neg) / total
+
+
+def _score_chunk(
+    texts: List[str], lexicon: Dict[str, float], negations: frozenset, negation_window: int
+) -> List[float]:
+    findall = _TOKEN_RE.findall
+    return [_score_tokens(findall(t.lower()), lexicon, negations, negation_window) for t in texts]
+
+
+def _post_text(post: Union[str, Dict[str, Any]]) -> str:
+    return post if isinstance(post, str) else post.get("text") or ""
+
+
+def _chunked(posts: Iterable[Union[str, Dict[str, Any]]], size: int) -> Iterator[List[str]]:
+    it = iter(posts)
+    while True:
+        chunk = [_post_text(p) for p in islice(it, size)]
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_sentiment_scores(
+    posts: Iterable[Union[str, Dict[str, Any]]],
+    lexicon: Optional[Dict[str, float]] = None,
+    negations: Optional[Iterable[str]] = None,
+    negation_window: int = 3,
+    chunk_size: int = 5000,
+    workers: int = 1,
+) -> Iterator[float]:
+    """Stream sentiment scores for a (possibly unbounded) stream of posts.
+
+    Posts may be plain strings or dicts with a ``text`` field, e.g. the output
+    of ``fetch_social_posts``. Each post is tokenized once with a precompiled
+    matcher and scored in a single pass against a weighted ``lexicon``
+    (word -> weight, negative weights for bearish terms). A lexicon word within
+    ``negation_window`` tokens after a negation flips its sign, so
+    "not bullish" counts as bearish. Scores lie in ``[-1, 1]`` like
+    ``simple_sentiment_score``.
+
+    Posts are consumed in chunks of ``chunk_size``; with ``workers > 1`` the
+    chunks are scored across worker processes while preserving input order.
+    """
+    lex = DEFAULT_LEXICON if lexicon is None else lexicon
+    neg = frozenset(NEGATION_WORDS if negations is None else negations)
+    score = partial(_score_chunk, lexicon=lex, negations=neg, negation_window=negation_window)
+    chunks = _chunked(posts, chunk_size)
+    if workers <= 1:
+        for chunk in chunks:
+            yield from score(chunk)
+        return
+    # Imported here: multiprocessing is a noticeable share of cold start.
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Bound the number of in-flight chunks so a firehose does not pile up
+        # in memory while workers are busy.
+        pending: List[Any] = []
+        for chunk in chunks:
+            pending.append(pool.submit(score, chunk))
+            if len(pending) >= workers * 2:
+                yield from pending.pop(0).result()
+        for fut in pending:
+            yield from fut.result()
+
+
+def batch_sentiment_scores(
+    posts: Iterable[Union[str, Dict[str, Any]]],
+    lexicon: Optional[Dict[str, float]] = None,
+    negations: Optional[Iterable[str]] = None,
+    negation_window: int = 3,
+    chunk_size: int = 5000,
+    workers: int = 1,
+) -> List[float]:
+    """Score a batch of posts; see ``iter_sentiment_scores`` for parameters."""
+    return list(
+        iter_sentiment_scores(posts, lexicon, negations, negation_window, chunk_size, workers)
+    )
+
+
+def benchmark_sentiment_throughput(
+    n_posts: int = 200_000, workers: int = 1, chunk_size: int = 5000, seed: int = 0
+) -> Dict[str, float]:
+    """Measure batch scoring throughput in posts per second on synthetic posts."""
+    import random
+
+    rng = random.Random(seed)
+    vocab = sorted(DEFAULT_LEXICON) + sorted(NEGATION_WORDS) + [
+        "sol", "btc", "pump", "launch", "pool", "token", "just", "ape", "wen", "moon",
+    ]
+    posts = [" ".join(rng.choice(vocab) for _ in range(rng.randint(5, 25))) for _ in range(n_posts)]
+    start = time.perf_counter()
+    scores = batch_sentiment_scores(posts, chunk_size=chunk_size, workers=workers)
+    elapsed = time.perf_counter() - start
+    return {
+        "posts": float(len(scores)),
+        "seconds": elapsed,
+        "posts_per_second": len(scores) / elapsed if elapsed else float("inf"),
+    }
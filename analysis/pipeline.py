@@ -0,0 +1,303 @@
+"""Parallel, memoized DAG runner for analysis pipelines.
+
+Stages declare the named values they consume and produce. The runner starts
+every stage whose inputs are ready, running ``"io"`` stages on a thread pool
+and ``"cpu"`` stages on a process pool, so independent branches overlap.
+
+Outputs of cacheable stages are pickled under ``cache_dir`` keyed by a hash of
+the stage name, its function's code, the source of the modules it depends on,
+its ``version``, its parameters and the digests of its inputs; reruns only
+recompute stages whose key changed. A stage depends on every module of the
+``analysis`` package unless it lists narrower ``depends``. Changes the key
+cannot see (installed libraries, data files, environment variables) are not
+detected: bump the stage's ``version`` or clear ``cache_dir``. Stages that
+read the outside world (network, clock, randomness) should set
+``cache=False``; their outputs are then fingerprinted by content so
+downstream stages still hit the cache when nothing actually changed.
+
+With ``profile=True`` (and instrumentation enabled) every executed stage is
+wrapped in ``sample_profile``: IO stages in their thread, CPU stages inside
+the worker process, whose samples are merged into ``REGISTRY.profiles``.
+"""
+
+import functools
+import hashlib
+import importlib
+import inspect
+import os
+import pickle
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from .instrumentation import REGISTRY, enable, is_enabled, observe, sample_profile
+
+CACHE_DIR = Path(".cache") / "pipeline"
+
+
+class Stage:
+    """A pipeline step computing ``outputs`` from ``inputs``.
+
+    ``func`` is called as ``func(*input_values, **params)``. With a single
+    output it returns the value; with several it returns a tuple in
+    ``outputs`` order. CPU stages run in worker processes, so their ``func``
+    must be a module-level function.
+
+    ``depends`` lists the modules (objects or dotted names) whose source is
+    part of the cache key; by default that is the whole ``analysis``
+    package. ``version`` is an opaque string to bump when outputs change for
+    reasons the source digest cannot see.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        inputs: Sequence[str] = (),
+        outputs: Optional[Sequence[str]] = None,
+        kind: str = "cpu",
+        params: Optional[Dict[str, Any]] = None,
+        cache: bool = True,
+        depends: Optional[Sequence[Union[str, ModuleType]]] = None,
+        version: str = "",
+    ) -> None:
+        if kind not in ("cpu", "io"):
+            raise ValueError(f"stage {name!r}: kind must be 'cpu' or 'io', got {kind!r}")
+        self.name = name
+        self.func = func
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs) if outputs is not None else (name,)
+        self.kind = kind
+        self.params = params or {}
+        self.cache = cache
+        self.depends = tuple(depends) if depends is not None else None
+        self.version = version
+
+    def code_digest(self) -> str:
+        try:
+            source = inspect.getsource(self.func)
+        except (OSError, TypeError):
+            source = getattr(self.func, "__qualname__", repr(self.func))
+        h = hashlib.sha256(source.encode())
+        h.update(self.version.encode())
+        if self.depends is None:
+            h.update(_package_digest().encode())
+        else:
+            for module in self.depends:
+                h.update(_module_digest(module).encode())
+        return h.hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def _package_digest() -> str:
+    """Digest of every module source in this package (once per process)."""
+    h = hashlib.sha256()
+    for path in sorted(Path(__file__).parent.glob("*.py")):
+        h.update(path.name.encode())
+        h.update(path.read_bytes())
+    return h.hexdigest()
+
+
+def _module_digest(module: Union[str, ModuleType]) -> str:
+    if isinstance(module, str):
+        module = importlib.import_module(module)
+    try:
+        source = inspect.getsource(module)
+    except (OSError, TypeError):
+        source = module.__name__
+    return hashlib.sha256(source.encode()).hexdigest()
+
+
+def _digest(value: Any) -> str:
+    try:
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        data = repr(value).encode()
+    return hashlib.sha256(data).hexdigest()
+
+
+def _execute(func: Callable[..., Any], args: Tuple[Any, ...], params: Dict[str, Any]):
+    start = time.perf_counter()
+    result = func(*args, **params)
+    return result, time.perf_counter() - start
+
+
+def _execute_profiled(stage: str, func: Callable[..., Any], args: Tuple[Any, ...], params: Dict[str, Any]):
+    with sample_profile(stage):
+        return _execute(func, args, params)
+
+
+def _execute_sampled(stage: str, func: Callable[..., Any], args: Tuple[Any, ...], params: Dict[str, Any]):
+    # Runs in a worker process, whose registry is not the caller's: sample
+    # there and ship the collapsed stacks back with the result.
+    enable()
+    with sample_profile(stage) as profile:
+        result, seconds = _execute(func, args, params)
+    return result, seconds, profile.samples
+
+
+class Pipeline:
+    """Run a set of stages as a DAG; see the module docstring."""
+
+    def __init__(
+        self,
+        stages: List[Stage],
+        cache_dir: Path = CACHE_DIR,
+        max_threads: int = 8,
+        max_processes: Optional[int] = None,
+        profile: bool = False,
+    ) -> None:
+        self.stages = stages
+        self.cache_dir = Path(cache_dir)
+        self.max_threads = max_threads
+        self.max_processes = max_processes
+        self.profile = profile
+        self.report: List[Dict[str, Any]] = []
+        producers: Dict[str, Stage] = {}
+        for stage in stages:
+            for out in stage.outputs:
+                if out in producers:
+                    raise ValueError(f"output {out!r} produced by both {producers[out].name!r} and {stage.name!r}")
+                producers[out] = stage
+        self._producers = producers
+
+    # -- memoization ------------------------------------------------------
+    def _key(self, stage: Stage, digests: Dict[str, str]) -> str:
+        h = hashlib.sha256()
+        h.update(stage.name.encode())
+        h.update(stage.code_digest().encode())
+        h.update(_digest(sorted(stage.params.items())).encode())
+        for name in stage.inputs:
+            h.update(digests[name].encode())
+        return h.hexdigest()
+
+    def _load(self, key: str) -> Optional[Tuple[Any, ...]]:
+        path = self.cache_dir / f"{key}.pkl"
+        if not path.exists():
+            return None
+        try:
+            with path.open("rb") as f:
+                return pickle.load(f)
+        except Exception:
+            return None
+
+    def _store(self, key: str, values: Tuple[Any, ...]) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_dir / f"{key}.{os.getpid()}.tmp"
+        with tmp.open("wb") as f:
+            pickle.dump(values, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self.cache_dir / f"{key}.pkl")
+
+    # -- execution --------------------------------------------------------
+    def _needed(self, targets: Optional[Sequence[str]], available: Dict[str, Any]) -> List[Stage]:
+        if targets is None:
+            return list(self.stages)
+        needed: Dict[str, Stage] = {}
+        todo = list(targets)
+        while todo:
+            name = todo.pop()
+            if name in available:
+                continue
+            stage = self._producers.get(name)
+            if stage is None:
+                raise KeyError(f"no stage produces {name!r}")
+            if stage.name not in needed:
+                needed[stage.name] = stage
+                todo.extend(stage.inputs)
+        return [s for s in self.stages if s.name in needed]
+
+    def run(
+        self, initial: Optional[Dict[str, Any]] = None, targets: Optional[Sequence[str]] = None
+    ) -> Dict[str, Any]:
+        """Execute the DAG and return every produced value by name.
+
+        ``initial`` supplies values no stage produces; ``targets`` restricts
+        the run to the stages needed for those values.
+        """
+        values: Dict[str, Any] = dict(initial or {})
+        digests = {name: _digest(v) for name, v in values.items()}
+        pending = self._needed(targets, values)
+        for stage in pending:
+            for name in stage.inputs:
+                if name not in values and name not in self._producers:
+                    raise KeyError(f"stage {stage.name!r} needs {name!r} which nothing provides")
+        self.report = []
+        running: Dict[Any, Tuple[Stage, Optional[str]]] = {}
+        started = time.perf_counter()
+        with ThreadPoolExecutor(self.max_threads) as threads, ProcessPoolExecutor(self.max_processes) as procs:
+            while pending or running:
+                for stage in [s for s in pending if all(i in values for i in s.inputs)]:
+                    pending.remove(stage)
+                    key = self._key(stage, digests) if stage.cache else None
+                    cached = self._load(key) if key else None
+                    if cached is not None:
+                        self._finish(stage, cached, key, values, digests, 0.0, True)
+                        continue
+                    args = tuple(values[i] for i in stage.inputs)
+                    profile = self.profile and is_enabled()
+                    if stage.kind == "io":
+                        if profile:
+                            fut = threads.submit(_execute_profiled, stage.name, stage.func, args, stage.params)
+                        else:
+                            fut = threads.submit(_execute, stage.func, args, stage.params)
+                    elif profile:
+                        fut = procs.submit(_execute_sampled, stage.name, stage.func, args, stage.params)
+                    else:
+                        fut = procs.submit(_execute, stage.func, args, stage.params)
+                    running[fut] = (stage, key)
+                if not running:
+                    if any(all(i in values for i in s.inputs) for s in pending):
+                        continue  # cache hits above unblocked more stages
+                    if pending:
+                        names = ", ".join(s.name for s in pending)
+                        raise RuntimeError(f"pipeline has a dependency cycle among: {names}")
+                    break
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for fut in done:
+                    stage, key = running.pop(fut)
+                    result, seconds, *samples = fut.result()
+                    if samples:
+                        REGISTRY.add_samples(stage.name, samples[0])
+                    outputs = (result,) if len(stage.outputs) == 1 else tuple(result)
+                    if len(outputs) != len(stage.outputs):
+                        raise ValueError(
+                            f"stage {stage.name!r} returned {len(outputs)} values for {len(stage.outputs)} outputs"
+                        )
+                    if key:
+                        self._store(key, outputs)
+                    self._finish(stage, outputs, key, values, digests, seconds, False)
+        self.wall_seconds = time.perf_counter() - started
+        return values
+
+    def _finish(
+        self,
+        stage: Stage,
+        outputs: Tuple[Any, ...],
+        key: Optional[str],
+        values: Dict[str, Any],
+        digests: Dict[str, str],
+        seconds: float,
+        cached: bool,
+    ) -> None:
+        for name, value in zip(stage.outputs, outputs):
+            values[name] = value
+            # Cached stages are addressed by their key (Merkle style); live
+            # stages by content so identical fetches still hit downstream.
+            digests[name] = hashlib.sha256(f"{key}:{name}".encode()).hexdigest() if key else _digest(value)
+        if not cached:
+            observe("pipeline_stage_seconds", seconds, stage=stage.name)
+        self.report.append({"stage": stage.name, "kind": stage.kind, "seconds": seconds, "cached": cached})
+
+    def format_report(self) -> str:
+        """Return a per-stage timing table for the last run."""
+        lines = [f"{'stage':<24} {'kind':<4} {'seconds':>9}  cached"]
+        for row in self.report:
+            lines.append(
+                f"{row['stage']:<24} {row['kind']:<4} {row['seconds']:9.3f}  {'yes' if row['cached'] else 'no'}"
+            )
+        total = sum(r["seconds"] for r in self.report)
+        lines.append(f"{'stage time':<29} {total:9.3f}")
+        lines.append(f"{'wall time':<29} {getattr(self, 'wall_seconds', 0.0):9.3f}")
+        return "\n".join(lines)
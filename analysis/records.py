@@ -0,0 +1,366 @@
+"""Compact, column-oriented containers for trades and wallet transactions.
+
+``fetch_trades`` and ``fetch_wallet_history`` return one ``dict`` per row,
+which costs several hundred bytes per trade once a ``datetime`` and string
+fields are included. The containers here store each field in a typed
+``array.array`` column instead: token/mint names are interned to integer ids,
+trade sides are ``+1``/``-1`` and timestamps are epoch milliseconds, so a
+trade takes 33 bytes and a wallet transaction about 130 (most of it the
+signature).
+
+Containers can be saved to a directory of raw column files and loaded back
+memory-mapped, so scans over millions of rows only page in what they touch.
+Iterating yields lightweight row views that support ``row["field"]`` and
+``row.get("field")``, so code written for the dict rows keeps working; the
+hot functions in ``advanced_metrics``, ``wallet_analysis`` and
+``top_trader_scanner`` read the columns directly.
+"""
+
+import json
+import mmap
+import sys
+from abc import ABC, abstractmethod
+from array import array
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from ._lazy import require
+
+BUY, SELL = 1, -1
+
+
+class SymbolTable:
+    """Bidirectional mapping between token/mint names and dense integer ids."""
+
+    __slots__ = ("names", "_ids")
+
+    def __init__(self, names: Iterable[str] = ()) -> None:
+        self.names: List[str] = []
+        self._ids: Dict[str, int] = {}
+        for name in names:
+            self.intern(name)
+
+    def intern(self, name: str) -> int:
+        """Return the id of ``name``, assigning the next free id if new."""
+        idx = self._ids.get(name)
+        if idx is None:
+            idx = self._ids[name] = len(self.names)
+            self.names.append(name)
+        return idx
+
+    def id_of(self, name: str) -> Optional[int]:
+        return self._ids.get(name)
+
+    def __getitem__(self, idx: int) -> str:
+        return self.names[idx]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+def _row_timestamp_ms(row: Dict[str, Any]) -> int:
+    # RPC signature listings carry ``blockTime`` in seconds.
+    block_time = row.get("blockTime")
+    if block_time:
+        return int(block_time) * 1000
+    return to_epoch_ms(row.get("timestamp"))
+
+
+def to_epoch_ms(value: Any) -> int:
+    """Convert a ``datetime``, ISO string (as written by the JSON cache) or
+    number of milliseconds to epoch milliseconds; missing values become 0.
+
+    Naive datetimes are UTC, as produced by ``data_ingestion``; they are
+    never interpreted in the host's local time zone.
+    """
+    if value is None or value == "":
+        return 0
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp() * 1000)
+    return int(value)
+
+
+class RecordView:
+    """Read-only view of one row; behaves like the original ``dict`` row."""
+
+    __slots__ = ("_records", "_i")
+
+    def __init__(self, records: "_Records", i: int) -> None:
+        self._records = records
+        self._i = i
+
+    def __getitem__(self, field: str) -> Any:
+        return self._records.value(field, self._i)
+
+    def get(self, field: str, default: Any = None) -> Any:
+        try:
+            return self._records.value(field, self._i)
+        except KeyError:
+            return default
+
+    def keys(self) -> List[str]:
+        return list(self._records.FIELDS)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {f: self._records.value(f, self._i) for f in self._records.FIELDS}
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class _Records(ABC):
+    """Shared column storage, persistence and row access.
+
+    Subclasses define ``COLUMNS`` (name -> ``array`` typecode), ``FIELDS``
+    (the dict-row fields they expose) and ``value``/``append``.
+    """
+
+    COLUMNS: Dict[str, str] = {}
+    FIELDS: Tuple[str, ...] = ()
+
+    def __init__(self, symbols: Optional[SymbolTable] = None) -> None:
+        self.symbols = symbols if symbols is not None else SymbolTable()
+        self.columns: Dict[str, Union[array, memoryview]] = {
+            name: array(code) for name, code in self.COLUMNS.items()
+        }
+        self._maps: List[mmap.mmap] = []
+
+    def _col(self, name: str) -> array:
+        # Memory-mapped columns are read-only; copy on the first append.
+        col = self.columns[name]
+        if not isinstance(col, array):
+            col = self.columns[name] = array(self.COLUMNS[name], col)
+        return col
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values())))
+
+    def __iter__(self) -> Iterator[RecordView]:
+        return (RecordView(self, i) for i in range(len(self)))
+
+    def __getitem__(self, i: int) -> RecordView:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return RecordView(self, i)
+
+    @abstractmethod
+    def value(self, field: str, i: int) -> Any:
+        """Dict-row value of ``field`` for row ``i``; KeyError if unknown."""
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Materialise plain ``dict`` rows (the original representation)."""
+        return [RecordView(self, i).to_dict() for i in range(len(self))]
+
+    def nbytes(self) -> int:
+        """Bytes held by the columns (excluding the symbol table)."""
+        return sum(len(c) * array(self.COLUMNS[n]).itemsize for n, c in self.columns.items())
+
+    def to_numpy(self) -> Dict[str, Any]:
+        """Zero-copy NumPy views of every column (requires numpy)."""
+        np = require("numpy", "to_numpy")
+        return {
+            name: np.frombuffer(col, dtype=array(self.COLUMNS[name]).typecode)
+            for name, col in self.columns.items()
+        }
+
+    # -- persistence ------------------------------------------------------
+    def save(self, path: Union[str, Path]) -> None:
+        """Write one raw ``<column>.bin`` file per column plus ``meta.json``."""
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        for name, col in self.columns.items():
+            with (path / f"{name}.bin").open("wb") as f:
+                f.write(col if isinstance(col, array) else bytes(col))
+        meta = {
+            "type": type(self).__name__,
+            "length": len(self),
+            "byteorder": sys.byteorder,
+            "columns": self.COLUMNS,
+            "symbols": self.symbols.names,
+        }
+        with (path / "meta.json").open("w") as f:
+            json.dump(meta, f)
+
+    @classmethod
+    def load(cls, path: Union[str, Path], use_mmap: bool = True) -> "_Records":
+        """Load a saved container, memory-mapping the columns by default."""
+        path = Path(path)
+        with (path / "meta.json").open() as f:
+            meta = json.load(f)
+        if meta["type"] != cls.__name__:
+            raise ValueError(f"{path} holds {meta['type']}, not {cls.__name__}")
+        records = cls(SymbolTable(meta["symbols"]))
+        swap = meta["byteorder"] != sys.byteorder
+        for name, code in cls.COLUMNS.items():
+            file = path / f"{name}.bin"
+            if use_mmap and not swap and file.stat().st_size:
+                with file.open("rb") as f:
+                    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                records._maps.append(mm)
+                records.columns[name] = memoryview(mm).cast(code)
+            else:
+                col = array(code)
+                col.frombytes(file.read_bytes())
+                if swap:
+                    col.byteswap()
+                records.columns[name] = col
+        records._load_extra(path, meta, use_mmap)
+        return records
+
+    def _load_extra(self, path: Path, meta: Dict[str, Any], use_mmap: bool) -> None:
+        pass
+
+    def close(self) -> None:
+        """Release memory maps; the container must not be used afterwards."""
+        for name, col in list(self.columns.items()):
+            if isinstance(col, memoryview):
+                col.release()
+        for mm in self._maps:
+            mm.close()
+        self._maps = []
+
+
+class TradeRecords(_Records):
+    """Columnar trades shaped like ``fetch_trades`` rows.
+
+    ``side`` is stored as ``BUY``/``SELL`` and ``timestamp`` as epoch ms;
+    row views return ``"buy"``/``"sell"`` and the integer timestamp.
+    """
+
+    COLUMNS = {"price": "d", "volume": "d", "side": "b", "timestamp_ms": "q", "fee": "d"}
+    FIELDS = ("price", "volume", "side", "timestamp", "fee")
+
+    def append(self, price: float, volume: float, side: int, timestamp_ms: int = 0, fee: float = 0.0) -> None:
+        self._col("price").append(price)
+        self._col("volume").append(volume)
+        self._col("side").append(side)
+        self._col("timestamp_ms").append(timestamp_ms)
+        self._col("fee").append(fee)
+
+    @classmethod
+    def from_dicts(cls, rows: Iterable[Dict[str, Any]]) -> "TradeRecords":
+        records = cls()
+        for r in rows:
+            records.append(
+                float(r.get("price", 0.0)),
+                float(r.get("volume", 0.0)),
+                BUY if r.get("side") == "buy" else SELL,
+                to_epoch_ms(r.get("timestamp")),
+                float(r.get("fee", 0.0)),
+            )
+        return records
+
+    def value(self, field: str, i: int) -> Any:
+        if field == "side":
+            return "buy" if self.columns["side"][i] == BUY else "sell"
+        if field == "timestamp":
+            return self.columns["timestamp_ms"][i]
+        if field in self.FIELDS:
+            return self.columns[field][i]
+        raise KeyError(field)
+
+
+class WalletTxRecords(_Records):
+    """Columnar wallet transactions shaped like ``fetch_wallet_history`` rows.
+
+    Tokens are interned in ``symbols`` (id -1 means no token); signatures are
+    packed into one byte blob with an offsets column.
+    """
+
+    COLUMNS = {"slot": "q", "token": "i", "amount": "d", "fee": "d", "timestamp_ms": "q", "sig_end": "Q"}
+    FIELDS = ("signature", "slot", "token", "amount", "fee", "timestamp")
+
+    def __init__(self, symbols: Optional[SymbolTable] = None) -> None:
+        super().__init__(symbols)
+        self.signatures: Union[bytearray, memoryview] = bytearray()
+
+    def append(
+        self,
+        signature: str,
+        slot: int,
+        token: Optional[str],
+        amount: float,
+        fee: float = 0.0,
+        timestamp_ms: int = 0,
+    ) -> None:
+        if not isinstance(self.signatures, bytearray):
+            self.signatures = bytearray(self.signatures)
+        self.signatures += signature.encode()
+        self._col("sig_end").append(len(self.signatures))
+        self._col("slot").append(slot)
+        self._col("token").append(self.symbols.intern(token) if token else -1)
+        self._col("amount").append(amount)
+        self._col("fee").append(fee)
+        self._col("timestamp_ms").append(timestamp_ms)
+
+    @classmethod
+    def from_dicts(cls, rows: Iterable[Dict[str, Any]], symbols: Optional[SymbolTable] = None) -> "WalletTxRecords":
+        """Build from dict rows; pass a shared ``symbols`` to intern tokens
+        consistently across many wallets."""
+        records = cls(symbols)
+        for r in rows:
+            records.append(
+                str(r.get("signature", "")),
+                int(r.get("slot") or 0),
+                r.get("token"),
+                float(r.get("amount", 0) or 0),
+                float(r.get("fee", 0.0) or 0.0),
+                _row_timestamp_ms(r),
+            )
+        return records
+
+    def value(self, field: str, i: int) -> Any:
+        if field == "signature":
+            ends = self.columns["sig_end"]
+            start = ends[i - 1] if i else 0
+            return bytes(self.signatures[start : ends[i]]).decode()
+        if field == "token":
+            tid = self.columns["token"][i]
+            return self.symbols[tid] if tid >= 0 else None
+        if field == "timestamp":
+            return self.columns["timestamp_ms"][i]
+        if field in self.FIELDS:
+            return self.columns[field][i]
+        raise KeyError(field)
+
+    def token_totals(self, column: Optional[str] = None) -> Dict[str, float]:
+        """Per-token row counts, or sums of ``column`` (e.g. ``"amount"``)."""
+        tokens = self.columns["token"]
+        if column is None:
+            totals: Dict[int, float] = Counter(tokens)
+        else:
+            totals = {}
+            for t, v in zip(tokens, self.columns[column]):
+                totals[t] = totals.get(t, 0.0) + v
+        return {self.symbols[t]: v for t, v in totals.items() if t >= 0}
+
+    def nbytes(self) -> int:
+        return super().nbytes() + len(self.signatures)
+
+    def save(self, path: Union[str, Path]) -> None:
+        super().save(path)
+        with (Path(path) / "signatures.bin").open("wb") as f:
+            f.write(self.signatures)
+
+    def _load_extra(self, path: Path, meta: Dict[str, Any], use_mmap: bool) -> None:
+        file = path / "signatures.bin"
+        if use_mmap and file.stat().st_size:
+            with file.open("rb") as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps.append(mm)
+            self.signatures = memoryview(mm)
+        else:
+            self.signatures = bytearray(file.read_bytes())
+
+    def close(self) -> None:
+        if isinstance(self.signatures, memoryview):
+            self.signatures.release()
+        super().close()
@@ -1,13 +1,35 @@
-from typing import List, Dict
+from typing import Any, Dict, List, Optional, Tuple
 
 
-def add_volatility_regime(candles: List[Dict], window: int = 10, iterations: int = 100) -> List[Dict]:
+def add_volatility_regime(
+    candles: List[Dict], window: int = 10, iterations: int = 100, store: Any = None
+) -> List[Dict]:
     """Label candles with a simple two-cluster volatility regime.
 
     Uses a basic 1D k-means on rolling standard deviation of returns to
-    distinguish between low and high volatility environments.
+    distinguish between low and high volatility environments. With a
+    ``feature_store.FeatureStore`` the labels are cached; the clustering is
+    global, so a grown series is always recomputed in full.
     """
     closes = [c["close"] for c in candles]
+    if store is None:
+        columns, _ = _regime_columns(closes, window, iterations)
+    else:
+        columns = store.get(
+            "volatility_regime",
+            closes,
+            {"window": window, "iterations": iterations},
+            lambda xs: _regime_columns(xs, window, iterations),
+            integer=True,
+        )
+    for candle, label in zip(candles, columns["regime"]):
+        candle["regime"] = label
+    return candles
+
+
+def _regime_columns(
+    closes: List[float], window: int, iterations: int
+) -> Tuple[Dict[str, List[Optional[int]]], None]:
     returns = [0.0]
     for i in range(1, len(closes)):
         prev = closes[i - 1]
@@ -25,9 +47,7 @@ def add_volatility_regime(candles: List[Dict], window: int = 10, iterations: int
 
     data = [v for v in vol if v is not None]
     if not data:
-        for c in candles:
-            c["regime"] = None
-        return candles
+        return {"regime": [None] * len(closes)}, None
 
     centers = [min(data), max(data)]
     for _ in range(iterations):
@@ -45,9 +65,10 @@ def add_volatility_regime(candles: List[Dict], window: int = 10, iterations: int
             break
         centers = new_centers
 
-    for candle, v in zip(candles, vol):
+    labels: List[Optional[int]] = []
+    for v in vol:
         if v is None:
-            candle["regime"] = None
+            labels.append(None)
         else:
-            candle["regime"] = 0 if abs(v - centers[0]) <= abs(v - centers[1]) else 1
-    return candles
+            labels.append(0 if abs(v - centers[0]) <= abs(v - centers[1]) else 1)
+    return {"regime": labels}, None
@@ -0,0 +1,391 @@
+"""Record/replay harness and local mock JSON-RPC server for ``solana_rpc``.
+
+``rpc_call`` degrades to ``0``/``None`` without network, so RPC-dependent code
+cannot be tested or benchmarked deterministically. This module provides:
+
+* ``record(path)``: capture every real request/response made through
+  ``rpc_call`` into a cassette (gzip-compressed JSON lines).
+* ``replay(path)``: answer ``rpc_call`` from a cassette in-process.
+* ``MockRpcServer``: a local threaded HTTP JSON-RPC server that serves a
+  cassette on several simulated endpoints, each with its own latency, jitter
+  and error/drop rates, so client throughput and failover can be exercised
+  over real sockets.
+* ``load_test``: drive ``rpc_call`` concurrently against a set of endpoints
+  and report throughput, latency percentiles and per-endpoint outcomes.
+
+Example::
+
+    with record("mainnet.jsonl.gz"):
+        fetch_wallet_history(addr, offline=False)
+
+    with MockRpcServer("mainnet.jsonl.gz", {"primary": EndpointProfile(error_rate=0.2),
+                                            "backup": EndpointProfile(latency_ms=40)}) as srv:
+        print(load_test(srv.urls, method="getSignaturesForAddress", params=[addr, {"limit": 20}]))
+"""
+
+import gzip
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from . import solana_rpc
+from .instrumentation import percentile
+
+
+def request_key(method: str, params: Any) -> str:
+    """Canonical cassette key of a JSON-RPC call."""
+    return json.dumps([method, params or []], sort_keys=True, separators=(",", ":"))
+
+
+def _error(req_id: Any, code: int, message: str) -> Dict[str, Any]:
+    return {"jsonrpc": "2.0", "id": req_id, "error": {"code": code, "message": message}}
+
+
+class Cassette:
+    """Recorded JSON-RPC responses keyed by ``(method, params)``.
+
+    A key recorded several times replays its responses in order and then
+    repeats the last one, so polling sequences (e.g. ``getSlot``) advance.
+    """
+
+    def __init__(self) -> None:
+        self.entries: Dict[str, List[Dict[str, Any]]] = {}
+        self._cursor: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return sum(len(v) for v in self.entries.values())
+
+    def add(self, method: str, params: Any, response: Dict[str, Any]) -> None:
+        with self._lock:
+            self.entries.setdefault(request_key(method, params), []).append(response)
+
+    def lookup(self, method: str, params: Any) -> Optional[Dict[str, Any]]:
+        """Next recorded response body for the call, or ``None`` if unknown."""
+        key = request_key(method, params)
+        with self._lock:
+            responses = self.entries.get(key)
+            if not responses:
+                return None
+            i = self._cursor.get(key, 0)
+            self._cursor[key] = i + 1
+            return responses[min(i, len(responses) - 1)]
+
+    def respond(self, request: Dict[str, Any], fallback: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Build the JSON-RPC response to one request object."""
+        req_id = request.get("id")
+        method = request.get("method", "")
+        recorded = self.lookup(method, request.get("params"))
+        if recorded is not None:
+            return {**recorded, "id": req_id}
+        if fallback and method in fallback:
+            return {"jsonrpc": "2.0", "id": req_id, "result": fallback[method]}
+        return _error(req_id, -32601, f"no recorded response for {method}")
+
+    def rewind(self) -> None:
+        with self._lock:
+            self._cursor.clear()
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "Cassette":
+        cassette = cls()
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    row = json.loads(line)
+                    cassette.add(row["method"], row["params"], row["response"])
+        return cassette
+
+    def save(self, path: Union[str, Path]) -> None:
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            for key, responses in self.entries.items():
+                method, params = json.loads(key)
+                for response in responses:
+                    f.write(json.dumps({"method": method, "params": params, "response": response},
+                                       separators=(",", ":")) + "\n")
+
+    # -- in-process transport ---------------------------------------------
+    def transport(self, url: str, payload: bytes, timeout: float = 10) -> Any:
+        """``solana_rpc`` transport answering from the cassette.
+
+        Unknown calls raise ``ConnectionError`` so ``rpc_call`` behaves as if
+        every endpoint were unreachable.
+        """
+        body = json.loads(payload)
+        requests = body if isinstance(body, list) else [body]
+        responses = []
+        for request in requests:
+            recorded = self.lookup(request.get("method", ""), request.get("params"))
+            if recorded is None:
+                raise ConnectionError(f"no recorded response for {request.get('method')}")
+            responses.append({**recorded, "id": request.get("id")})
+        return responses if isinstance(body, list) else responses[0]
+
+
+class _Recorder:
+    """Transport wrapper that stores every successful exchange."""
+
+    def __init__(self, cassette: Cassette, inner: "solana_rpc.Transport") -> None:
+        self.cassette = cassette
+        self.inner = inner
+
+    def __call__(self, url: str, payload: bytes, timeout: float = 10) -> Any:
+        data = self.inner(url, payload, timeout)
+        body = json.loads(payload)
+        pairs = zip(body, data) if isinstance(body, list) else [(body, data)]
+        for request, response in pairs:
+            if isinstance(response, dict) and "result" in response:
+                self.cassette.add(request.get("method", ""), request.get("params"), response)
+        return data
+
+
+@contextmanager
+def record(path: Union[str, Path], append: bool = True) -> Iterator[Cassette]:
+    """Record ``rpc_call`` traffic into the cassette at ``path``.
+
+    Only responses carrying a ``result`` are stored. With ``append`` an
+    existing cassette is extended instead of replaced.
+    """
+    path = Path(path)
+    cassette = Cassette.load(path) if append and path.exists() else Cassette()
+    previous = solana_rpc.set_transport(None)
+    solana_rpc.set_transport(_Recorder(cassette, previous))
+    try:
+        yield cassette
+    finally:
+        solana_rpc.set_transport(previous)
+        cassette.save(path)
+
+
+@contextmanager
+def replay(source: Union[str, Path, Cassette]) -> Iterator[Cassette]:
+    """Serve ``rpc_call`` from a cassette without any sockets."""
+    cassette = source if isinstance(source, Cassette) else Cassette.load(source)
+    previous = solana_rpc.set_transport(cassette.transport)
+    try:
+        yield cassette
+    finally:
+        solana_rpc.set_transport(previous)
+
+
+class EndpointProfile:
+    """Behaviour of one simulated endpoint.
+
+    ``latency_ms`` plus Gaussian ``jitter_ms`` is added to every request.
+    ``error_rate`` answers HTTP 503, ``rpc_error_rate`` a JSON-RPC error body
+    ("node is behind") and ``drop_rate`` closes the connection without a
+    response.
+    """
+
+    __slots__ = ("latency_ms", "jitter_ms", "error_rate", "rpc_error_rate", "drop_rate")
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        rpc_error_rate: float = 0.0,
+        drop_rate: float = 0.0,
+    ) -> None:
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rpc_error_rate = rpc_error_rate
+        self.drop_rate = drop_rate
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "_Server"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args: Any) -> None:  # keep load tests quiet
+        pass
+
+    def do_POST(self) -> None:
+        name = self.path.strip("/") or "default"
+        mock = self.server.mock
+        profile = mock.endpoints.get(name)
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if profile is None:
+            self._send(404, b"unknown endpoint")
+            return
+        outcome, delay = mock._draw(name, profile)
+        if delay > 0:
+            time.sleep(delay)
+        if outcome == "drop":
+            self.close_connection = True
+            self.connection.close()
+            return
+        if outcome == "http_error":
+            self._send(503, b"service unavailable")
+            return
+        try:
+            request = json.loads(body)
+        except ValueError:
+            self._send_json(_error(None, -32700, "parse error"))
+            return
+        requests = request if isinstance(request, list) else [request]
+        if outcome == "rpc_error":
+            responses = [_error(r.get("id"), -32005, "node is behind") for r in requests]
+        else:
+            responses = [mock.cassette.respond(r, mock.fallback) for r in requests]
+        for r in responses:
+            mock._count(name, "ok" if "result" in r else "rpc_error")
+        self._send_json(responses if isinstance(request, list) else responses[0])
+
+    def _send_json(self, obj: Any) -> None:
+        self._send(200, json.dumps(obj).encode(), "application/json")
+
+    def _send(self, status: int, data: bytes, ctype: str = "text/plain") -> None:
+        if status != 200:
+            self.server.mock._count(self.path.strip("/") or "default", f"http_{status}")
+        self.send_response(status)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256  # the default of 5 stalls concurrent load tests on SYN retries
+    mock: "MockRpcServer"
+
+
+class MockRpcServer:
+    """Local JSON-RPC server replaying a cassette on simulated endpoints.
+
+    Each name in ``endpoints`` is served at ``http://127.0.0.1:<port>/<name>``
+    with its ``EndpointProfile``. ``fallback`` maps methods to results for
+    calls missing from the cassette. Per-endpoint outcome counts are kept in
+    ``stats``. Use as a context manager or call ``start``/``stop``.
+    """
+
+    def __init__(
+        self,
+        cassette: Union[str, Path, Cassette, None] = None,
+        endpoints: Optional[Dict[str, EndpointProfile]] = None,
+        fallback: Optional[Dict[str, Any]] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: int = 0,
+    ) -> None:
+        if cassette is None or isinstance(cassette, Cassette):
+            self.cassette = cassette or Cassette()
+        else:
+            self.cassette = Cassette.load(cassette)
+        self.endpoints = endpoints or {"default": EndpointProfile()}
+        self.fallback = fallback
+        self.stats: Dict[str, Dict[str, int]] = {name: {} for name in self.endpoints}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = _Server((host, port), _Handler)
+        self._server.mock = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def urls(self) -> List[str]:
+        host, port = self._server.server_address[:2]
+        return [f"http://{host}:{port}/{name}" for name in self.endpoints]
+
+    def url(self, name: str) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/{name}"
+
+    def _draw(self, name: str, profile: EndpointProfile) -> Tuple[str, float]:
+        with self._lock:
+            delay = max(0.0, self._rng.gauss(profile.latency_ms, profile.jitter_ms)) / 1000
+            roll = self._rng.random()
+        for outcome, rate in (
+            ("drop", profile.drop_rate),
+            ("http_error", profile.error_rate),
+            ("rpc_error", profile.rpc_error_rate),
+        ):
+            if roll < rate:
+                if outcome == "drop":
+                    self._count(name, "dropped")
+                return outcome, delay
+            roll -= rate
+        return "ok", delay
+
+    def _count(self, name: str, outcome: str) -> None:
+        with self._lock:
+            counts = self.stats.setdefault(name, {})
+            counts[outcome] = counts.get(outcome, 0) + 1
+
+    def start(self) -> "MockRpcServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "MockRpcServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+
+def load_test(
+    endpoints: List[str],
+    method: str = "getSlot",
+    params: Optional[List[Any]] = None,
+    requests: int = 1000,
+    concurrency: int = 16,
+) -> Dict[str, Any]:
+    """Issue ``requests`` concurrent ``rpc_call``s and summarise the results.
+
+    Each call fails over across ``endpoints`` exactly like production code.
+    ``served_by`` counts, per entry of ``endpoints``, the calls it answered
+    with a result; calls that exhausted every endpoint are ``failed``.
+    """
+    served = [0] * len(endpoints)
+    lock = threading.Lock()
+    inner = solana_rpc.set_transport(None)
+
+    def tracking(url: str, payload: bytes, timeout: float = 10) -> Any:
+        data = inner(url, payload, timeout)
+        if isinstance(data, dict) and "result" in data:
+            with lock:
+                served[endpoints.index(url)] += 1
+        return data
+
+    def one(_: int) -> float:
+        start = time.perf_counter()
+        solana_rpc.rpc_call(method, params, endpoints)
+        return time.perf_counter() - start
+
+    solana_rpc.set_transport(tracking)
+    started = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(concurrency) as pool:
+            latencies = sorted(pool.map(one, range(requests)))
+    finally:
+        solana_rpc.set_transport(inner)
+    elapsed = time.perf_counter() - started
+
+    ok = sum(served)
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "seconds": elapsed,
+        "requests_per_second": requests / elapsed if elapsed else float("inf"),
+        "succeeded": ok,
+        "failed": requests - ok,
+        "served_by": served,
+        "latency_p50_ms": percentile(latencies, 0.5) * 1000,
+        "latency_p90_ms": percentile(latencies, 0.9) * 1000,
+        "latency_p99_ms": percentile(latencies, 0.99) * 1000,
+    }
@@ -0,0 +1,443 @@
+"""Event-driven tick-level simulator for sniping new AMM pools.
+
+Replays a time-ordered event log (pool creations, market trades and our own
+orders) from disk in fixed-size chunks, so memory stays bounded however long
+the replay is. Each of our orders is delayed by a configurable latency model
+(network + RPC + inclusion) and filled against a constant-product pool, so the
+fill price reflects both the market flow that landed before us and our own
+size. The report contains every fill, slippage against the price seen at
+decision time, and realised/unrealised PnL.
+
+Event log format
+----------------
+A flat file of ``event_dtype()`` records (29 bytes each) sorted by ``ts``
+(microseconds):
+
+* ``POOL_CREATE``: ``amount`` = initial quote reserve, ``reserve`` = initial
+  base reserve.
+* ``TRADE``: ``amount`` = change of the pool's quote reserve caused by a
+  market swap (positive for buys, negative for sells), as read from swap logs.
+* ``BUY``: ``amount`` = quote to spend.
+* ``SELL``: ``amount`` = base to sell, or 0 to sell the whole position.
+
+Because market trades are described by their quote-reserve delta and swap
+fees are paid outside the reserves, a pool's quote reserve at any time is its
+starting reserve plus a running sum of deltas. Market flow is therefore
+accumulated with vectorized NumPy cumsums per chunk and only our own (rare)
+orders are walked in Python, which keeps replay in the millions of events per
+second on one core.
+"""
+
+import heapq
+import math
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from ._lazy import require
+from .instrumentation import percentile, timed
+
+POOL_CREATE, TRADE, BUY, SELL = 0, 1, 2, 3
+
+# Order identities: (_SNIPE, pool), (_LOGGED, event index), (_EXIT, *buy key).
+_SNIPE, _LOGGED, _EXIT = 0, 1, 2
+OrderKey = Tuple[int, ...]
+
+_EVENT_FIELDS = [("ts", "<i8"), ("kind", "u1"), ("pool", "<u4"), ("amount", "<f8"), ("reserve", "<f8")]
+
+
+def event_dtype():
+    """Packed structured dtype of one event record."""
+    return require("numpy", "the sniping simulator").dtype(_EVENT_FIELDS)
+
+
+def write_events(path: str, events: Any, append: bool = False) -> int:
+    """Write events (structured array or ``(ts, kind, pool, amount, reserve)``
+    tuples) to ``path`` and return the number written."""
+    np = require("numpy", "the sniping simulator")
+    arr = events if isinstance(events, np.ndarray) else np.array(list(events), dtype=event_dtype())
+    with open(path, "ab" if append else "wb") as f:
+        arr.astype(event_dtype(), copy=False).tofile(f)
+    return len(arr)
+
+
+def read_event_chunks(path: str, chunk_events: int = 1 << 20) -> Iterator[Any]:
+    """Yield consecutive views of at most ``chunk_events`` records.
+
+    The file is memory-mapped, so only the pages of the current chunk are
+    resident and the OS can drop them once the chunk is consumed.
+    """
+    np = require("numpy", "the sniping simulator")
+    mm = np.memmap(path, dtype=event_dtype(), mode="r")
+    for lo in range(0, len(mm), chunk_events):
+        yield mm[lo : lo + chunk_events]
+
+
+class LatencyModel:
+    """Sum of independent latency components, sampled in microseconds.
+
+    Each component is ``(distribution, params)``:
+
+    * ``("fixed", {"ms": 5})``
+    * ``("normal", {"mean_ms": 20, "std_ms": 5})`` (truncated at 0)
+    * ``("lognormal", {"median_ms": 40, "sigma": 0.5})``
+    * ``("empirical", {"samples_ms": [...]})`` resampled with replacement
+    * ``("slot", {"ms": 400})`` waits for the next slot boundary, modelling
+      block inclusion
+
+    ``drop_rate`` is the probability an order is never included.
+    """
+
+    def __init__(
+        self, components: Optional[Sequence[Tuple[str, Dict[str, Any]]]] = None, drop_rate: float = 0.0
+    ) -> None:
+        self.components = list(
+            components
+            if components is not None
+            else [("lognormal", {"median_ms": 30.0, "sigma": 0.6}), ("lognormal", {"median_ms": 15.0, "sigma": 0.4})]
+        )
+        self.drop_rate = drop_rate
+
+    def sample(self, rng: Any, ts: Any) -> Any:
+        """Return landing times (µs) for decisions at ``ts``; dropped orders get -1."""
+        np = require("numpy", "the sniping simulator")
+        ts = np.asarray(ts, dtype=np.int64)
+        n = len(ts)
+        delay = np.zeros(n)
+        slot_ms = None
+        for dist, p in self.components:
+            if dist == "fixed":
+                delay += p["ms"]
+            elif dist == "normal":
+                delay += np.maximum(rng.normal(p["mean_ms"], p["std_ms"], n), 0.0)
+            elif dist == "lognormal":
+                delay += rng.lognormal(math.log(p["median_ms"]), p["sigma"], n)
+            elif dist == "empirical":
+                delay += rng.choice(np.asarray(p["samples_ms"], dtype=float), n)
+            elif dist == "slot":
+                slot_ms = p["ms"]
+            else:
+                raise ValueError(f"unknown latency distribution {dist!r}")
+        land = ts + (delay * 1000).astype(np.int64)
+        if slot_ms:
+            slot_us = int(slot_ms * 1000)
+            land = (land // slot_us + 1) * slot_us
+        if self.drop_rate:
+            land[rng.random(n) < self.drop_rate] = -1
+        return land
+
+
+class SnipeSimulator:
+    """Replay events and simulate our orders against constant-product pools.
+
+    Orders come from ``BUY``/``SELL`` records in the log and, when
+    ``snipe_quote`` is set, from an automatic strategy that buys
+    ``snipe_quote`` of every new pool ``decision_delay_ms`` after its creation
+    and sells the whole position ``hold_ms`` after the buy lands.
+
+    Every order samples its latency from its own random stream, seeded by
+    ``seed`` and the order's identity (log position, pool, or the buy it
+    exits), so results do not depend on how the log is chunked.
+    """
+
+    def __init__(
+        self,
+        latency: Optional[LatencyModel] = None,
+        fee: float = 0.0025,
+        snipe_quote: Optional[float] = None,
+        decision_delay_ms: float = 0.0,
+        hold_ms: Optional[float] = None,
+        seed: int = 0,
+    ) -> None:
+        np = require("numpy", "the sniping simulator")
+        self.latency = latency or LatencyModel()
+        self.fee = fee
+        self.snipe_quote = snipe_quote
+        self.decision_delay_us = int(decision_delay_ms * 1000)
+        self.hold_us = None if hold_ms is None else int(hold_ms * 1000)
+        self.seed = seed
+        self.quote = np.zeros(0)  # quote reserve per pool at the current chunk start
+        self.k = np.zeros(0)  # constant product per pool
+        self.positions: Dict[int, List[float]] = {}  # pool -> [base held, quote spent, quote received]
+        self.fills: List[Dict[str, Any]] = []
+        # (decided, key, land, pool, kind, amount): orders not yet decided.
+        self._decisions: List[Tuple[int, OrderKey, int, int, int, float]] = []
+        # (land, key, decided, pool, kind, amount, quote reserve at decision).
+        self._pending: List[Tuple[int, OrderKey, int, int, int, float, float]] = []
+        self.events = 0
+
+    # -- state helpers ------------------------------------------------------
+    def _grow(self, max_pool: int) -> None:
+        np = require("numpy", "the sniping simulator")
+        if max_pool >= len(self.quote):
+            size = max(max_pool + 1, 2 * len(self.quote))
+            self.quote = np.concatenate([self.quote, np.zeros(size - len(self.quote))])
+            self.k = np.concatenate([self.k, np.zeros(size - len(self.k))])
+
+    def _schedule(
+        self, kind: int, decided: Sequence[int], pools: Sequence[int], amounts: Sequence[float],
+        keys: Sequence[OrderKey],
+    ) -> None:
+        np = require("numpy", "the sniping simulator")
+        for d, p, a, key in zip(decided, pools, amounts, keys):
+            d, p, a = int(d), int(p), float(a)
+            land = int(self.latency.sample(np.random.default_rng([self.seed, *key]), [d])[0])
+            if land < 0:
+                self.fills.append({"pool": p, "kind": kind, "decided_us": d, "status": "dropped"})
+                continue
+            # ``key`` is unique and chunk-independent, so it also breaks ties.
+            heapq.heappush(self._decisions, (d, key, land, p, kind, a))
+
+    def _advance(self, flow: "_Flow", impact: Dict[int, float], until: Optional[int]) -> None:
+        """Decide and fill queued orders in time order up to ``until`` (all if None).
+
+        The quote reserve seen at decision time is captured when the decision
+        is reached, so it includes market flow and our own fills up to then
+        regardless of where chunk boundaries fall.
+        """
+        decisions, pending = self._decisions, self._pending
+        while True:
+            d = decisions[0][0] if decisions else None
+            l = pending[0][0] if pending else None
+            if l is not None and (d is None or l <= d) and (until is None or l <= until):
+                land, key, decided, p, kind, amt, q_decided = heapq.heappop(pending)
+                self._fill(flow, impact, land, key, decided, p, kind, amt, q_decided)
+            elif d is not None and (until is None or d <= until):
+                decided, key, land, p, kind, amt = heapq.heappop(decisions)
+                q_decided = float(self.quote[p]) + impact.get(p, 0.0) + flow.upto(p, decided)
+                heapq.heappush(pending, (land, key, decided, p, kind, amt, q_decided))
+            else:
+                return
+
+    # -- replay -------------------------------------------------------------
+    @timed("snipe_replay_seconds")
+    def run(self, chunks: Iterable[Any]) -> Dict[str, Any]:
+        """Replay ``chunks`` of events (e.g. ``read_event_chunks(path)``)."""
+        np = require("numpy", "the sniping simulator")
+        started = time.perf_counter()
+        last_ts = 0
+        for chunk in chunks:
+            if not len(chunk):
+                continue
+            offset = self.events
+            self.events += len(chunk)
+            ts = np.asarray(chunk["ts"])
+            kind = np.asarray(chunk["kind"])
+            pool = np.asarray(chunk["pool"]).astype(np.int64)
+            amount = np.asarray(chunk["amount"])
+            self._grow(int(pool.max()))
+            chunk_end = int(ts[-1])
+            last_ts = chunk_end
+
+            creates = kind == POOL_CREATE
+            if creates.any():
+                self.k[pool[creates]] = amount[creates] * np.asarray(chunk["reserve"])[creates]
+                if self.snipe_quote:
+                    new = pool[creates].tolist()
+                    self._schedule(
+                        BUY, (ts[creates] + self.decision_delay_us).tolist(), new,
+                        [self.snipe_quote] * len(new), [(_SNIPE, p) for p in new],
+                    )
+            for order_kind in (BUY, SELL):
+                mine = np.flatnonzero(kind == order_kind)
+                if len(mine):
+                    self._schedule(
+                        order_kind, ts[mine].tolist(), pool[mine].tolist(), amount[mine].tolist(),
+                        [(_LOGGED, offset + i) for i in mine.tolist()],
+                    )
+
+            # Market flow: creations seed the quote reserve, trades move it.
+            market = kind <= TRADE
+            m_pool = pool[market]
+            m_ts = ts[market]
+            m_dq = amount[market]
+            order = np.argsort(m_pool, kind="stable")
+            flow = _Flow(np, m_pool[order], m_ts[order], m_dq[order])
+            impact: Dict[int, float] = {}
+            self._advance(flow, impact, chunk_end)
+
+            self.quote += np.bincount(m_pool, weights=m_dq, minlength=len(self.quote))
+            for p, dq in impact.items():
+                self.quote[p] += dq
+
+        # Orders landing after the last event see the final pool state.
+        flow = _Flow(np, np.zeros(0, np.int64), np.zeros(0, np.int64), np.zeros(0))
+        impact = {}
+        self._advance(flow, impact, None)
+        for p, dq in impact.items():
+            self.quote[p] += dq
+        elapsed = time.perf_counter() - started
+        return self.report(elapsed, last_ts)
+
+    def _fill(
+        self,
+        flow: "_Flow",
+        impact: Dict[int, float],
+        land: int,
+        key: OrderKey,
+        decided: int,
+        p: int,
+        kind: int,
+        amt: float,
+        q_decided: float,
+    ) -> None:
+        q = float(self.quote[p]) + impact.get(p, 0.0) + flow.upto(p, land)
+        k = float(self.k[p])
+        record = {"pool": p, "kind": kind, "decided_us": decided, "landed_us": land, "latency_us": land - decided}
+        if q <= 0 or k <= 0:
+            record["status"] = "no_pool"
+            self.fills.append(record)
+            return
+        pos = self.positions.setdefault(p, [0.0, 0.0, 0.0])
+        spot_decided = q_decided * q_decided / k if q_decided > 0 else float("nan")
+        b = k / q
+        if kind == BUY:
+            dq = amt * (1 - self.fee)
+            base_out = b - k / (q + dq)
+            pos[0] += base_out
+            pos[1] += amt
+            impact[p] = impact.get(p, 0.0) + dq
+            price = amt / base_out
+            record.update(quote=amt, base=base_out)
+            if self.hold_us is not None:
+                self._schedule(SELL, [land + self.hold_us], [p], [base_out], [(_EXIT, *key)])
+        else:
+            size = pos[0] if amt == 0 else min(amt, pos[0])
+            if size <= 0:
+                record["status"] = "no_position"
+                self.fills.append(record)
+                return
+            quote_out = q - k / (b + size * (1 - self.fee))
+            pos[0] -= size
+            pos[2] += quote_out
+            impact[p] = impact.get(p, 0.0) - quote_out
+            price = quote_out / size
+            record.update(quote=quote_out, base=size)
+        record.update(
+            status="filled",
+            price=price,
+            decision_price=spot_decided,
+            slippage_bps=(price / spot_decided - 1) * 1e4 * (1 if kind == BUY else -1),
+        )
+        self.fills.append(record)
+
+    def report(self, elapsed: float = 0.0, last_ts: int = 0) -> Dict[str, Any]:
+        """Summarise fills and PnL; open positions are marked at liquidation value."""
+        realised = 0.0
+        unrealised = 0.0
+        spent = 0.0
+        for p, (base, cost, received) in self.positions.items():
+            spent += cost
+            realised += received
+            q, k = float(self.quote[p]), float(self.k[p])
+            if base > 0 and q > 0 and k > 0:
+                unrealised += q - k / (k / q + base * (1 - self.fee))
+        filled = [f for f in self.fills if f["status"] == "filled"]
+        latencies = sorted(f["latency_us"] for f in filled)
+        slippage = sorted(f["slippage_bps"] for f in filled if f["kind"] == BUY)
+        return {
+            "events": self.events,
+            "seconds": elapsed,
+            "events_per_second": self.events / elapsed if elapsed else float("inf"),
+            "orders": len(self.fills),
+            "filled": len(filled),
+            "failed": len(self.fills) - len(filled),
+            "quote_spent": spent,
+            "quote_received": realised,
+            "open_value": unrealised,
+            "pnl": realised + unrealised - spent,
+            "latency_p50_ms": percentile(latencies, 0.5) / 1000,
+            "latency_p99_ms": percentile(latencies, 0.99) / 1000,
+            "buy_slippage_p50_bps": percentile(slippage, 0.5),
+            "buy_slippage_p99_bps": percentile(slippage, 0.99),
+            "last_event_us": last_ts,
+        }
+
+
+class _Flow:
+    """Per-pool cumulative market flow of one chunk, sorted by (pool, ts)."""
+
+    __slots__ = ("np", "pools", "ts", "cum")
+
+    def __init__(self, np: Any, pools: Any, ts: Any, dq: Any) -> None:
+        self.np = np
+        self.pools = pools
+        self.ts = ts
+        self.cum = np.cumsum(dq)
+
+    def upto(self, pool: int, t: int) -> float:
+        """Sum of ``pool``'s flow with timestamp <= ``t`` in this chunk."""
+        ss = self.np.searchsorted
+        lo = int(ss(self.pools, pool, "left"))
+        hi = int(ss(self.pools, pool, "right"))
+        if lo == hi:
+            return 0.0
+        j = lo + int(ss(self.ts[lo:hi], t, "right"))
+        if j == lo:
+            return 0.0
+        before = float(self.cum[lo - 1]) if lo else 0.0
+        return float(self.cum[j - 1]) - before
+
+
+def generate_events(
+    path: str,
+    n_events: int,
+    create_prob: float = 0.001,
+    initial_quote: float = 100.0,
+    initial_base: float = 1_000_000_000.0,
+    trade_quote: float = 0.5,
+    block: int = 1 << 20,
+    seed: int = 0,
+) -> int:
+    """Write a deterministic synthetic event log for replay benchmarks.
+
+    Events arrive every ~1 ms; a fraction ``create_prob`` create pools and the
+    rest trade mostly on recently created pools, with a small buy bias.
+    Returns the number of pools created.
+    """
+    np = require("numpy", "the sniping simulator")
+    rng = np.random.default_rng(seed)
+    dtype = event_dtype()
+    t = 1_700_000_000_000_000
+    pools = 0
+    written = 0
+    with open(path, "wb") as f:
+        while written < n_events:
+            n = min(block, n_events - written)
+            ev = np.zeros(n, dtype=dtype)
+            ts = t + np.cumsum(rng.exponential(1000.0, n)).astype(np.int64)
+            creates = rng.random(n) < create_prob
+            if pools == 0:
+                creates[0] = True
+            created_before = pools + np.cumsum(creates) - creates
+            new_ids = pools + np.cumsum(creates) - 1
+            # Trades favour young pools, the part of the market snipers care about.
+            back = np.minimum(rng.geometric(0.05, n) - 1, np.maximum(created_before - 1, 0))
+            ev["ts"] = ts
+            ev["kind"] = np.where(creates, POOL_CREATE, TRADE)
+            ev["pool"] = np.where(creates, new_ids, created_before - 1 - back)
+            ev["amount"] = np.where(creates, initial_quote, rng.normal(trade_quote * 0.1, trade_quote, n))
+            ev["reserve"] = np.where(creates, initial_base, 0.0)
+            ev.tofile(f)
+            pools += int(creates.sum())
+            t = int(ts[-1])
+            written += n
+    return pools
+
+
+def benchmark_replay(n_events: int = 5_000_000, path: Optional[str] = None, **sim_kwargs: Any) -> Dict[str, Any]:
+    """Generate ``n_events`` synthetic events, replay them and report throughput."""
+    import os
+    import tempfile
+
+    own = path is None
+    if own:
+        fd, path = tempfile.mkstemp(suffix=".events")
+        os.close(fd)
+    try:
+        generate_events(path, n_events)
+        sim_kwargs.setdefault("snipe_quote", 1.0)
+        sim_kwargs.setdefault("hold_ms", 30_000)
+        return SnipeSimulator(**sim_kwargs).run(read_event_chunks(path))
+    finally:
+        if own:
+            os.remove(path)
@@ -1,8 +1,10 @@
 import os
 import json
-from typing import Any, List, Optional
+from typing import Any, Callable, List, Optional, Tuple
 from urllib.request import Request, urlopen
 
+from .instrumentation import endpoint_label, incr, timed
+
 # Default public RPC endpoints that do not require API keys
 DEFAULT_ENDPOINTS = [
     "https://api.mainnet-beta.solana.com",
@@ -11,8 +13,42 @@ DEFAULT_ENDPOINTS = [
 ]
 
 
+Transport = Callable[[str, bytes, float], Any]
+
+
+def http_post(url: str, payload: bytes, timeout: float = 10) -> Any:
+    """POST a JSON-RPC payload and return the decoded JSON response."""
+    req = Request(url, data=payload, headers={"Content-Type": "application/json"})
+    with urlopen(req, timeout=timeout) as resp:
+        return json.load(resp)
+
+
+_transport: Transport = http_post
+
+
+def set_transport(transport: Optional[Transport] = None) -> Transport:
+    """Route ``rpc_call`` through ``transport`` (``None`` restores HTTP).
+
+    A transport is called as ``transport(url, payload, timeout)`` and returns
+    the decoded response or raises to fail over to the next endpoint; the
+    record/replay helpers in ``rpc_harness`` are transports. Returns the
+    previously installed transport.
+    """
+    global _transport
+    previous = _transport
+    _transport = transport or http_post
+    return previous
+
+
 def _build_endpoints() -> List[str]:
-    """Collect RPC endpoints from environment variables with public fallbacks."""
+    """Collect RPC endpoints from environment variables with public fallbacks.
+
+    ``RPC_ENDPOINTS`` (comma-separated) replaces the whole list, e.g. to point
+    every caller at a local mock server.
+    """
+    override = os.getenv("RPC_ENDPOINTS")
+    if override:
+        return [u.strip() for u in override.split(",") if u.strip()]
     endpoints: List[str] = []
     helius = os.getenv("HELIUS_RPC")
     if helius:
@@ -38,17 +74,58 @@ def rpc_call(method: str, params: Optional[List[Any]] = None, endpoints: Optiona
         params = []
     urls = endpoints or _build_endpoints()
     payload = json.dumps({"jsonrpc": "2.0", "id": 1, "method": method, "params": params}).encode()
-    headers = {"Content-Type": "application/json"}
     for url in urls:
+        label = endpoint_label(url)
         try:
-            req = Request(url, data=payload, headers=headers)
-            with urlopen(req, timeout=10) as resp:
-                data = json.load(resp)
+            with timed("rpc_attempt_seconds", endpoint=label, method=method):
+                data = _transport(url, payload, 10)
             if "result" in data:
+                incr("rpc_attempts", endpoint=label, method=method, outcome="ok")
                 return data["result"]
+            incr("rpc_attempts", endpoint=label, method=method, outcome="no_result")
         except Exception:
+            incr("rpc_attempts", endpoint=label, method=method, outcome="error")
             continue
+    incr("rpc_offline_fallbacks", method=method)
     # Offline fallbacks for a couple of common methods
     if method in {"getSlot", "getBlockHeight", "getBalance"}:
         return 0
     return None
+
+
+def rpc_batch(
+    calls: List[Tuple[str, List[Any]]], endpoints: Optional[List[str]] = None
+) -> List[Any]:
+    """Send several JSON-RPC calls in one HTTP request (a JSON-RPC batch).
+
+    Fails over across endpoints like ``rpc_call`` as long as the endpoint
+    answers none of the calls. Returns one result per call in order; calls
+    that errored individually, or all calls when every endpoint failed, are
+    ``None``.
+    """
+    if not calls:
+        return []
+    urls = endpoints or _build_endpoints()
+    payload = json.dumps(
+        [{"jsonrpc": "2.0", "id": i, "method": m, "params": p} for i, (m, p) in enumerate(calls)]
+    ).encode()
+    for url in urls:
+        label = endpoint_label(url)
+        try:
+            with timed("rpc_attempt_seconds", endpoint=label, method="batch"):
+                data = _transport(url, payload, 10)
+            results: List[Any] = [None] * len(calls)
+            answered = 0
+            for item in data if isinstance(data, list) else []:
+                if "result" in item and isinstance(item.get("id"), int) and 0 <= item["id"] < len(calls):
+                    results[item["id"]] = item["result"]
+                    answered += 1
+            if answered:
+                incr("rpc_attempts", endpoint=label, method="batch", outcome="ok")
+                return results
+            incr("rpc_attempts", endpoint=label, method="batch", outcome="no_result")
+        except Exception:
+            incr("rpc_attempts", endpoint=label, method="batch", outcome="error")
+            continue
+    incr("rpc_offline_fallbacks", method="batch")
+    return [None] * len(calls)
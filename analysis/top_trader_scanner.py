@@ -8,7 +8,9 @@ structured so that real RPC calls could be dropped in later.
 
 from typing import Any, Dict, List
 
+from .records import SymbolTable, WalletTxRecords
 from .wallet_analysis import (
+    History,
     fetch_wallet_history,
     wallet_performance,
     detect_repeating_patterns,
@@ -16,7 +18,7 @@ from .wallet_analysis import (
 from .trend_detection import extract_trending_tokens
 
 
-def analyze_top_traders(wallets: List[str], offline: bool = True) -> Dict[str, Any]:
+def analyze_top_traders(wallets: List[str], offline: bool = True, compact: bool = False) -> Dict[str, Any]:
     """Collect stats and repeating patterns for a list of wallets.
 
     Parameters
@@ -26,6 +28,8 @@ def analyze_top_traders(wallets: List[str], offline: bool = True) -> Dict[str, A
     offline : bool, optional
         When True, relies on deterministic sample data so the module works
         without network access.
+    compact : bool, optional
+        Return histories as ``WalletTxRecords`` sharing one symbol table.
 
     Returns
     -------
@@ -34,21 +38,27 @@ def analyze_top_traders(wallets: List[str], offline: bool = True) -> Dict[str, A
         token patterns.
     """
 
-    histories = {w: fetch_wallet_history(w, offline=offline) for w in wallets}
+    symbols = SymbolTable() if compact else None
+    histories = {
+        w: fetch_wallet_history(w, offline=offline, compact=compact, symbols=symbols) for w in wallets
+    }
     performance = {w: wallet_performance(h) for w, h in histories.items()}
     patterns = {w: detect_repeating_patterns(h) for w, h in histories.items()}
     return {"histories": histories, "performance": performance, "patterns": patterns}
 
 
-def mimic_strategy(trader_history: List[Dict[str, Any]]) -> Dict[str, Any]:
+def mimic_strategy(trader_history: History) -> Dict[str, Any]:
     """Propose a simple action based on a trader's dominant token activity."""
 
     totals: Dict[str, float] = {}
-    for tx in trader_history:
-        token = tx.get("token")
-        amt = tx.get("amount", 0)
-        if token:
-            totals[token] = totals.get(token, 0.0) + amt
+    if isinstance(trader_history, WalletTxRecords):
+        totals = trader_history.token_totals("amount")
+    else:
+        for tx in trader_history:
+            token = tx.get("token")
+            amt = tx.get("amount", 0)
+            if token:
+                totals[token] = totals.get(token, 0.0) + amt
     if not totals:
         return {}
     # Choose token with the highest absolute net flow
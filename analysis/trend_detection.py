@@ -1,14 +1,230 @@
 """Detect trending tokens or topics from social posts."""
 
+import heapq
+import math
+import random
 import re
-from typing import List, Dict
+import time
+from array import array
+from typing import List, Dict, Optional, Tuple
+
+_TICKER_RE = re.compile(r"[A-Z]{2,}")
+_MERSENNE_61 = (1 << 61) - 1
 
 
 def extract_trending_tokens(posts: List[Dict[str, str]], top_n: int = 5) -> List[str]:
     """Return top mentioned tokens across posts."""
     counts: Dict[str, int] = {}
+    findall = _TICKER_RE.findall
     for p in posts:
-        for token in re.findall(r"[A-Z]{2,}", p.get("text", "")):
+        for token in findall(p.get("text") or ""):
             counts[token] = counts.get(token, 0) + 1
-    return sorted(counts, key=counts.get, reverse=True)[:top_n]
+    return heapq.nlargest(top_n, counts, key=counts.get)
+
+
+class _Entry:
+    """Monitored token in the Space-Saving table."""
+
+    __slots__ = ("token", "slow", "fast", "error", "buckets")
+
+    def __init__(self, token: str, slow: float, fast: float, error: float, n_buckets: int) -> None:
+        self.token = token
+        self.slow = slow
+        self.fast = fast
+        self.error = error
+        # ring of (bucket id, mentions) used for "last X minutes" queries
+        self.buckets = [(-1, 0)] * n_buckets
+
+
+class TrendTracker:
+    """Streaming heavy-hitter tracker for ticker mentions with time decay.
+
+    Mentions are folded into a Count-Min sketch and a Space-Saving table of at
+    most ``capacity`` tokens, so memory is bounded no matter how many distinct
+    tickers appear. Counts decay exponentially with ``half_life`` seconds
+    (forward decay: weights grow with time instead of decaying every counter,
+    and everything is rescaled when the weights get large).
+
+    A second, faster decay with ``fast_half_life`` tracks the short-term
+    mention rate; ``accelerating`` compares the two rates to flag spikes.
+    Each monitored token also keeps a small ring of per-``bucket_seconds``
+    counts covering ``horizon_seconds`` for "top N in the last X minutes".
+    """
+
+    def __init__(
+        self,
+        capacity: int = 100,
+        half_life: float = 900.0,
+        fast_half_life: float = 60.0,
+        bucket_seconds: float = 60.0,
+        horizon_seconds: float = 3600.0,
+        width: int = 2048,
+        depth: int = 4,
+    ) -> None:
+        if capacity < 1:
+            raise ValueError(f"capacity must be at least 1, got {capacity}")
+        self.capacity = capacity
+        self.bucket_seconds = bucket_seconds
+        self.n_buckets = max(1, int(math.ceil(horizon_seconds / bucket_seconds)))
+        self.width = width
+        self.depth = depth
+        self._slow_rate = math.log(2) / half_life
+        self._fast_rate = math.log(2) / fast_half_life
+        self._landmark: Optional[float] = None
+        self._now = 0.0
+        self._sketch = [array("d", bytes(8 * width)) for _ in range(depth)]
+        # Carter-Wegman (a*h + b) mod p hashes give independent rows.
+        rng = random.Random(0x5EED)
+        self._hash_params = [
+            (rng.randrange(1, _MERSENNE_61), rng.randrange(_MERSENNE_61)) for _ in range(depth)
+        ]
+        self._entries: Dict[str, _Entry] = {}
+        self._heap: List[Tuple[float, str]] = []
+
+    # -- internals -------------------------------------------------------
+    def _rescale(self, ts: float) -> None:
+        shift = ts - self._landmark
+        slow = math.exp(-self._slow_rate * shift)
+        fast = math.exp(-self._fast_rate * shift)
+        for row in self._sketch:
+            for i in range(self.width):
+                row[i] *= slow
+        for e in self._entries.values():
+            e.slow *= slow
+            e.fast *= fast
+            e.error *= slow
+        self._heap = [(e.slow, e.token) for e in self._entries.values()]
+        heapq.heapify(self._heap)
+        self._landmark = ts
+
+    def _indices(self, token: str) -> List[int]:
+        h = hash(token)
+        return [((a * h + b) % _MERSENNE_61) % self.width for a, b in self._hash_params]
+
+    def _sketch_add(self, token: str, weight: float) -> float:
+        est = float("inf")
+        for row, i in zip(self._sketch, self._indices(token)):
+            row[i] += weight
+            if row[i] < est:
+                est = row[i]
+        return est
+
+    def _min_entry(self) -> _Entry:
+        # Lazy heap: stale tuples are skipped until the top matches the entry.
+        while True:
+            value, token = self._heap[0]
+            e = self._entries.get(token)
+            if e is not None and e.slow == value:
+                return e
+            heapq.heappop(self._heap)
+
+    # -- public API ------------------------------------------------------
+    def update(self, token: str, ts: Optional[float] = None, count: int = 1) -> None:
+        """Record ``count`` mentions of ``token`` at unix time ``ts``."""
+        ts = time.time() if ts is None else ts
+        if self._landmark is None:
+            self._landmark = ts
+        if ts > self._now:
+            self._now = ts
+        # Keep exp() in range; 200 half-lives of forward weight is plenty.
+        if self._fast_rate * (ts - self._landmark) > 200:
+            self._rescale(ts)
+        age = ts - self._landmark
+        slow_w = count * math.exp(self._slow_rate * age)
+        fast_w = count * math.exp(self._fast_rate * age)
+        est = self._sketch_add(token, slow_w)
+
+        e = self._entries.get(token)
+        if e is None:
+            if len(self._entries) >= self.capacity:
+                victim = self._min_entry()
+                if victim.slow >= est:
+                    return
+                heapq.heappop(self._heap)
+                del self._entries[victim.token]
+            # Seed from the sketch so a late-arriving heavy hitter is not
+            # undercounted; the excess over this update is the error bound.
+            e = _Entry(token, est, fast_w, est - slow_w, self.n_buckets)
+            self._entries[token] = e
+        else:
+            e.slow += slow_w
+            e.fast += fast_w
+        bucket = int(ts // self.bucket_seconds)
+        slot = bucket % self.n_buckets
+        bid, n = e.buckets[slot]
+        e.buckets[slot] = (bucket, n + count if bid == bucket else count)
+        heapq.heappush(self._heap, (e.slow, token))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(x.slow, x.token) for x in self._entries.values()]
+            heapq.heapify(self._heap)
+
+    def update_posts(self, posts: List[Dict[str, str]], ts: Optional[float] = None) -> None:
+        """Extract tickers from posts and record them.
+
+        A post's own ``timestamp`` (unix seconds) is used when present.
+        """
+        findall = _TICKER_RE.findall
+        for p in posts:
+            post_ts = p.get("timestamp", ts)
+            for token in findall(p.get("text") or ""):
+                self.update(token, post_ts)
+
+    def _decay_now(self, rate: float, now: Optional[float]) -> float:
+        now = self._now if now is None else now
+        return math.exp(-rate * (now - self._landmark)) if self._landmark is not None else 0.0
+
+    def score(self, token: str, now: Optional[float] = None) -> float:
+        """Decayed mention count for ``token`` (sketch estimate if unmonitored)."""
+        e = self._entries.get(token)
+        if e is not None:
+            value = e.slow
+        elif self._landmark is None:
+            return 0.0
+        else:
+            value = min(row[i] for row, i in zip(self._sketch, self._indices(token)))
+        return value * self._decay_now(self._slow_rate, now)
+
+    def top(
+        self, n: int = 5, window: Optional[float] = None, now: Optional[float] = None
+    ) -> List[Tuple[str, float]]:
+        """Return the ``n`` hottest tokens with their scores.
+
+        Without ``window`` tokens are ranked by decayed mention count. With
+        ``window`` seconds (capped at the tracker's horizon) they are ranked
+        by raw mentions in the buckets overlapping the last ``window`` seconds.
+        """
+        if window is None:
+            scale = self._decay_now(self._slow_rate, now)
+            scored = ((e.token, e.slow * scale) for e in self._entries.values())
+        else:
+            now = self._now if now is None else now
+            first = int((now - window) // self.bucket_seconds) + 1
+            last = int(now // self.bucket_seconds)
+            scored = (
+                (e.token, float(sum(c for b, c in e.buckets if first <= b <= last)))
+                for e in self._entries.values()
+            )
+        return heapq.nlargest(n, scored, key=lambda x: x[1])
+
+    def accelerating(
+        self, ratio: float = 2.0, min_score: float = 3.0, now: Optional[float] = None
+    ) -> List[Tuple[str, float]]:
+        """Return tokens whose short-term mention rate spikes above baseline.
 
+        The rate of each decayed counter is ``count * ln2 / half_life``; a
+        token is flagged when its fast rate is at least ``ratio`` times its
+        slow rate and its fast-decayed count is at least ``min_score``.
+        """
+        slow_scale = self._decay_now(self._slow_rate, now) * self._slow_rate
+        fast_decay = self._decay_now(self._fast_rate, now)
+        hits: List[Tuple[str, float]] = []
+        for e in self._entries.values():
+            fast_count = e.fast * fast_decay
+            slow_rate = (e.slow - e.error) * slow_scale
+            if fast_count < min_score or slow_rate <= 0:
+                continue
+            accel = fast_count * self._fast_rate / slow_rate
+            if accel >= ratio:
+                hits.append((e.token, accel))
+        hits.sort(key=lambda x: x[1], reverse=True)
+        return hits
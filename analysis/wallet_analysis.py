@@ -1,20 +1,34 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Union
 
+from .instrumentation import incr, timed
+from .records import SymbolTable, WalletTxRecords
 from .solana_rpc import rpc_call
 
+History = Union[List[Dict[str, Any]], WalletTxRecords]
 
-def fetch_wallet_history(address: str, limit: int = 20, offline: bool = True) -> List[Dict[str, Any]]:
+
+@timed("fetch_wallet_history_seconds")
+def fetch_wallet_history(
+    address: str,
+    limit: int = 20,
+    offline: bool = True,
+    compact: bool = False,
+    symbols: Optional[SymbolTable] = None,
+) -> History:
     """Fetch recent transaction signatures for a wallet address.
 
     When ``offline`` is True, returns a deterministic sample so examples run
     without network access. Otherwise, it queries the Solana RPC using
     ``getSignaturesForAddress`` and falls back to the sample on failure.
+    With ``compact`` the rows are returned as ``WalletTxRecords``, interning
+    tokens into ``symbols`` when given (share one table across wallets).
     """
     params = [address, {"limit": limit}]
     if not offline:
         result = rpc_call("getSignaturesForAddress", params)
         if result:
-            return result
+            return WalletTxRecords.from_dicts(result, symbols) if compact else result
+    incr("wallet_history_samples", offline=offline)
     # Offline sample with token hints for pattern detection
     sample: List[Dict[str, Any]] = []
     tokens = ["OG", "KOL"]
@@ -27,11 +41,13 @@ def fetch_wallet_history(address: str, limit: int = 20, offline: bool = True) ->
                 "amount": (-1) ** i,
             }
         )
-    return sample
+    return WalletTxRecords.from_dicts(sample, symbols) if compact else sample
 
 
-def aggregate_wallet_stats(history: List[Dict[str, Any]]) -> Dict[str, Any]:
+def aggregate_wallet_stats(history: History) -> Dict[str, Any]:
     """Compute simple statistics about wallet activity."""
+    if isinstance(history, WalletTxRecords):
+        return {"tx_count": len(history), "token_counts": history.token_totals()}
     total = len(history)
     token_counts: Dict[str, int] = {}
     for h in history:
@@ -41,8 +57,10 @@ def aggregate_wallet_stats(history: List[Dict[str, Any]]) -> Dict[str, Any]:
     return {"tx_count": total, "token_counts": token_counts}
 
 
-def detect_repeating_patterns(history: List[Dict[str, Any]]) -> List[str]:
+def detect_repeating_patterns(history: History) -> List[str]:
     """Return tokens that appear multiple times as naive repeating patterns."""
+    if isinstance(history, WalletTxRecords):
+        return [t for t, c in history.token_totals().items() if c > 1]
     counts: Dict[str, int] = {}
     for h in history:
         token = h.get("token")
@@ -63,15 +81,19 @@ def scan_addresses_for_patterns(addresses: List[str], reference_tokens: List[str
     return matches
 
 
-def wallet_performance(history: List[Dict[str, Any]]) -> Dict[str, Any]:
+def wallet_performance(history: History) -> Dict[str, Any]:
     """Classify wallet performance by aggregated amount."""
 
-    pnl = sum(h.get("amount", 0) for h in history)
+    if isinstance(history, WalletTxRecords):
+        pnl = sum(history.columns["amount"])
+    else:
+        pnl = sum(h.get("amount", 0) for h in history)
     classification = "top_trader" if pnl > 0 else "loser"
     return {"pnl": pnl, "classification": classification}
 
 
-def rank_wallets(histories: Dict[str, List[Dict[str, Any]]]) -> Dict[str, List[str]]:
+@timed("rank_wallets_seconds")
+def rank_wallets(histories: Dict[str, History]) -> Dict[str, List[str]]:
     """Return top and bottom wallets based on PnL."""
 
     scores = {addr: wallet_performance(h)["pnl"] for addr, h in histories.items()}
@@ -0,0 +1,299 @@
+"""Keep SOL and SPL-token balances of many managed wallets current.
+
+``WalletTracker`` polls our own wallets in the background and publishes an
+immutable ``snapshot()`` with per-wallet balances and aggregate exposure per
+token, so trading logic reads positions without ever waiting on RPC.
+
+Each poll cycle refreshes the wallets that are due:
+
+* SOL balances of up to 100 wallets come from one ``getMultipleAccounts``.
+* Token balances come from ``getTokenAccountsByOwner`` for each wallet, sent
+  together as one JSON-RPC batch (``rpc_batch``).
+
+Polling is adaptive: a wallet whose balances changed is polled again after
+``min_interval`` seconds, and every unchanged poll doubles its interval up to
+``max_interval``, so idle wallets cost little. ``mark_active`` forces an
+immediate repoll, e.g. right after sending a transaction. All requests draw
+from a global token bucket, so the tracker stays within ``max_rps`` calls per
+second (each call inside a batch counts).
+"""
+
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .instrumentation import incr, observe
+from .solana_rpc import rpc_batch, rpc_call
+
+TOKEN_PROGRAM_ID = "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"
+LAMPORTS_PER_SOL = 1_000_000_000
+MAX_ACCOUNTS_PER_CALL = 100
+
+
+class TokenBucket:
+    """Token-bucket rate limiter: ``rate`` tokens per second, up to ``burst``."""
+
+    def __init__(self, rate: float, burst: Optional[float] = None) -> None:
+        self.rate = rate
+        self.burst = burst if burst is not None else rate
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        if now > self.updated:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def available(self, now: Optional[float] = None) -> float:
+        with self._lock:
+            self._refill(time.monotonic() if now is None else now)
+            return self.tokens
+
+    def take(self, n: float, now: Optional[float] = None) -> bool:
+        """Consume ``n`` tokens if available; never blocks."""
+        with self._lock:
+            self._refill(time.monotonic() if now is None else now)
+            if self.tokens >= n:
+                self.tokens -= n
+                return True
+            return False
+
+    def wait_time(self, n: float) -> float:
+        """Seconds until ``n`` tokens are available."""
+        with self._lock:
+            self._refill(time.monotonic())
+            return max(0.0, (n - self.tokens) / self.rate)
+
+
+class _WalletState:
+    __slots__ = ("address", "interval", "due", "polls", "changes")
+
+    def __init__(self, address: str, interval: float, due: float) -> None:
+        self.address = address
+        self.interval = interval
+        self.due = due
+        self.polls = 0
+        self.changes = 0
+
+
+def _token_balances(result: Any) -> Dict[str, float]:
+    balances: Dict[str, float] = {}
+    for item in (result or {}).get("value", []) if isinstance(result, dict) else []:
+        try:
+            info = item["account"]["data"]["parsed"]["info"]
+            amount = info["tokenAmount"]
+            ui = float(amount.get("uiAmountString") or amount.get("uiAmount") or 0)
+        except (KeyError, TypeError, ValueError):
+            continue
+        if ui:
+            balances[info["mint"]] = balances.get(info["mint"], 0.0) + ui
+    return balances
+
+
+class WalletTracker:
+    """Adaptive, rate-limited balance tracker for managed wallets.
+
+    Parameters
+    ----------
+    wallets : Iterable[str]
+        Wallet addresses to track; more can be added with ``add_wallet``.
+    max_rps : float
+        Global RPC budget in calls per second (batched calls count singly).
+        A poll cycle costs at least two calls, so the bucket always holds
+        two tokens at most-full even when ``max_rps`` is below 2.
+    min_interval, max_interval : float
+        Polling interval bounds in seconds for active and idle wallets.
+    max_batch : int
+        Wallets refreshed per cycle at most.
+    """
+
+    def __init__(
+        self,
+        wallets: Iterable[str] = (),
+        endpoints: Optional[List[str]] = None,
+        max_rps: float = 10.0,
+        min_interval: float = 2.0,
+        max_interval: float = 60.0,
+        max_batch: int = MAX_ACCOUNTS_PER_CALL,
+        commitment: str = "confirmed",
+    ) -> None:
+        if max_rps <= 0:
+            raise ValueError("max_rps must be positive")
+        self.endpoints = endpoints
+        self.bucket = TokenBucket(max_rps, burst=max(max_rps, 2.0))
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.max_batch = min(max_batch, MAX_ACCOUNTS_PER_CALL)
+        self.commitment = commitment
+        self._states: Dict[str, _WalletState] = {}
+        self._lock = threading.Lock()
+        self._snapshot: Dict[str, Any] = {"taken_at": 0.0, "wallets": {}, "exposure": {}, "sol_total": 0.0}
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        for w in wallets:
+            self.add_wallet(w)
+
+    # -- wallet set ---------------------------------------------------------
+    def add_wallet(self, address: str) -> None:
+        with self._lock:
+            if address not in self._states:
+                self._states[address] = _WalletState(address, self.min_interval, 0.0)
+        self._wake.set()
+
+    def remove_wallet(self, address: str) -> None:
+        with self._lock:
+            self._states.pop(address, None)
+        self._publish({}, removed=[address])
+
+    def mark_active(self, address: str) -> None:
+        """Poll ``address`` on the next cycle and treat it as active."""
+        with self._lock:
+            state = self._states.get(address)
+            if state is not None:
+                state.interval = self.min_interval
+                state.due = 0.0
+        self._wake.set()
+
+    # -- snapshot -----------------------------------------------------------
+    def snapshot(self) -> Dict[str, Any]:
+        """Latest consistent view; never blocks and must not be mutated.
+
+        ``wallets`` maps address to ``{"sol", "tokens", "updated_at"}``,
+        ``exposure`` maps mint to the total held across all wallets.
+        """
+        return self._snapshot
+
+    def exposure(self, mint: str) -> float:
+        return self._snapshot["exposure"].get(mint, 0.0)
+
+    def _publish(self, updates: Dict[str, Dict[str, Any]], removed: Iterable[str] = ()) -> None:
+        # Copy-on-write: readers keep whatever snapshot they already hold.
+        with self._lock:
+            old = self._snapshot
+            wallets = dict(old["wallets"])
+            exposure = dict(old["exposure"])
+            # A wallet removed while its poll was in flight must stay removed.
+            updates = {a: u for a, u in updates.items() if a in self._states}
+            changed = [a for a in removed if a in wallets] + list(updates)
+            for address in changed:
+                prev = wallets.pop(address, None)
+                if prev is not None:
+                    for mint, amount in prev["tokens"].items():
+                        left = exposure.get(mint, 0.0) - amount
+                        if abs(left) > 1e-12:
+                            exposure[mint] = left
+                        else:
+                            exposure.pop(mint, None)
+                new = updates.get(address)
+                if new is not None:
+                    wallets[address] = new
+                    for mint, amount in new["tokens"].items():
+                        exposure[mint] = exposure.get(mint, 0.0) + amount
+            self._snapshot = {
+                "taken_at": time.time(),
+                "wallets": wallets,
+                "exposure": exposure,
+                "sol_total": sum(w["sol"] for w in wallets.values()),
+            }
+
+    # -- polling ------------------------------------------------------------
+    def _due(self, now: float) -> List[_WalletState]:
+        with self._lock:
+            due = [s for s in self._states.values() if s.due <= now]
+        due.sort(key=lambda s: s.due)
+        # One getMultipleAccounts plus one batched call per wallet.
+        affordable = int(self.bucket.available(now)) - 1
+        return due[: max(0, min(self.max_batch, affordable))]
+
+    def _fetch(self, addresses: List[str]) -> Tuple[List[Optional[float]], List[Optional[Dict[str, float]]]]:
+        accounts = rpc_call(
+            "getMultipleAccounts",
+            [addresses, {"encoding": "base64", "commitment": self.commitment, "dataSlice": {"offset": 0, "length": 0}}],
+            self.endpoints,
+        )
+        values = (accounts or {}).get("value") if isinstance(accounts, dict) else None
+        sol: List[Optional[float]] = [None] * len(addresses)
+        if values is not None:
+            sol = [(acc or {}).get("lamports", 0) / LAMPORTS_PER_SOL for acc in values]
+        results = rpc_batch(
+            [
+                (
+                    "getTokenAccountsByOwner",
+                    [a, {"programId": TOKEN_PROGRAM_ID}, {"encoding": "jsonParsed", "commitment": self.commitment}],
+                )
+                for a in addresses
+            ],
+            self.endpoints,
+        )
+        tokens = [None if r is None else _token_balances(r) for r in results]
+        return sol, tokens
+
+    def poll_once(self, now: Optional[float] = None) -> int:
+        """Refresh every due wallet the RPC budget allows; returns the count."""
+        now = time.monotonic() if now is None else now
+        due = self._due(now)
+        if not due or not self.bucket.take(len(due) + 1, now):
+            return 0
+        start = time.perf_counter()
+        sol, tokens = self._fetch([s.address for s in due])
+        observe("wallet_tracker_poll_seconds", time.perf_counter() - start)
+        incr("wallet_tracker_wallets_polled", len(due))
+
+        current = self._snapshot["wallets"]
+        updates: Dict[str, Dict[str, Any]] = {}
+        for state, balance, held in zip(due, sol, tokens):
+            prev = current.get(state.address)
+            if balance is None or held is None:
+                # Keep the last known balances; retry at the active rate.
+                state.due = now + self.min_interval
+                continue
+            state.polls += 1
+            changed = prev is None or prev["sol"] != balance or prev["tokens"] != held
+            if changed:
+                state.changes += 1
+                state.interval = self.min_interval
+                updates[state.address] = {"sol": balance, "tokens": held, "updated_at": time.time()}
+            else:
+                state.interval = min(self.max_interval, state.interval * 2)
+            state.due = now + state.interval
+        if updates:
+            self._publish(updates)
+        return len(due)
+
+    def next_due(self) -> float:
+        """Monotonic time at which the next wallet becomes due."""
+        with self._lock:
+            return min((s.due for s in self._states.values()), default=time.monotonic() + self.max_interval)
+
+    # -- background loop --------------------------------------------------------
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.poll_once()
+            except Exception:
+                incr("wallet_tracker_errors")
+            wait = max(self.next_due() - time.monotonic(), self.bucket.wait_time(2))
+            self._wake.wait(min(max(wait, 0.01), self.max_interval))
+            self._wake.clear()
+
+    def start(self) -> "WalletTracker":
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="wallet-tracker", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "WalletTracker":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
@@ -0,0 +1,96 @@
+import pytest
+
+from analysis import data_cache
+from analysis.alternative_data import GitHubActivityFetcher
+from analysis.github_mock import MockGitHubServer
+
+REPO = "bitcoin/bitcoin"
+DAY = 86400.0
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_cache, "CACHE_DIR", tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def github():
+    with MockGitHubServer({REPO: {"stars": 100, "forks": 10, "watchers": 5}}) as server:
+        yield server
+
+
+def test_fetch_caches_and_revalidates_with_etag(github):
+    fetcher = GitHubActivityFetcher(base_url=github.url, ttl=3600)
+    assert fetcher.fetch(REPO) == {"stars": 100, "forks": 10, "watchers": 5}
+    assert fetcher.fetch(REPO)["stars"] == 100
+    assert github.requests == [(REPO, 200)]
+    assert fetcher.stats["cached"] == 1
+
+    # A stale entry is revalidated; unchanged data comes back as a 304.
+    fetcher.ttl = 0
+    assert fetcher.fetch(REPO)["stars"] == 100
+    assert github.requests[-1] == (REPO, 304)
+    assert fetcher.stats["not_modified"] == 1
+
+    github.set_repo(REPO, stars=150, forks=10, watchers=5)
+    assert fetcher.fetch(REPO)["stars"] == 150
+    assert github.requests[-1] == (REPO, 200)
+    assert [s["stars"] for s in fetcher.history(REPO)] == [100, 150]
+
+
+def test_failure_without_entry_is_not_cached(github, cache_dir):
+    fetcher = GitHubActivityFetcher(base_url=github.url, ttl=3600)
+    github.fail(REPO, status=502)
+    assert fetcher.fetch(REPO) == {"stars": 0, "forks": 0, "watchers": 0}
+    assert fetcher.stats["failed"] == 1
+    assert not list(cache_dir.glob("github_etag_*"))
+
+    # The next call must hit the API rather than a cached failure.
+    assert fetcher.fetch(REPO)["stars"] == 100
+    assert github.requests == [(REPO, 502), (REPO, 200)]
+
+
+def test_failure_serves_last_good_value(github):
+    fetcher = GitHubActivityFetcher(base_url=github.url, ttl=0)
+    fetcher.fetch(REPO)
+    github.set_repo(REPO, stars=300)
+    github.fail(REPO, status=500)
+    assert fetcher.fetch(REPO)["stars"] == 100
+    # Dropped connections are retried once on a fresh connection.
+    github.fail(REPO, status=None, times=2)
+    assert fetcher.fetch(REPO)["stars"] == 100
+    assert fetcher.stats["failed"] == 2
+    assert len(fetcher.history(REPO)) == 1
+    assert fetcher.fetch(REPO)["stars"] == 300
+
+
+def test_fetch_many_runs_concurrently(github):
+    repos = [f"org/repo{i}" for i in range(20)]
+    for i, repo in enumerate(repos):
+        github.set_repo(repo, stars=i)
+    fetcher = GitHubActivityFetcher(base_url=github.url, max_workers=8)
+    result = fetcher.fetch_many(repos + ["org/missing"])
+    assert [result[r]["stars"] for r in repos] == list(range(20))
+    assert result["org/missing"] == {"stars": 0, "forks": 0, "watchers": 0}
+    assert fetcher.stats == {"fetched": 20, "not_modified": 0, "cached": 0, "failed": 1}
+
+
+def test_growth_uses_last_snapshot_before_window(cache_dir):
+    fetcher = GitHubActivityFetcher()
+    t0 = 1_700_000_000.0
+    fetcher._record_snapshot(REPO, {"stars": 100, "forks": 10, "watchers": 5}, t0)
+    fetcher._record_snapshot(REPO, {"stars": 200, "forks": 12, "watchers": 5}, t0 + 10 * DAY)
+
+    growth = fetcher.growth(REPO, window=7 * DAY, now=t0 + 10 * DAY)
+    assert growth == {"star_growth": 100, "fork_growth": 2, "watcher_growth": 0}
+
+    fetcher._record_snapshot(REPO, {"stars": 210, "forks": 12, "watchers": 6}, t0 + 12 * DAY)
+    growth = fetcher.growth(REPO, window=3 * DAY, now=t0 + 13 * DAY)
+    assert growth == {"star_growth": 10, "fork_growth": 0, "watcher_growth": 1}
+    assert fetcher.growth(REPO)["star_growth"] == 110
+    assert fetcher.growth("nobody/nothing", window=DAY) == {
+        "star_growth": 0,
+        "fork_growth": 0,
+        "watcher_growth": 0,
+    }
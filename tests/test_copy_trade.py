@@ -0,0 +1,78 @@
+import pytest
+
+from analysis.copy_trade import CopyTradeEngine
+
+
+def _buy(wallet, slot, amount=2.0, token="BONK", **extra):
+    return {"wallet": wallet, "token": token, "amount": amount, "slot": slot, **extra}
+
+
+def _consensus(signals):
+    return [s for s in signals if s["type"] == "consensus"]
+
+
+def test_consensus_fires_once_when_enough_wallets_agree():
+    seen = []
+    engine = CopyTradeEngine(["A", "B", "C", "D"], consensus=3, window_slots=10, on_signal=seen.append)
+    signals = engine.process_many([_buy("A", 100), _buy("B", 102), _buy("C", 104), _buy("D", 105)])
+    assert [s["type"] for s in signals] == ["wallet", "wallet", "wallet", "consensus", "wallet"]
+    (agreed,) = _consensus(signals)
+    assert agreed == {"type": "consensus", "action": "buy", "token": "BONK", "wallets": ["A", "B", "C"], "slot": 104}
+    assert seen == signals
+    assert engine.stats["signals"] == 5
+
+
+def test_consensus_window_expires_old_signals():
+    engine = CopyTradeEngine(consensus=3, window_slots=10)
+    assert not _consensus(engine.process_many([_buy("A", 100), _buy("B", 105), _buy("C", 111)]))
+    # A fell out of the window; a fourth wallet completes B, C, D.
+    (agreed,) = _consensus(engine.process(_buy("D", 112)))
+    assert sorted(agreed["wallets"]) == ["B", "C", "D"]
+    # Once that consensus expires a new one may fire.
+    assert not _consensus(engine.process(_buy("E", 113)))
+    engine.process_many([_buy("F", 125), _buy("G", 126)])
+    (again,) = _consensus(engine.process(_buy("H", 127)))
+    assert sorted(again["wallets"]) == ["F", "G", "H"]
+
+
+def test_consensus_counts_distinct_wallets():
+    engine = CopyTradeEngine(consensus=2, window_slots=10)
+    # A buys, exits and buys again: still one wallet.
+    signals = engine.process_many([_buy("A", 1), _buy("A", 2, amount=-2.0), _buy("A", 3)])
+    assert [s["action"] for s in signals] == ["buy", "sell", "buy"]
+    assert not _consensus(signals)
+    assert _consensus(engine.process(_buy("B", 4)))
+
+
+def test_duplicate_signatures_are_dropped():
+    engine = CopyTradeEngine(["A"], dedupe=2)
+    assert engine.process(_buy("A", 1, amount=0.6, signature="s1")) == []
+    assert engine.process(_buy("A", 1, amount=0.6, signature="s1")) == []
+    assert engine.positions("A") == {"BONK": 0.6}
+    assert engine.stats["duplicates"] == 1
+    (signal,) = engine.process(_buy("A", 2, amount=0.6, signature="s2"))
+    assert signal["action"] == "buy" and signal["net"] == pytest.approx(1.2)
+    # Only the last ``dedupe`` signatures are remembered.
+    engine.process(_buy("A", 3, amount=0.0, signature="s3"))
+    engine.process(_buy("A", 4, amount=0.0, signature="s1"))
+    assert engine.stats["duplicates"] == 1 and engine.stats["transactions"] == 4
+
+
+def test_untracked_wallets_and_tokenless_transactions_are_ignored():
+    engine = CopyTradeEngine(["A"])
+    assert engine.process(_buy("Z", 1)) == []
+    assert engine.process(_buy("A", 1, token=None)) == []
+    assert engine.stats["ignored"] == 2
+    # ``wallet`` overrides the transaction's own field.
+    assert engine.process({"token": "BONK", "amount": 5.0, "slot": 2}, wallet="A")[0]["wallets"] == ["A"]
+
+
+def test_latency_is_measured_from_receipt(monkeypatch):
+    monkeypatch.setattr("analysis.copy_trade.time.time", lambda: 1000.25)
+    engine = CopyTradeEngine(consensus=0)
+    (signal,) = engine.process(_buy("A", 1, received_at=1000.0))
+    assert signal["latency_ms"] == pytest.approx(250.0)
+    assert engine.latency_percentiles() == {"p50": pytest.approx(250.0), "p90": pytest.approx(250.0),
+                                            "p99": pytest.approx(250.0)}
+    with pytest.raises(ValueError):
+        CopyTradeEngine(buy_threshold=1.0, sell_threshold=1.0)
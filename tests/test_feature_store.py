@@ -0,0 +1,77 @@
+import copy
+import random
+
+import pytest
+
+from analysis.feature_engineering import add_bollinger_bands, add_macd, add_technical_indicators
+from analysis.feature_store import FeatureStore
+from analysis.regime_detection import add_volatility_regime
+
+INDICATORS = [
+    ("sma_rsi", lambda c, store=None: add_technical_indicators(c, window=14, store=store)),
+    ("bollinger", lambda c, store=None: add_bollinger_bands(c, window=20, store=store)),
+    ("macd", lambda c, store=None: add_macd(c, store=store)),
+    ("volatility_regime", lambda c, store=None: add_volatility_regime(c, iterations=20, store=store)),
+]
+
+
+def _candles(n, seed=1):
+    rng = random.Random(seed)
+    price, candles = 100.0, []
+    for _ in range(n):
+        price *= 1 + rng.gauss(0, 0.01)
+        candles.append({"close": price})
+    return candles
+
+
+def _files(path):
+    return sorted(p.name for p in path.glob("*.bin"))
+
+
+@pytest.mark.parametrize("name,add", INDICATORS)
+def test_cached_columns_match_uncached(tmp_path, name, add):
+    series = _candles(400)
+    store = FeatureStore(tmp_path)
+    # Grow the series so later lookups go through extension or recompute.
+    for n in (120, 121, 200, 400, 400):
+        expected = add(copy.deepcopy(series[:n]))
+        assert add(copy.deepcopy(series[:n]), store=store) == expected
+    # A second process (fresh store) serves the same columns from disk.
+    other = FeatureStore(tmp_path)
+    assert add(copy.deepcopy(series), store=other) == add(copy.deepcopy(series))
+    assert other.stats["disk_hits"] == 1
+
+
+def test_extendable_indicators_extend_and_others_recompute(tmp_path):
+    series = _candles(300)
+    store = FeatureStore(tmp_path)
+    add_macd(copy.deepcopy(series[:200]), store=store)
+    add_macd(copy.deepcopy(series), store=store)
+    assert store.stats["extensions"] == 1 and store.stats["misses"] == 1
+    assert store.stats["points_computed"] == 300
+
+    store = FeatureStore(tmp_path / "regime")
+    add_volatility_regime(copy.deepcopy(series[:200]), iterations=20, store=store)
+    add_volatility_regime(copy.deepcopy(series), iterations=20, store=store)
+    assert store.stats["extensions"] == 0 and store.stats["misses"] == 2
+    assert store.stats["points_computed"] == 500
+
+
+@pytest.mark.parametrize("name,add", INDICATORS)
+def test_growing_series_keeps_one_file(tmp_path, name, add):
+    series = _candles(200)
+    store = FeatureStore(tmp_path)
+    for n in range(100, 201, 25):
+        add(copy.deepcopy(series[:n]), store=store)
+        files = _files(tmp_path)
+        assert len(files) == 1 and f"-{n}-" in files[0]
+
+
+def test_report_counts_disk_bytes_of_disk_only_store(tmp_path):
+    series = _candles(150)
+    add_macd(copy.deepcopy(series), store=FeatureStore(tmp_path))
+    reader = FeatureStore(tmp_path)
+    add_macd(copy.deepcopy(series), store=reader)
+    report = reader.report()
+    assert report["disk_hits"] == 1
+    assert report["disk_bytes"] == sum(p.stat().st_size for p in tmp_path.glob("*.bin")) > 0
@@ -0,0 +1,19 @@
+from analysis.benchmark import IMPORT_BUDGETS_MS, check_import_budgets
+
+
+def test_cold_imports_stay_within_budget():
+    # Best of several fresh interpreters, so one slow start on a busy CI host
+    # does not fail the check.
+    rows = check_import_budgets(runs=5)
+    assert [r["module"] for r in rows] == list(IMPORT_BUDGETS_MS)
+    over = [f"{r['module']}: {r['ms']:.1f} ms > {r['budget_ms']:.0f} ms" for r in rows if r["over_budget"]]
+    assert not over, "; ".join(over)
+
+
+def test_lazy_namespace_imports_no_submodules():
+    import subprocess
+    import sys
+
+    code = "import analysis, sys; print(sorted(m for m in sys.modules if m.startswith(('analysis.', 'numpy', 'sklearn'))))"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert out.strip() == "[]"
@@ -0,0 +1,161 @@
+import base64
+import struct
+
+import pytest
+
+from analysis.mint_screening import (
+    METADATA_PROGRAM_ID,
+    MintScreener,
+    b58decode,
+    b58encode,
+    decode_metadata,
+    decode_mint,
+    find_program_address,
+    metadata_address,
+)
+from analysis.rpc_harness import Cassette, replay
+
+USDC = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
+USDC_METADATA = "5x38Kp4hvdomTCnCrAny4UtMUt5rQBdB6px2K1Ui45Wq"
+USDC_MINT_AUTHORITY = "BJE5MMbqXjVwjAF7oxwPYXnTXDyspzZyt4vwenNw5ruG"
+USDC_FREEZE_AUTHORITY = "7dGbd2QZcCKcTndnHcTL8q7SMVXAkp688NTQYwrRCrar"
+BONK = "DezXAZ8z7PHRTRgzjGLm5pPezwmQ7wNbYH3Wr4GdvVjR"
+LP_MINT = "8HoQnePLqPj4M7PUDzfw8e3Ymdwgc7NLGnaTUapubyvu"
+
+
+def _option(key):
+    # COption<Pubkey>: u32 tag followed by 32 bytes, zeroed when absent.
+    return (b"\x01\0\0\0" + b58decode(key)) if key else b"\0" * 36
+
+
+def mint_account(mint_authority, supply, decimals, freeze_authority):
+    """SPL Token mint bytes as laid out on chain (82 bytes)."""
+    data = (
+        _option(mint_authority)
+        + supply.to_bytes(8, "little")
+        + bytes([decimals, 1])
+        + _option(freeze_authority)
+    )
+    assert len(data) == 82
+    return data
+
+
+def _borsh_str(text, padded):
+    # Metaplex pads name/symbol/uri with NULs to their maximum length.
+    raw = text.encode().ljust(padded, b"\0")
+    return struct.pack("<I", len(raw)) + raw
+
+
+def metadata_account(mint, update_authority, name, symbol, uri, is_mutable, creators=()):
+    """Metaplex ``MetadataV1`` bytes including the trailing optional fields."""
+    data = b"\x04" + b58decode(update_authority) + b58decode(mint)
+    data += _borsh_str(name, 32) + _borsh_str(symbol, 10) + _borsh_str(uri, 200)
+    data += struct.pack("<H", 0)
+    if creators:
+        data += b"\x01" + struct.pack("<I", len(creators))
+        for creator in creators:
+            data += b58decode(creator) + b"\x01" + bytes([100 // len(creators)])
+    else:
+        data += b"\0"
+    data += bytes([1, int(is_mutable)])
+    data += b"\x01\xfe"  # edition_nonce: Some(254)
+    data += b"\0" * 3  # token_standard, collection, uses: None
+    return data.ljust(679, b"\0")
+
+
+def _account(data):
+    return {"data": [base64.b64encode(data).decode(), "base64"], "owner": "", "lamports": 1, "executable": False}
+
+
+def test_base58_round_trip_of_known_keys():
+    for key in (USDC, METADATA_PROGRAM_ID, "11111111111111111111111111111111"):
+        raw = b58decode(key)
+        assert len(raw) == 32
+        assert b58encode(raw) == key
+    assert b58decode("11111111111111111111111111111111") == b"\0" * 32
+    with pytest.raises(ValueError):
+        b58decode("0OIl")
+
+
+def test_metadata_pda_of_usdc():
+    assert metadata_address(USDC) == USDC_METADATA
+    address, bump = find_program_address(
+        [b"metadata", b58decode(METADATA_PROGRAM_ID), b58decode(USDC)], METADATA_PROGRAM_ID
+    )
+    assert address == USDC_METADATA and 0 <= bump <= 255
+
+
+def test_decode_mint_layout():
+    info = decode_mint(mint_account(USDC_MINT_AUTHORITY, 9_000_000_000_000_000, 6, USDC_FREEZE_AUTHORITY))
+    assert info == {
+        "mint_authority": USDC_MINT_AUTHORITY,
+        "supply": 9_000_000_000_000_000,
+        "decimals": 6,
+        "is_initialized": True,
+        "freeze_authority": USDC_FREEZE_AUTHORITY,
+    }
+    renounced = decode_mint(mint_account(None, 1, 5, None) + b"\0" * 100)  # Token-2022 extensions
+    assert renounced["mint_authority"] is None and renounced["freeze_authority"] is None
+    with pytest.raises(ValueError):
+        decode_mint(b"\0" * 81)
+
+
+@pytest.mark.parametrize("creators", [(), (USDC_MINT_AUTHORITY, USDC_FREEZE_AUTHORITY)])
+def test_decode_metadata_layout(creators):
+    data = metadata_account(USDC, USDC_MINT_AUTHORITY, "USD Coin", "USDC", "", True, creators)
+    info = decode_metadata(data)
+    assert info["update_authority"] == USDC_MINT_AUTHORITY
+    assert (info["name"], info["symbol"], info["uri"]) == ("USD Coin", "USDC", "")
+    assert info["primary_sale_happened"] and info["is_mutable"]
+    assert not decode_metadata(metadata_account(USDC, USDC_MINT_AUTHORITY, "x", "X", "u", False, creators))["is_mutable"]
+
+
+def _cassette(batches):
+    cassette = Cassette()
+    for keys, accounts in batches:
+        params = [keys, {"encoding": "base64", "commitment": "confirmed"}]
+        result = {"context": {"slot": 1}, "value": [_account(a) if a else None for a in accounts]}
+        cassette.add("getMultipleAccounts", params, {"jsonrpc": "2.0", "result": result})
+    return cassette
+
+
+def test_screen_batches_and_caches_permanent_facts():
+    bonk_metadata = metadata_address(BONK)
+    usdc_mint = mint_account(USDC_MINT_AUTHORITY, 10**15, 6, USDC_FREEZE_AUTHORITY)
+    bonk_mint = mint_account(None, 10**17, 5, None)
+    usdc_meta = metadata_account(USDC, USDC_MINT_AUTHORITY, "USD Coin", "USDC", "", True)
+    bonk_meta = metadata_account(BONK, BONK, "Bonk", "Bonk", "https://bonk", False)
+    burned_lp = mint_account(None, 0, 9, None)
+    cassette = _cassette([
+        ([USDC, USDC_METADATA, BONK], [usdc_mint, usdc_meta, bonk_mint]),
+        ([bonk_metadata, LP_MINT], [bonk_meta, burned_lp]),
+        # Second screen: only the failing USDC checks and the LP mint.
+        ([USDC, USDC_METADATA, LP_MINT], [usdc_mint, usdc_meta, burned_lp]),
+    ])
+    checks = {"renounced": True, "frozen": True, "mutable": True, "burned": True}
+    screener = MintScreener(checks, endpoints=["http://replay"], batch_size=3)
+    candidates = [USDC, {"mint": BONK, "lp_mint": LP_MINT}]
+    with replay(cassette):
+        first = screener.screen(candidates)
+        second = screener.screen(candidates)
+
+    for verdicts in (first, second):
+        assert verdicts[BONK]["passed"]
+        assert verdicts[BONK]["checks"] == {"renounced": True, "frozen": True, "mutable": True, "burned": True}
+        usdc = verdicts[USDC]
+        assert not usdc["passed"]
+        assert usdc["checks"] == {"renounced": False, "frozen": False, "mutable": False, "burned": None}
+        assert f"mint authority is {USDC_MINT_AUTHORITY}" in usdc["reasons"]
+        assert "burned: no LP mint given" in usdc["reasons"]
+    assert screener.facts[BONK] == {"renounced": True, "frozen": True, "mutable": True}
+    assert screener.stats == {"candidates": 4, "cached": 2, "rpc_calls": 3, "accounts": 8}
+
+
+def test_screen_survives_missing_and_malformed_accounts():
+    cassette = _cassette([([USDC, USDC_METADATA], [b"\0" * 10, None])])
+    screener = MintScreener({"renounced": True, "mutable": True}, endpoints=["http://replay"])
+    with replay(cassette):
+        verdict = screener.screen([USDC])[USDC]
+    assert verdict["checks"] == {"renounced": None, "mutable": None}
+    assert not verdict["passed"]
+    assert screener.facts[USDC] == {}
@@ -0,0 +1,18 @@
+import importlib
+import types
+
+import analysis
+
+
+def test_exports_do_not_shadow_submodules():
+    clashes = [name for name in analysis._ATTR_TO_MODULE if name in analysis._SUBMODULES]
+    assert clashes == []
+
+
+def test_submodule_attribute_is_always_the_module():
+    from analysis import backtest_portfolio  # noqa: F401  (loads the submodule first)
+
+    module = importlib.import_module("analysis.portfolio_backtest")
+    assert isinstance(analysis.portfolio_backtest, types.ModuleType)
+    assert analysis.portfolio_backtest is module
+    assert analysis.backtest_portfolio is module.backtest_portfolio
@@ -0,0 +1,11 @@
+from analysis.nlp_analysis import batch_sentiment_scores, simple_sentiment_score
+
+
+def test_posts_without_text_score_neutral():
+    posts = [{"text": None}, {}, {"text": "very bullish"}, "not bullish", {"text": ""}]
+    assert batch_sentiment_scores(posts, chunk_size=2) == [0.0, 0.0, 1.0, -1.0, 0.0]
+
+
+def test_batch_scores_agree_with_simple_score_without_negations():
+    texts = ["gain profit loss", "up up down", "nothing here"]
+    assert batch_sentiment_scores(texts, negations=()) == [simple_sentiment_score(t) for t in texts]
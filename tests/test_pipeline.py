@@ -0,0 +1,108 @@
+import pytest
+
+from analysis.pipeline import Pipeline, Stage
+
+# CPU stages run in worker processes, so their functions live at module level.
+
+
+def double(xs):
+    return [2 * x for x in xs]
+
+
+def total(xs, offset=0):
+    return sum(xs) + offset
+
+
+def split(xs):
+    return xs[::2], xs[1::2]
+
+
+def combine(a, b, c):
+    return (a, b, c)
+
+
+def explode(xs):
+    raise ZeroDivisionError(f"cannot handle {len(xs)} values")
+
+
+def _stages(offset=0):
+    # Declared out of order on purpose: the runner must sort them itself.
+    return [
+        Stage("report", combine, ["sum", "evens", "odds"], kind="io"),
+        Stage("sum", total, ["doubled"], params={"offset": offset}),
+        Stage("split", split, ["doubled"], outputs=["evens", "odds"]),
+        Stage("doubled", double, ["xs"]),
+        Stage("label", str.upper, ["name"], kind="io"),
+    ]
+
+
+def _cached(pipeline):
+    return {row["stage"]: row["cached"] for row in pipeline.report}
+
+
+def test_stages_run_in_dependency_order(tmp_path):
+    pipeline = Pipeline(_stages(), cache_dir=tmp_path, max_processes=2)
+    values = pipeline.run({"xs": [1, 2, 3], "name": "sol"})
+    assert values["report"] == (12, [2, 6], [4])
+    assert values["label"] == "SOL"
+    order = [row["stage"] for row in pipeline.report]
+    assert order.index("doubled") < order.index("sum") < order.index("report")
+    assert order.index("doubled") < order.index("split") < order.index("report")
+
+
+def test_targets_limit_the_stages_run(tmp_path):
+    pipeline = Pipeline(_stages(), cache_dir=tmp_path, max_processes=1)
+    values = pipeline.run({"xs": [1, 2]}, targets=["sum"])
+    assert values["sum"] == 6
+    assert sorted(_cached(pipeline)) == ["doubled", "sum"]
+    with pytest.raises(KeyError):
+        pipeline.run({"xs": [1]}, targets=["missing"])
+
+
+def test_rerun_hits_cache_and_recomputes_after_changes(tmp_path):
+    initial = {"xs": [1, 2, 3], "name": "sol"}
+    Pipeline(_stages(), cache_dir=tmp_path, max_processes=1).run(initial)
+
+    again = Pipeline(_stages(), cache_dir=tmp_path, max_processes=1)
+    assert again.run(initial)["report"] == (12, [2, 6], [4])
+    assert all(_cached(again).values())
+
+    # A changed input recomputes only the stages downstream of it.
+    changed = Pipeline(_stages(), cache_dir=tmp_path, max_processes=1)
+    assert changed.run({**initial, "xs": [1, 2, 4]})["report"] == (14, [2, 8], [4])
+    assert _cached(changed) == {"doubled": False, "sum": False, "split": False, "report": False, "label": True}
+
+    # So does a changed parameter.
+    param = Pipeline(_stages(offset=1), cache_dir=tmp_path, max_processes=1)
+    assert param.run(initial)["sum"] == 13
+    assert _cached(param) == {"doubled": True, "sum": False, "split": True, "report": False, "label": True}
+
+
+def test_uncached_stage_with_unchanged_output_keeps_downstream_cached(tmp_path):
+    def stages():
+        return [Stage("xs", list, ["raw"], kind="io", cache=False), Stage("doubled", double, ["xs"])]
+
+    Pipeline(stages(), cache_dir=tmp_path, max_processes=1).run({"raw": (1, 2)})
+    pipeline = Pipeline(stages(), cache_dir=tmp_path, max_processes=1)
+    pipeline.run({"raw": (1, 2)})
+    assert _cached(pipeline) == {"xs": False, "doubled": True}
+
+
+@pytest.mark.parametrize("kind", ["cpu", "io"])
+def test_stage_errors_propagate_and_are_not_cached(tmp_path, kind):
+    stages = [Stage("doubled", double, ["xs"]), Stage("boom", explode, ["doubled"], kind=kind)]
+    with pytest.raises(ZeroDivisionError, match="cannot handle 2 values"):
+        Pipeline(stages, cache_dir=tmp_path, max_processes=1).run({"xs": [1, 2]})
+    assert len(list(tmp_path.glob("*.pkl"))) == 1  # only ``doubled``
+
+
+def test_invalid_graphs_are_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        Pipeline([Stage("a", double, ["xs"], outputs=["y"]), Stage("b", double, ["xs"], outputs=["y"])])
+    with pytest.raises(ValueError):
+        Stage("a", double, kind="gpu")
+    with pytest.raises(KeyError):
+        Pipeline([Stage("a", double, ["nothing"])], cache_dir=tmp_path).run()
+    cycle = [Stage("a", double, ["b"]), Stage("b", double, ["a"])]
+    with pytest.raises(RuntimeError, match="dependency cycle"):
+        Pipeline(cycle, cache_dir=tmp_path).run()
@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from analysis.records import SymbolTable, TradeRecords, WalletTxRecords, _Records, to_epoch_ms
+
+TRADES = [
+    {"price": 101.5, "volume": 0.25, "side": "buy", "timestamp": datetime(2024, 1, 2, 3, 4, 5), "fee": 0.01},
+    {"price": 99.0, "volume": 1.5, "side": "sell", "timestamp": "2024-01-02T03:04:06", "fee": 0.0},
+    {"price": 100.0, "volume": 2.0, "side": "buy", "timestamp": 1704164647000},
+]
+
+WALLET_TXS = [
+    {"signature": "5sig" * 20, "slot": 10, "token": "BONK", "amount": 1000.0, "fee": 0.000005, "blockTime": 1704164645},
+    {"signature": "short", "slot": 11, "token": None, "amount": 0.0, "fee": 0.0, "timestamp": None},
+    {"signature": "x" * 88, "slot": 12, "token": "WIF", "amount": -3.5, "fee": 0.00001, "blockTime": 1704164700},
+    {"signature": "y" * 87, "slot": 13, "token": "BONK", "amount": -400.0, "fee": 0.0, "blockTime": 1704164701},
+]
+
+
+def test_records_base_is_abstract():
+    with pytest.raises(TypeError):
+        _Records()
+
+
+def test_naive_datetimes_are_utc():
+    aware = datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    expected = int(aware.timestamp() * 1000)
+    assert to_epoch_ms(datetime(2024, 1, 2, 3, 4, 5)) == expected
+    assert to_epoch_ms("2024-01-02T03:04:05") == expected
+    assert to_epoch_ms(aware.astimezone(timezone(timedelta(hours=-5)))) == expected
+    assert to_epoch_ms("2024-01-02T05:04:05+02:00") == expected
+    assert to_epoch_ms(None) == 0
+
+
+@pytest.mark.parametrize("use_mmap", [True, False])
+def test_trade_records_round_trip(tmp_path, use_mmap):
+    records = TradeRecords.from_dicts(TRADES)
+    records.save(tmp_path / "trades")
+    loaded = TradeRecords.load(tmp_path / "trades", use_mmap=use_mmap)
+    try:
+        assert len(loaded) == 3
+        assert loaded.to_dicts() == records.to_dicts()
+        assert loaded[0]["timestamp"] == 1704164645000
+        assert loaded[-1]["side"] == "buy"
+        # Appending to a memory-mapped container copies the columns first.
+        loaded.append(98.0, 1.0, -1, 1704164648000)
+        assert loaded[3].to_dict()["side"] == "sell"
+        assert len(loaded) == 4
+    finally:
+        loaded.close()
+
+
+@pytest.mark.parametrize("use_mmap", [True, False])
+def test_wallet_records_round_trip(tmp_path, use_mmap):
+    symbols = SymbolTable(["SOL"])
+    records = WalletTxRecords.from_dicts(WALLET_TXS, symbols)
+    records.save(tmp_path / "wallet")
+    loaded = WalletTxRecords.load(tmp_path / "wallet", use_mmap=use_mmap)
+    try:
+        assert loaded.to_dicts() == records.to_dicts()
+        assert [r["signature"] for r in loaded] == [t["signature"] for t in WALLET_TXS]
+        assert loaded[1]["token"] is None
+        assert loaded.symbols.names == ["SOL", "BONK", "WIF"]
+        assert loaded.token_totals("amount") == {"BONK": 600.0, "WIF": -3.5}
+        assert loaded.nbytes() == records.nbytes()
+        loaded.append("new", 14, "WIF", 1.0)
+        assert loaded[4]["signature"] == "new"
+        assert loaded.token_totals() == {"BONK": 2, "WIF": 2}
+    finally:
+        loaded.close()
+
+
+def test_load_rejects_other_record_type(tmp_path):
+    TradeRecords.from_dicts(TRADES).save(tmp_path / "trades")
+    with pytest.raises(ValueError):
+        WalletTxRecords.load(tmp_path / "trades")
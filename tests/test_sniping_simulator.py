@@ -0,0 +1,56 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from analysis.sniping_simulator import (  # noqa: E402
+    BUY,
+    POOL_CREATE,
+    TRADE,
+    LatencyModel,
+    SnipeSimulator,
+    generate_events,
+    read_event_chunks,
+    write_events,
+)
+
+
+def _fills(sim):
+    return sorted(
+        (f["pool"], f["kind"], f["decided_us"], f.get("landed_us"), f["status"], round(f.get("price", 0.0), 9))
+        for f in sim.fills
+    )
+
+
+@pytest.mark.parametrize("hold_ms", [None, 30_000])
+def test_results_do_not_depend_on_chunking(tmp_path, hold_ms):
+    path = str(tmp_path / "events.bin")
+    generate_events(path, 50_000, seed=3)
+    runs = []
+    for chunk_events in (37, 1 << 20):
+        sim = SnipeSimulator(latency=LatencyModel(drop_rate=0.05), snipe_quote=1.0, hold_ms=hold_ms, seed=7)
+        report = sim.run(read_event_chunks(path, chunk_events))
+        runs.append((report, _fills(sim)))
+    (first, fills_a), (second, fills_b) = runs
+    assert fills_a == fills_b
+    assert first["filled"] > 0 and first["filled"] == second["filled"]
+    assert first["pnl"] == pytest.approx(second["pnl"], rel=1e-12)
+
+
+def test_decision_price_includes_flow_before_landing_chunk(tmp_path):
+    path = str(tmp_path / "events.bin")
+    write_events(
+        path,
+        [
+            (1_000, POOL_CREATE, 0, 100.0, 1e9),
+            (2_000, BUY, 0, 1.0, 0.0),
+            (2_500, TRADE, 0, 50.0, 0.0),
+            (2_600, TRADE, 0, 10.0, 0.0),
+            (90_000, TRADE, 0, 1.0, 0.0),
+        ],
+    )
+    slippage = set()
+    for chunk_events in (1, 2, 100):
+        sim = SnipeSimulator(latency=LatencyModel([("fixed", {"ms": 1})]))
+        sim.run(read_event_chunks(path, chunk_events))
+        slippage.add(round(sim.fills[0]["slippage_bps"], 6))
+    assert len(slippage) == 1
@@ -0,0 +1,25 @@
+import pytest
+
+from analysis.trend_detection import TrendTracker, extract_trending_tokens
+
+
+@pytest.mark.parametrize("capacity", [0, -1])
+def test_capacity_must_be_positive(capacity):
+    with pytest.raises(ValueError):
+        TrendTracker(capacity=capacity)
+
+
+def test_capacity_one_keeps_the_heaviest_hitter():
+    tracker = TrendTracker(capacity=1)
+    for i in range(5):
+        tracker.update("SOL", ts=1000.0 + i)
+    tracker.update("BONK", ts=1005.0)
+    assert [token for token, _ in tracker.top()] == ["SOL"]
+
+
+def test_posts_without_text_are_skipped():
+    posts = [{"text": None}, {"text": "SOL to the moon, SOL"}, {}]
+    assert extract_trending_tokens(posts) == ["SOL"]
+    tracker = TrendTracker()
+    tracker.update_posts(posts, ts=1000.0)
+    assert tracker.top(window=60) == [("SOL", 2.0)]
@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+from analysis import solana_rpc
+from analysis.mint_screening import b58decode
+from analysis.wallet_tracker import TOKEN_PROGRAM_ID, WalletTracker
+
+SPL_TOKEN_PROGRAM = "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"
+MINT = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
+
+
+def _token_account(mint, amount):
+    return {
+        "account": {
+            "data": {
+                "parsed": {"info": {"mint": mint, "tokenAmount": {"uiAmountString": str(amount)}}}
+            }
+        }
+    }
+
+
+@pytest.fixture
+def node():
+    """Fake RPC node recording every request it receives."""
+    seen = []
+
+    def transport(url, payload, timeout=10):
+        request = json.loads(payload)
+        batch = request if isinstance(request, list) else [request]
+        responses = []
+        for call in batch:
+            seen.append(call)
+            if call["method"] == "getMultipleAccounts":
+                result = {"value": [{"lamports": 2_000_000_000} for _ in call["params"][0]]}
+            elif call["method"] == "getTokenAccountsByOwner":
+                program = call["params"][1]["programId"]
+                if program != SPL_TOKEN_PROGRAM:
+                    responses.append({"jsonrpc": "2.0", "id": call["id"], "error": {"code": -32602}})
+                    continue
+                result = {"value": [_token_account(MINT, 5)]}
+            else:
+                result = None
+            responses.append({"jsonrpc": "2.0", "id": call["id"], "result": result})
+        return responses if isinstance(request, list) else responses[0]
+
+    previous = solana_rpc.set_transport(transport)
+    yield seen
+    solana_rpc.set_transport(previous)
+
+
+def test_token_program_id_is_spl_token():
+    assert TOKEN_PROGRAM_ID == SPL_TOKEN_PROGRAM
+    assert len(b58decode(TOKEN_PROGRAM_ID)) == 32
+
+
+def test_poll_queries_spl_token_program_and_publishes(node):
+    tracker = WalletTracker(["A", "B"], endpoints=["http://node"], max_rps=100)
+    assert tracker.poll_once() == 2
+    programs = [c["params"][1]["programId"] for c in node if c["method"] == "getTokenAccountsByOwner"]
+    assert programs == [SPL_TOKEN_PROGRAM, SPL_TOKEN_PROGRAM]
+    snapshot = tracker.snapshot()
+    assert snapshot["sol_total"] == 4.0
+    assert snapshot["exposure"] == {MINT: 10.0}
+
+
+def test_low_budget_still_polls(node):
+    tracker = WalletTracker(["A", "B"], endpoints=["http://node"], max_rps=1)
+    assert tracker.poll_once() == 1
+    with pytest.raises(ValueError):
+        WalletTracker(max_rps=0)